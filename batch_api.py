@@ -0,0 +1,443 @@
+import importlib
+import json
+import os
+import time
+from typing import BinaryIO
+
+import openai
+from openai.types.shared.chat_model import ChatModel
+from pydantic import BaseModel, ValidationError
+
+from image_prep import ImageOptions
+from metering import record_call
+from response_cache import make_cache_key
+from utils import (
+    FileUploadProtocol,
+    ResponseWithUsage,
+    StructuredResponseWithUsage,
+    Usage,
+    build_messages,
+    get_client,
+)
+
+# 배치가 더 이상 진행되지 않는 상태값
+FINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+# wait()가 상태 확인에 실패해도 계속 기다릴 일시적인 오류 (배치는 서버에서 계속 진행됨)
+TRANSIENT_ERRORS = (
+    openai.APIConnectionError,  # APITimeoutError 포함
+    openai.InternalServerError,
+    openai.RateLimitError,
+)
+
+
+class BatchError(Exception):
+    """배치 요청 중 개별 항목이 실패했을 때의 오류."""
+
+    def __init__(self, custom_id: str, message: str):
+        super().__init__(f"{custom_id}: {message}")
+        self.custom_id = custom_id
+
+
+def _strict_schema(schema: dict) -> dict:
+    """Structured Outputs strict 모드 규칙에 맞게 JSON Schema를 고칩니다.
+
+    모든 object에 additionalProperties: false를 넣고 모든 속성을 required로 만듭니다
+    ($defs 안의 중첩 모델 포함).
+    """
+    if isinstance(schema, dict):
+        schema = {key: _strict_schema(value) for key, value in schema.items()}
+        if schema.get("type") == "object" and "properties" in schema:
+            schema["additionalProperties"] = False
+            schema["required"] = list(schema["properties"])
+    elif isinstance(schema, list):
+        schema = [_strict_schema(value) for value in schema]
+    return schema
+
+
+def response_format_param(response_format: type[BaseModel]) -> dict:
+    """Pydantic 모델로 Chat Completions의 json_schema response_format을 만듭니다."""
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "name": response_format.__name__,
+            "schema": _strict_schema(response_format.model_json_schema()),
+            "strict": True,
+        },
+    }
+
+
+def _format_path(response_format: type[BaseModel] | None) -> str | None:
+    """응답 형식 클래스를 "모듈:이름" 문자열로 저장합니다."""
+    if response_format is None:
+        return None
+    return f"{response_format.__module__}:{response_format.__qualname__}"
+
+
+def _resolve_format(
+    path: str | None, known: dict[str, type[BaseModel]]
+) -> type[BaseModel] | None:
+    """_format_path로 저장한 문자열을 다시 클래스로 찾습니다."""
+    if path is None:
+        return None
+    if path in known:
+        return known[path]
+    module_name, qualname = path.split(":", 1)
+    try:
+        obj = importlib.import_module(module_name)
+        for name in qualname.split("."):
+            obj = getattr(obj, name)
+    except (ImportError, AttributeError) as e:
+        raise ValueError(
+            f"응답 형식 {path}을(를) 찾을 수 없습니다. "
+            "load(..., response_formats=[클래스])로 직접 넘겨주세요."
+        ) from e
+    return obj
+
+
+class BatchJob:
+    """make_response 형태의 호출을 모아 OpenAI Batch API로 처리하는 클래스.
+
+    실시간 응답이 필요 없는 야간 대량 추출 작업에 사용합니다.
+    Batch API는 일반 호출의 절반 비용으로 처리되며, 결과는 최대 24시간 안에 돌아옵니다.
+
+    Examples:
+        >>> job = BatchJob()
+        >>> for path in 회의록_파일들:
+        ...     job.add(user_content=read(path), custom_id=path)
+        >>> job.submit()
+        >>> job.wait()
+        >>> for custom_id, result in job.results().items():
+        ...     print(custom_id, result)
+
+        다른 프로세스에서 이어서 결과 받기:
+        >>> job = BatchJob.load("batch_abc123")
+        >>> job.wait()
+    """
+
+    def __init__(
+        self,
+        jsonl_path: str = "batch/requests.jsonl",
+        api_key: str | None = None,
+        base_url: str | None = None,
+    ):
+        """BatchJob 인스턴스 생성.
+
+        Args:
+            jsonl_path: 요청을 기록할 JSONL 파일 경로
+            api_key: OpenAI API 키. None이면 OPENAI_API_KEY 환경 변수
+            base_url: API 주소. 로컬 대체 서버로 테스트할 때 지정
+        """
+        self.jsonl_path = jsonl_path
+        self.api_key = api_key
+        self.base_url = base_url
+        self.batch_id: str | None = None
+
+        self._requests: dict[str, dict] = {}
+        self._formats: dict[str, type[BaseModel] | None] = {}
+        # results()를 여러 번 불러도 사용량은 한 번만 meter에 기록
+        self._metered = False
+
+    def add(
+        self,
+        user_content: str,
+        file_path: str | None = None,
+        file: FileUploadProtocol | BinaryIO | None = None,
+        system_content: str | None = None,
+        model: str | ChatModel = "gpt-4o-mini",
+        temperature: float = 0.25,
+        response_format: type[BaseModel] | None = None,
+        custom_id: str | None = None,
+        optimize_image: bool | ImageOptions = True,
+    ) -> str:
+        """요청 하나를 배치에 추가합니다. 인자는 make_response와 같습니다.
+
+        Args:
+            custom_id (str | None, optional): 결과를 찾을 때 쓸 ID. None이면 요청 내용의
+                해시로 만들어지므로, 같은 요청은 항상 같은 ID를 갖고 한 번만 전송됩니다.
+
+        Returns:
+            str: 이 요청의 custom_id
+        """
+        messages = build_messages(
+            user_content,
+            file_path=file_path,
+            file=file,
+            system_content=system_content,
+            optimize_image=optimize_image,
+        )
+        if custom_id is None:
+            custom_id = "req-" + make_cache_key(
+                model, temperature, messages, response_format
+            )[:32]
+
+        body = {"model": model, "messages": messages, "temperature": temperature}
+        if response_format is not None:
+            body["response_format"] = response_format_param(response_format)
+
+        self._requests[custom_id] = {
+            "custom_id": custom_id,
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": body,
+        }
+        self._formats[custom_id] = response_format
+        return custom_id
+
+    def __len__(self) -> int:
+        return len(self._requests)
+
+    def write(self) -> str:
+        """모은 요청을 Batch API 입력 형식의 JSONL 파일로 저장합니다.
+
+        Returns:
+            str: 저장한 파일 경로
+        """
+        dir_path = os.path.dirname(self.jsonl_path)
+        if dir_path:
+            os.makedirs(dir_path, exist_ok=True)
+        with open(self.jsonl_path, "wt", encoding="utf-8") as f:
+            for request in self._requests.values():
+                f.write(json.dumps(request, ensure_ascii=False) + "\n")
+        return self.jsonl_path
+
+    def submit(self, metadata: dict[str, str] | None = None) -> str:
+        """JSONL 파일을 업로드하고 배치를 생성합니다.
+
+        Returns:
+            str: 생성된 배치 ID
+
+        Raises:
+            ValueError: 추가된 요청이 없는 경우
+        """
+        if not self._requests:
+            raise ValueError("배치에 추가된 요청이 없습니다.")
+
+        client = get_client(api_key=self.api_key, base_url=self.base_url)
+        self.write()
+        with open(self.jsonl_path, "rb") as f:
+            input_file = client.files.create(file=f, purpose="batch")
+
+        batch = client.batches.create(
+            input_file_id=input_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h",
+            metadata=metadata,
+        )
+        self.batch_id = batch.id
+        self.save_state()
+        return batch.id
+
+    @property
+    def state_path(self) -> str:
+        """배치 ID별 상태 파일 경로 (JSONL 파일과 같은 디렉토리)."""
+        if self.batch_id is None:
+            raise ValueError("아직 제출되지 않은 배치입니다.")
+        return _state_path(os.path.dirname(self.jsonl_path), self.batch_id)
+
+    def save_state(self) -> str:
+        """다른 프로세스에서 load()로 이어갈 수 있도록 배치 정보를 저장합니다.
+
+        요청 내용은 JSONL 파일에 있으므로, 상태 파일에는 JSONL 경로와
+        custom_id별 응답 형식 클래스("모듈:이름")만 기록합니다.
+
+        Returns:
+            str: 저장한 상태 파일 경로
+        """
+        state = {
+            "batch_id": self.batch_id,
+            # 다른 작업 디렉토리에서 load()해도 찾을 수 있도록 절대 경로로 저장
+            "jsonl_path": os.path.abspath(self.jsonl_path),
+            "base_url": self.base_url,
+            "formats": {
+                custom_id: _format_path(response_format)
+                for custom_id, response_format in self._formats.items()
+            },
+        }
+        with open(self.state_path, "wt", encoding="utf-8") as f:
+            json.dump(state, f, ensure_ascii=False, indent=2)
+        return self.state_path
+
+    @classmethod
+    def load(
+        cls,
+        batch_id: str,
+        state_dir: str = "batch",
+        api_key: str | None = None,
+        base_url: str | None = None,
+        response_formats: list[type[BaseModel]] | None = None,
+    ) -> "BatchJob":
+        """submit()할 때 저장한 상태 파일로 BatchJob을 다시 만듭니다.
+
+        Args:
+            batch_id: 배치 ID
+            state_dir: 상태 파일이 있는 디렉토리 (submit 당시 JSONL 파일의 디렉토리)
+            api_key: OpenAI API 키. None이면 OPENAI_API_KEY 환경 변수
+            base_url: API 주소. None이면 저장된 값
+            response_formats: 모듈 경로로 다시 import할 수 없는 응답 형식 클래스들
+                (스크립트의 __main__에서 정의한 모델 등)
+
+        Returns:
+            BatchJob: 결과를 조회할 수 있는 작업 객체
+
+        Raises:
+            FileNotFoundError: 상태 파일이나 JSONL 파일이 없는 경우
+            ValueError: 응답 형식 클래스를 찾을 수 없는 경우
+        """
+        with open(_state_path(state_dir, batch_id), encoding="utf-8") as f:
+            state = json.load(f)
+
+        job = cls(
+            jsonl_path=state["jsonl_path"],
+            api_key=api_key,
+            base_url=base_url or state.get("base_url"),
+        )
+        job.batch_id = batch_id
+
+        known = {}
+        for response_format in response_formats or []:
+            known[_format_path(response_format)] = response_format
+            # __main__에서 정의해 저장된 경우도 이름으로 찾을 수 있게 함
+            known[f"__main__:{response_format.__qualname__}"] = response_format
+
+        with open(job.jsonl_path, encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                request = json.loads(line)
+                custom_id = request["custom_id"]
+                job._requests[custom_id] = request
+                job._formats[custom_id] = _resolve_format(
+                    state["formats"].get(custom_id), known
+                )
+        return job
+
+    def status(self):
+        """현재 배치 상태(openai.types.Batch)를 조회합니다."""
+        if self.batch_id is None:
+            raise ValueError("아직 제출되지 않은 배치입니다.")
+        client = get_client(api_key=self.api_key, base_url=self.base_url)
+        return client.batches.retrieve(self.batch_id)
+
+    def wait(self, poll_interval: float = 30.0, timeout: float | None = None):
+        """배치가 끝날 때까지 주기적으로 상태를 확인합니다.
+
+        Args:
+            poll_interval (float, optional): 상태 확인 간격(초). 기본값은 30.
+            timeout (float | None, optional): 최대 대기 시간(초). None이면 무제한.
+
+        Returns:
+            openai.types.Batch: 최종 배치 상태
+
+        일시적인 오류(연결 끊김, 시간 초과, 5xx, 429)로 상태 확인에 실패하면
+        다음 주기에 다시 확인합니다.
+
+        Raises:
+            TimeoutError: timeout 안에 배치가 끝나지 않은 경우
+        """
+        started_at = time.monotonic()
+        status = "unknown"
+        while True:
+            try:
+                batch = self.status()
+            except TRANSIENT_ERRORS as e:
+                print(f"배치 상태 확인 실패, {poll_interval}초 후 다시 확인합니다: {e}")
+            else:
+                if batch.status in FINAL_STATUSES:
+                    return batch
+                status = batch.status
+            if timeout is not None and time.monotonic() - started_at > timeout:
+                raise TimeoutError(f"배치가 {timeout}초 안에 끝나지 않았습니다: {status}")
+            time.sleep(poll_interval)
+
+    def results(
+        self,
+    ) -> dict[str, ResponseWithUsage | StructuredResponseWithUsage | Exception]:
+        """배치 결과를 내려받아 custom_id별 응답 객체로 변환합니다.
+
+        처음 내려받을 때 항목별 토큰 사용량을 metering의 전역 meter에 기록합니다
+        (caller는 현재 caller 태그).
+
+        Returns:
+            dict: custom_id -> ResponseWithUsage / StructuredResponseWithUsage.
+                실패한 항목은 BatchError가 들어가며, add() 순서를 유지합니다.
+        """
+        batch = self.status()
+        client = get_client(api_key=self.api_key, base_url=self.base_url)
+
+        lines = []
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if file_id:
+                lines.extend(client.files.content(file_id).text.splitlines())
+
+        collected = {}
+        for line in lines:
+            if not line.strip():
+                continue
+            item = json.loads(line)
+            collected[item["custom_id"]] = self._to_result(item)
+            if not self._metered:
+                self._record_usage(item)
+        self._metered = True
+
+        return {
+            custom_id: collected.get(
+                custom_id, BatchError(custom_id, f"결과가 없습니다 ({batch.status})")
+            )
+            for custom_id in self._requests
+        }
+
+    def _record_usage(self, item: dict) -> None:
+        """배치 결과 한 줄의 토큰 사용량을 meter에 기록합니다."""
+        body = (item.get("response") or {}).get("body") or {}
+        usage = body.get("usage")
+        if not usage:
+            return
+        request = self._requests.get(item["custom_id"], {})
+        record_call(
+            # 일반 호출과 같은 model 라벨로 모이도록 요청한 모델명을 사용
+            model=request.get("body", {}).get("model") or body.get("model", "unknown"),
+            latency=0.0,  # 배치 항목은 개별 응답 시간이 없음
+            input_tokens=usage.get("prompt_tokens", 0),
+            output_tokens=usage.get("completion_tokens", 0),
+        )
+
+    def _to_result(
+        self, item: dict
+    ) -> ResponseWithUsage | StructuredResponseWithUsage | Exception:
+        """배치 결과 한 줄을 응답 객체로 변환합니다."""
+        custom_id = item["custom_id"]
+        response = item.get("response")
+        if item.get("error") or not response or response.get("status_code") != 200:
+            error = item.get("error") or (response or {}).get("body", {}).get("error")
+            return BatchError(custom_id, json.dumps(error, ensure_ascii=False))
+
+        body = response["body"]
+        usage = (
+            Usage(
+                input_tokens=body["usage"]["prompt_tokens"],
+                output_tokens=body["usage"]["completion_tokens"],
+                total_tokens=body["usage"]["total_tokens"],
+            )
+            if body.get("usage")
+            else None
+        )
+        message = body["choices"][0]["message"]
+        content = message.get("content")
+
+        response_format = self._formats.get(custom_id)
+        if response_format is not None:
+            # 거절(refusal), 빈 응답, 길이 제한으로 잘린 JSON은 이 항목만 실패로 처리
+            if content is None:
+                reason = message.get("refusal") or "응답 내용이 없습니다"
+                return BatchError(custom_id, reason)
+            try:
+                parsed = response_format.model_validate_json(content)
+            except ValidationError as e:
+                return BatchError(custom_id, f"응답 형식 검증 실패: {e}")
+            return StructuredResponseWithUsage(parsed=parsed, usage=usage)
+        return ResponseWithUsage(content=content or "", usage=usage)
+
+
+def _state_path(state_dir: str, batch_id: str) -> str:
+    return os.path.join(state_dir, f"{batch_id}.json")
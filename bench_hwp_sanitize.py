@@ -0,0 +1,66 @@
+"""hwp_to_html 정제 단계 벤치마크.
+
+BeautifulSoup(html.parser) 정제(lxml이 없을 때의 경로)와 lxml 한 번 순회 정제를
+샘플 HWP 파일로 비교합니다.
+
+    python bench_hwp_sanitize.py                # 업무분장/*.hwp
+    python bench_hwp_sanitize.py a.hwp b.hwp -n 20
+"""
+
+import argparse
+import glob
+import time
+from copy import deepcopy
+
+from lxml import etree
+
+from utils import _hwp_to_xhtml_tree, _sanitize_html_soup, _sanitize_html_tree
+
+
+def best_of(func, repeat: int, setup=lambda: None) -> float:
+    """func(setup())을 repeat번 실행한 가장 빠른 시간(밀리초). setup은 시간에서 제외."""
+    timings = []
+    for _ in range(repeat):
+        arg = setup()
+        started_at = time.perf_counter()
+        func(arg)
+        timings.append(time.perf_counter() - started_at)
+    return min(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="hwp_to_html 정제 단계 벤치마크")
+    parser.add_argument("paths", nargs="*", help="HWP 파일 (기본: 업무분장/*.hwp)")
+    parser.add_argument("-n", "--repeat", type=int, default=10, help="반복 횟수")
+    args = parser.parse_args()
+
+    paths = args.paths or sorted(glob.glob("업무분장/*.hwp"))
+    print(
+        f"{'파일':<32}{'XHTML':>10}{'bs4':>10}{'lxml':>10}{'lxml(트리)':>12}{'배속':>8}"
+    )
+    for path in paths:
+        with open(path, "rb") as f:
+            tree = _hwp_to_xhtml_tree(f.read())
+        xhtml = bytes(tree).decode("utf-8")
+
+        # 1) lxml이 없을 때의 방식: XSLT 결과를 문자열로 만든 뒤 html.parser로 다시 파싱
+        bs4_ms = best_of(lambda _: _sanitize_html_soup(xhtml), args.repeat)
+        # 2) 같은 문자열을 lxml로 파싱해서 정제 (문자열 입력끼리 비교)
+        lxml_ms = best_of(
+            lambda _: _sanitize_html_tree(etree.fromstring(xhtml.encode("utf-8"))),
+            args.repeat,
+        )
+        # 3) hwp_to_html의 실제 경로: XSLT 결과 트리를 다시 파싱하지 않고 정제
+        #    (정제가 트리를 바꾸므로 매번 복사본을 만들고, 복사 시간은 제외)
+        tree_ms = best_of(
+            _sanitize_html_tree, args.repeat, lambda: deepcopy(tree.getroot())
+        )
+
+        print(
+            f"{path:<32}{len(xhtml) // 1024:>8}KB{bs4_ms:>8.1f}ms{lxml_ms:>8.1f}ms"
+            f"{tree_ms:>10.1f}ms{bs4_ms / tree_ms:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
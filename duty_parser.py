@@ -0,0 +1,542 @@
+import re
+from dataclasses import dataclass, field
+
+import lxml.html
+from pydantic import BaseModel
+
+from html_compact import compact_html, html_blocks, table_to_grid
+from rate_limit import count_tokens
+from utils import Usage, make_response, make_responses_batch
+
+DUTY_PROMPT = """
+다음 문서에서 업무분장 정보를 추출해주세요.
+(HWP 문서를 변환한 것으로, 표는 Markdown 표로, 한 셀 안의 줄바꿈은 <br>로 표시되어 있습니다.)
+
+문서 내용:
+{content}
+
+위 문서에서 표 구조를 분석하여 다음 정보를 추출해주세요:
+1. 문서 제목과 날짜
+2. 부서별 구성원 정보:
+    - 직위 (부장, 차장, 직원 등)
+    - 성명
+    - 전화번호 (있는 경우)
+    - 담당 업무 목록 (•로 구분된 각 업무를 리스트로)
+    - 대행자 (있는 경우)
+
+부서가 여러 개인 경우 각 부서별로 구분하여 추출해주세요.
+"""
+
+
+class Person(BaseModel):
+    이름: str
+    담당: str
+    업무: list[str]
+    전화번호: str
+
+
+class Doc(BaseModel):
+    persons: list[Person]
+    제목: str
+    날짜: str
+
+
+# 이 값 이상이면 LLM을 호출하지 않고 규칙 기반 결과를 사용
+MIN_CONFIDENCE = 0.8
+# 압축 텍스트가 이 토큰 수를 넘으면 부서/표 단위로 나누어 동시에 추출
+CHUNKED_THRESHOLD = 4000
+# 나눈 조각 하나의 목표 최대 토큰 수 (문서 머리말 제외)
+CHUNK_TOKENS = 1500
+
+POSITIONS = ("센터장", "처장", "부장", "팀장", "차장", "과장", "대리", "직원")
+# 업무 항목을 새로 시작하는 글머리 기호 (-, * 등은 앞 항목에 이어 붙임)
+BULLETS = "•○●◦▪■□▢◎"
+VACANT = "공석"
+# 부서/과 제목 문단의 시작 기호
+SECTION_MARKERS = ("▢", "□", "■", "◎", "◆", "◇")
+
+_COLUMN_KEYWORDS = [
+    # (열 종류, 헤더에 포함되는 단어) - 앞에서부터 먼저 일치하는 것을 사용
+    ("duties", ("업무",)),
+    ("name", ("성명", "이름")),
+    ("proxy", ("대행",)),
+    ("position", ("직위", "직급")),
+    ("name", ("담당",)),  # "담당"만 있는 열은 이름 열 (연료설비 부서 양식)
+    ("group", ("구분", "부서")),
+]
+_PHONE = re.compile(r"☎\s*([\d-]+)")
+_GRADE = re.compile(r"\(\s*\d\s*\)")
+_PARENTHESES = re.compile(r"\([^)]*\)")
+_BACKUP = re.compile(r"부\s*[:：]\s*[가-힣\s]+")
+_PRIMARY = re.compile(r"정\s*[:：]")
+_NAME = re.compile(r"(?<![가-힣])[가-힣]{2,4}(?![가-힣])")
+_SPACED_NAME = re.compile(r"(?<![가-힣])[가-힣](?: [가-힣]){1,3}(?![가-힣])")
+_DATE = re.compile(
+    r"[(（]?\s*['’‘]?\s*(\d{4}|\d{2})\s*\.\s*(\d{1,2})(?:\s*\.\s*(\d{1,2}))?\s*\.?\s*[)）]?"
+)
+
+
+@dataclass
+class DutyExtraction:
+    """업무분장 추출 결과.
+
+    Attributes:
+        doc: 추출한 문서 정보
+        confidence: 규칙 기반 파싱의 신뢰도 (0.0 ~ 1.0)
+        source: 결과를 만든 방법 ("rules" 또는 "llm")
+        warnings: 규칙 기반 파싱에서 해석하지 못한 부분
+        usage: LLM을 호출한 경우 토큰 사용량
+    """
+
+    doc: Doc
+    confidence: float
+    source: str
+    warnings: list[str] = field(default_factory=list)
+    usage: Usage | None = None
+
+
+def _squash(text: str) -> str:
+    return re.sub(r"\s+", "", text)
+
+
+def _parse_date(text: str) -> str | None:
+    """'25. 2. 17. / 2025.3 형식을 2025.02.17 / 2025.03 으로 바꿉니다."""
+    match = _DATE.search(text)
+    if not match:
+        return None
+    year, month, day = match.groups()
+    if len(year) == 2:
+        year = "20" + year
+    if not 1 <= int(month) <= 12:
+        return None
+    return f"{year}.{int(month):02d}" + (f".{int(day):02d}" if day else "")
+
+
+def _find_title_and_date(lines: list[str]) -> tuple[str, str]:
+    """표 밖의 앞부분 문단에서 '...업무분장' 제목과 날짜를 찾습니다."""
+    title, date = "", ""
+    for index, line in enumerate(lines):
+        if "업무분장" in line and not line.startswith(("※", "□", "▢")):
+            title = _DATE.sub("", line).strip(" ()")
+            for candidate in [line] + lines[index + 1 : index + 4]:
+                date = _parse_date(candidate) or ""
+                if date:
+                    break
+            break
+    return title, date
+
+
+def _column_kinds(header: list[str]) -> list[str | None] | None:
+    """헤더 행이면 열마다 종류를 돌려주고, 헤더가 아니면 None."""
+    kinds = []
+    for cell in header:
+        text = _squash(cell)
+        kind = None
+        for candidate, keywords in _COLUMN_KEYWORDS:
+            if any(keyword in text for keyword in keywords):
+                kind = candidate
+                break
+        if kind is None and not text and kinds and kinds[-1] == "duties":
+            # colspan으로 합쳐진 '분장 업무' 헤더 (업무 구분 열 + 업무 내용 열)
+            kind = "duties"
+        kinds.append(kind)
+    if "name" in kinds and "duties" in kinds:
+        return kinds
+    return None
+
+
+def _looks_like_name_cell(text: str) -> bool:
+    return bool(_GRADE.search(text) or _PHONE.search(text) or _PRIMARY.search(text))
+
+
+def _infer_column_kinds(row: list[str]) -> list[str | None] | None:
+    """헤더 없이 이어지는 표에서 셀 내용으로 열 종류를 추정합니다."""
+    kinds: list[str | None] = [None] * len(row)
+    bullet_counts = [sum(cell.count(b) for b in BULLETS) for cell in row]
+    if max(bullet_counts, default=0) == 0:
+        return None
+    duties = bullet_counts.index(max(bullet_counts))
+    kinds[duties] = "duties"
+    for index, cell in enumerate(row):
+        if index == duties:
+            continue
+        if "name" not in kinds and _looks_like_name_cell(cell):
+            kinds[index] = "name"
+        elif _squash(cell) in POSITIONS:
+            kinds[index] = "position"
+    if "name" not in kinds:
+        return None
+    last = len(row) - 1
+    if kinds[last] is None and last > duties:
+        kinds[last] = "proxy"
+    return kinds
+
+
+def _parse_people(cell: str) -> tuple[list[str], str, str, bool]:
+    """성명 셀에서 (이름들, 직위, 전화번호, 공석 여부)를 읽습니다.
+
+    '김용택(2)<br>☎3250', '차장 김 문 기', '정: 최원호<br>부: 박정훈' 같은 형식을
+    처리하며, 정/부로 나뉜 경우 정 담당자만 이름으로 봅니다.
+    """
+    phones = _PHONE.findall(cell)
+    text = _PHONE.sub(" ", cell)
+    text = _BACKUP.sub(" ", text)
+    text = _PRIMARY.sub(" ", text)
+    text = _PARENTHESES.sub(" ", text)
+    position = ""
+    for candidate in POSITIONS:
+        if candidate in text:
+            position = position or candidate
+            text = text.replace(candidate, " ")
+    # '김 문 기'처럼 글자 사이를 띄운 이름 붙이기
+    text = _SPACED_NAME.sub(lambda m: m.group(0).replace(" ", ""), text)
+    vacant = VACANT in text
+    names = [name for name in _NAME.findall(text) if name not in (VACANT, "겸직")]
+    return names, position, ", ".join(phones), vacant
+
+
+def _duties_text(cells: list[str]) -> str:
+    """업무 열이 여러 개면 글머리 기호가 있는 셀만 사용합니다 ('설비업무' 같은 구분 셀 제외)."""
+    with_bullets = [cell for cell in cells if any(b in cell for b in BULLETS)]
+    return "\n".join(with_bullets or cells)
+
+
+def _parse_duties(cell: str) -> list[str]:
+    """업무 셀을 글머리 기호 단위의 업무 리스트로 나눕니다."""
+    duties: list[str] = []
+    for line in cell.split("\n"):
+        line = line.strip()
+        if not line or line == "-":
+            continue
+        if line[0] in BULLETS:
+            duties.append(line.lstrip(BULLETS).strip())
+        elif duties:
+            # 줄바꿈으로 이어지는 문장이나 '-' 하위 항목은 앞 항목에 붙임
+            duties[-1] = f"{duties[-1]} {line}"
+        else:
+            duties.append(line)
+    return [duty for duty in duties if duty]
+
+
+def _add_person(persons: dict[str, Person], person: Person) -> None:
+    """이름이 같은 사람이 이미 있으면 업무를 합치고, 없으면 추가합니다."""
+    key = _squash(person.이름)
+    existing = persons.get(key)
+    if existing is None:
+        persons[key] = person.model_copy(deep=True)
+        return
+    existing.담당 = existing.담당 or person.담당
+    existing.전화번호 = existing.전화번호 or person.전화번호
+    existing.업무.extend(duty for duty in person.업무 if duty not in existing.업무)
+
+
+def merge_docs(docs: list[Doc]) -> Doc:
+    """나누어 추출한 Doc들을 하나로 합칩니다. 같은 이름의 사람은 한 명으로 합칩니다.
+
+    제목과 날짜는 가장 많이 나온 값(같으면 앞 조각의 값)을 사용합니다.
+    """
+    persons: dict[str, Person] = {}
+    for doc in docs:
+        for person in doc.persons:
+            _add_person(persons, person)
+
+    def most_common(values: list[str]) -> str:
+        values = [value for value in values if value]
+        return max(values, key=values.count) if values else ""
+
+    return Doc(
+        persons=list(persons.values()),
+        제목=most_common([doc.제목 for doc in docs]),
+        날짜=most_common([doc.날짜 for doc in docs]),
+    )
+
+
+def parse_duty_html(html: str) -> DutyExtraction:
+    """업무분장 HTML(hwp_to_html 결과)을 LLM 없이 표 규칙으로 파싱합니다.
+
+    헤더(구분/직위/성명/담당 업무/대행 등)로 열을 찾고, 헤더 없이 이어지는 표는
+    셀 내용으로 열을 추정합니다. 같은 사람이 여러 행/표에 나오면 업무를 합칩니다.
+
+    신뢰도는 인원 표의 행 중 이름과 업무를 모두 읽어낸 행의 비율이며,
+    제목이나 날짜를 찾지 못하면 각각 10%씩 낮아집니다.
+
+    Args:
+        html (str): hwp_to_html 결과 HTML
+
+    Returns:
+        DutyExtraction: source="rules"인 추출 결과
+    """
+    root = lxml.html.document_fromstring(html)
+    compact = compact_html(html).text
+    title, date = _find_title_and_date(compact.splitlines())
+
+    persons: dict[str, Person] = {}
+    warnings: list[str] = []
+    candidate_rows = parsed_rows = 0
+    previous_kinds: list[str | None] | None = None
+
+    for table in root.iter("table"):
+        if next(table.iterancestors("table"), None) is not None:
+            continue  # 셀 안의 표는 셀 텍스트로 처리됨
+        grid = table_to_grid(table, "\n")
+        if not grid:
+            continue
+
+        kinds = _column_kinds(grid[0])
+        rows = grid[1:] if kinds else grid
+        if kinds is None and previous_kinds and len(previous_kinds) == len(grid[0]):
+            kinds = previous_kinds  # 페이지가 넘어가며 헤더 없이 이어진 표
+        for row in rows:
+            row_kinds = kinds or _infer_column_kinds(row)
+            if row_kinds is None:
+                continue
+            if _column_kinds(row):
+                continue  # 표 중간에 반복된 헤더 행
+            columns: dict[str, list[str]] = {}
+            for kind, cell in zip(row_kinds, row):
+                if kind:
+                    columns.setdefault(kind, []).append(cell)
+            candidate_rows += 1
+
+            names, position, phone, vacant = _parse_people(
+                "\n".join(columns.get("name", []))
+            )
+            duties = _parse_duties(_duties_text(columns.get("duties", [])))
+            position = (
+                _squash("".join(columns.get("position", [])))
+                or position
+                or next(
+                    (
+                        p
+                        for p in POSITIONS
+                        if p == _squash("".join(columns.get("group", [])))
+                    ),
+                    "",
+                )
+            )
+            if vacant and not names:
+                parsed_rows += 1
+                continue
+            if not names or not duties:
+                warnings.append(f"해석하지 못한 행: {' | '.join(row)[:80]}")
+                continue
+            parsed_rows += 1
+
+            for name in names:
+                _add_person(
+                    persons,
+                    Person(이름=name, 담당=position, 업무=list(duties), 전화번호=phone),
+                )
+        if kinds:
+            previous_kinds = kinds
+
+    confidence = parsed_rows / candidate_rows if candidate_rows and persons else 0.0
+    if not title:
+        confidence *= 0.9
+        warnings.append("제목을 찾지 못했습니다.")
+    if not date:
+        confidence *= 0.9
+        warnings.append("날짜를 찾지 못했습니다.")
+
+    return DutyExtraction(
+        doc=Doc(persons=list(persons.values()), 제목=title, 날짜=date),
+        confidence=round(confidence, 3),
+        source="rules",
+        warnings=warnings,
+    )
+
+
+def _is_table_block(block: str) -> bool:
+    lines = block.split("\n", 2)
+    return len(lines) > 1 and lines[0].startswith("|") and lines[1].startswith("|---")
+
+
+def _split_table(block: str, max_tokens: int) -> list[str]:
+    """큰 Markdown 표를 헤더를 반복하며 max_tokens 이하 조각으로 나눕니다.
+
+    첫 열(구분/부서)이 같은 연속된 행은 같은 조각에 둡니다.
+    """
+    header, separator, *rows = block.split("\n")
+    groups: list[list[str]] = []
+    for row in rows:
+        key = row.split(" | ", 1)[0]
+        if groups and groups[-1][0].split(" | ", 1)[0] == key:
+            groups[-1].append(row)
+        else:
+            groups.append([row])
+
+    pieces: list[list[str]] = []
+    for group in groups:
+        if pieces and count_tokens("\n".join(pieces[-1] + group)) <= max_tokens:
+            pieces[-1].extend(group)
+        else:
+            pieces.append(list(group))
+    return ["\n".join([header, separator, *piece]) for piece in pieces]
+
+
+def split_duty_document(
+    html: str, max_tokens: int = CHUNK_TOKENS
+) -> tuple[str, list[str]]:
+    """업무분장 문서를 부서/표 경계에서 나눕니다.
+
+    첫 표 앞의 문단(제목, 날짜 등)은 머리말로 따로 돌려주어 모든 조각에 붙일 수
+    있게 하고, 각 표는 바로 앞의 문단(예: '▢ 연료설비 1부 기계과')과 함께 한 부서
+    단위가 됩니다. 작은 부서는 max_tokens까지 한 조각으로 묶고, 한 표가
+    max_tokens보다 크면 _split_table로 행 단위로 나눕니다.
+
+    Args:
+        html (str): hwp_to_html 결과 HTML
+        max_tokens (int, optional): 조각 하나의 목표 최대 토큰 수. 기본값은 1500.
+
+    Returns:
+        tuple[str, list[str]]: (머리말, 압축 텍스트 조각 리스트)
+    """
+    blocks = html_blocks(html)
+    first_table = next(
+        (index for index, block in enumerate(blocks) if _is_table_block(block)),
+        len(blocks),
+    )
+    head = blocks[:first_table]
+    # 머리말 끝의 '▢ 연료설비 1부 공무과' 같은 부서 제목은 첫 부서에 포함
+    split_at = len(head)
+    while split_at > 0 and head[split_at - 1].startswith(SECTION_MARKERS):
+        split_at -= 1
+    preamble = "\n".join(head[:split_at])
+
+    # 부서 단위: [앞 문단들..., 표]
+    sections: list[list[str]] = []
+    leading: list[str] = head[split_at:]
+    for block in blocks[first_table:]:
+        if _is_table_block(block):
+            parts = _split_table(block, max_tokens)
+            sections.append(leading + parts[:1])
+            sections.extend([part] for part in parts[1:])
+            leading = []
+        else:
+            leading.append(block)
+    if leading:
+        # 마지막 표 뒤의 문단(※ 비고 등)은 마지막 부서에 붙임
+        if sections:
+            sections[-1].extend(leading)
+        else:
+            sections.append(leading)
+
+    chunks: list[str] = []
+    for section in sections:
+        text = "\n".join(section)
+        if chunks and count_tokens(chunks[-1] + "\n" + text) <= max_tokens:
+            chunks[-1] += "\n" + text
+        else:
+            chunks.append(text)
+    return preamble, chunks
+
+
+def _sum_usage(usages: list[Usage | None]) -> Usage | None:
+    usages = [usage for usage in usages if usage]
+    if not usages:
+        return None
+    return Usage(
+        input_tokens=sum(usage.input_tokens for usage in usages),
+        output_tokens=sum(usage.output_tokens for usage in usages),
+        total_tokens=sum(usage.total_tokens for usage in usages),
+    )
+
+
+def extract_duty_doc_chunked(
+    html: str,
+    max_tokens: int = CHUNK_TOKENS,
+    max_concurrency: int = 8,
+    cache: bool = True,
+) -> DutyExtraction:
+    """문서를 부서/표 단위로 나누어 동시에 LLM 추출한 뒤 하나의 Doc으로 합칩니다.
+
+    전체 소요 시간이 문서 전체가 아니라 가장 큰 조각에 비례하고,
+    한 번의 응답에 모든 persons를 담다가 잘리는 문제를 피할 수 있습니다.
+
+    Args:
+        html (str): hwp_to_html 결과 HTML
+        max_tokens (int, optional): 조각 하나의 목표 최대 토큰 수. 기본값은 1500.
+        max_concurrency (int, optional): 동시에 보낼 최대 요청 수. 기본값은 8.
+        cache (bool, optional): 응답 캐시 사용 여부. 기본값은 True.
+
+    Returns:
+        DutyExtraction: source="llm"인 추출 결과. 실패한 조각은 warnings에 기록됩니다.
+
+    Raises:
+        Exception: 모든 조각의 추출이 실패한 경우 첫 번째 오류
+    """
+    preamble, chunks = split_duty_document(html, max_tokens)
+    items = [
+        {
+            "user_content": DUTY_PROMPT.format(
+                content=f"{preamble}\n(문서의 {index}/{len(chunks)} 부분입니다)\n{chunk}"
+            ),
+            "response_format": Doc,
+            "cache": cache,
+        }
+        for index, chunk in enumerate(chunks, start=1)
+    ]
+    results = make_responses_batch(items, max_concurrency=max_concurrency)
+
+    responses = [result for result in results if not isinstance(result, Exception)]
+    if not responses:
+        raise results[0]
+    warnings = [
+        f"{index}번째 부분 추출 실패: {result}"
+        for index, result in enumerate(results, start=1)
+        if isinstance(result, Exception)
+    ]
+    return DutyExtraction(
+        doc=merge_docs([response.parsed for response in responses]),
+        confidence=0.0,
+        source="llm",
+        warnings=warnings,
+        usage=_sum_usage([response.usage for response in responses]),
+    )
+
+
+def extract_duty_doc(
+    html: str,
+    min_confidence: float = MIN_CONFIDENCE,
+    use_rules: bool = True,
+    cache: bool = True,
+    chunked: bool | None = None,
+) -> DutyExtraction:
+    """업무분장 HTML에서 Doc을 추출합니다. 규칙 기반 파싱을 먼저 시도합니다.
+
+    정형화된 양식이면 API 호출 없이 밀리초 단위로 끝나고, 신뢰도가
+    min_confidence보다 낮을 때만 make_response로 LLM 추출을 수행합니다.
+
+    Args:
+        html (str): hwp_to_html 결과 HTML
+        min_confidence (float, optional): 규칙 기반 결과를 그대로 쓸 최소 신뢰도. 기본값은 0.8.
+        use_rules (bool, optional): False면 규칙 기반 파싱 없이 바로 LLM을 사용. 기본값은 True.
+        cache (bool, optional): LLM 호출 시 응답 캐시 사용 여부. 기본값은 True.
+        chunked (bool | None, optional): True면 extract_duty_doc_chunked로 나누어 추출.
+            None이면 압축 텍스트가 CHUNKED_THRESHOLD 토큰을 넘을 때만 나누어 추출.
+
+    Returns:
+        DutyExtraction: 추출 결과 (source로 규칙/LLM 여부 확인)
+    """
+    parsed = parse_duty_html(html) if use_rules else None
+    if parsed is not None and parsed.confidence >= min_confidence:
+        return parsed
+
+    compact = compact_html(html)
+    if chunked is None:
+        chunked = compact.tokens_after > CHUNKED_THRESHOLD
+    if chunked:
+        result = extract_duty_doc_chunked(html, cache=cache)
+    else:
+        response = make_response(
+            user_content=DUTY_PROMPT.format(content=compact.text),
+            response_format=Doc,
+            cache=cache,
+        )
+        result = DutyExtraction(
+            doc=response.parsed, confidence=0.0, source="llm", usage=response.usage
+        )
+    if parsed is not None:
+        result.confidence = parsed.confidence
+        result.warnings = parsed.warnings + result.warnings
+    return result
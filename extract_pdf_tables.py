@@ -1,18 +1,24 @@
 import sys
+import os
 import json
 import re
+import argparse
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Tuple, Optional, Any
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, replace
 import warnings
 warnings.filterwarnings('ignore')
 
 # 필수 라이브러리
 import camelot
-import pdfplumber
+import numpy as np
 import pandas as pd
 from tabulate import tabulate
 
+from pdf_pages import PDFPageCache, ParsedPage
+
 # tqdm 임포트 (진행 표시)
 try:
     from tqdm import tqdm
@@ -21,6 +27,60 @@ except ImportError:
     TQDM_AVAILABLE = False
     tqdm = lambda x, **kwargs: x  # 더미 함수
 
+# 병렬 추출 시 워커 1개당 나눌 페이지 구간 수
+PAGE_SHARDS_PER_WORKER = 4
+
+# 테이블 후보 페이지 판별 기준 (Camelot은 후보 페이지에서만 실행)
+MIN_RULING_LENGTH = 20  # 괘선으로 볼 최소 길이 (pt)
+MIN_HORIZONTAL_RULINGS = 3
+MIN_VERTICAL_RULINGS = 2
+COLUMN_GAP = 15  # 단어 사이가 이 이상 벌어지면 다른 열로 봄 (pt)
+COLUMN_BUCKET = 10  # 열 시작 위치를 묶는 간격 (pt)
+MIN_COLUMNS = 3
+MIN_COLUMN_ROWS = 4
+
+# 서로 다른 추출 결과를 같은 테이블로 볼 최소 bbox IoU
+IOU_THRESHOLD = 0.5
+
+# 작은 테이블이 큰 테이블 안에 이 비율(교집합 / 작은 테이블 면적) 이상 들어 있으면 중복으로 봄
+CONTAINMENT_THRESHOLD = 0.8
+
+# 테이블 마커 ([TABLE_페이지_번호])
+TABLE_MARKER = re.compile(r'\[TABLE_(\d+)_(\d+)\]')
+
+# Markdown/HTML 저장 시 파일 쓰기 버퍼 크기
+WRITE_BUFFER_SIZE = 1024 * 1024
+
+# HTML 출력의 머리말 (스타일 포함)
+HTML_HEAD = """
+<!DOCTYPE html>
+<html lang="ko">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>PDF 추출 결과</title>
+    <style>
+        body { font-family: 'Malgun Gothic', sans-serif; max-width: 900px; margin: 0 auto; padding: 20px; }
+        h1 { color: #2c3e50; border-bottom: 2px solid #3498db; padding-bottom: 10px; }
+        h2 { color: #34495e; margin-top: 30px; }
+        h3 { color: #7f8c8d; }
+        .page-break { border-top: 3px double #bdc3c7; margin: 40px 0; padding-top: 20px; }
+        .list-item { margin-left: 20px; }
+        .list-item-2 { margin-left: 40px; }
+        table { border-collapse: collapse; width: 100%; margin: 20px 0; }
+        th, td { border: 1px solid #ddd; padding: 8px; text-align: left; }
+        th { background-color: #f2f2f2; }
+        .table-info { font-size: 0.9em; color: #7f8c8d; font-style: italic; }
+        .paragraph { margin: 15px 0; line-height: 1.6; }
+    </style>
+</head>
+<body>
+    <h1>📄 PDF 추출 결과</h1>
+        """
+
+# 스트리밍 모드에서 Camelot 결과를 기다리며 쓰기를 미뤄둘 최대 페이지 수
+STREAM_WINDOW = 16
+
 
 @dataclass
 class TextBlock:
@@ -40,21 +100,33 @@ class TableData:
     page_num: int
     source: str  # 'pdfplumber' or 'camelot'
     confidence: float = 0.0
-    bbox: Optional[Tuple[float, float, float, float]] = None
+    bbox: Optional[Tuple[float, float, float, float]] = None  # x0, top, x1, bottom (pdfplumber 좌표)
+    index: Optional[int] = None  # 페이지 안 테이블 번호 ([TABLE_p_i] 마커의 i, pdfplumber만)
 
 
 class PDFExtractor:
     """고급 PDF 추출기"""
     
-    def __init__(self, pdf_path: str, output_dir: str = "output"):
+    def __init__(self, pdf_path: str, output_dir: str = "output", workers: int = 1):
+        """
+        Args:
+            pdf_path: PDF 파일 경로
+            output_dir: 결과 저장 디렉토리
+            workers: pdfplumber 추출 프로세스 수. 1이면 현재 프로세스에서 순차 처리,
+                None이면 CPU 수
+        """
         self.pdf_path = Path(pdf_path)
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(exist_ok=True)
+        self.workers = workers or os.cpu_count() or 1
         
         # 결과 저장
         self.text_blocks: List[TextBlock] = []
         self.tables: List[TableData] = []
         self.comparison_report: List[str] = []
+        self.table_candidate_pages: List[int] = []
+        self.metadata: Dict[str, Any] = {}
+        self.table_index: Dict[Tuple[int, int], TableData] = {}
         
     def extract_all(self):
         """전체 추출 프로세스"""
@@ -74,41 +146,280 @@ class PDFExtractor:
         print(f"\n✅ 추출 완료!")
         print(f"📊 텍스트 블록: {len(self.text_blocks)}개")
         print(f"📊 테이블: {len(self.tables)}개")
+    
+    def extract_streaming(self, window: int = STREAM_WINDOW):
+        """페이지 단위 스트리밍 추출
+        
+        페이지를 순서대로 추출하면서 결과를 바로 파일에 씀. 전체 결과를 메모리에 모으지 않으므로
+        문서 길이와 관계없이 메모리 사용량이 일정함.
+        
+        - extracted_data.ndjson: 페이지마다 한 줄 ({page_number, blocks, tables})
+        - extracted_text.md: 페이지마다 이어 쓰기
+        - tables/page{페이지}_table{번호}.csv: 테이블이 확정될 때마다 저장
+        
+        Camelot은 read_pdf 호출마다 문서를 다시 읽으므로, 후보 페이지를 window // 2개씩 모아
+        한 번에 백그라운드 프로세스에서 실행함 (window 안에서 다음 묶음을 추출하는 동안 실행됨).
+        교차 검증은 결과가 도착한 앞쪽 페이지부터 차례로 진행함. HTML과 통합 Excel은 문서 전체가
+        필요하므로 이 모드에서는 만들지 않음.
+        
+        Args:
+            window: Camelot 결과를 기다리며 쓰기를 미뤄둘 최대 페이지 수
+        """
+        print(f"\n📄 PDF 파일 분석 (스트리밍): {self.pdf_path}")
+        print(f"📏 파일 크기: {self.pdf_path.stat().st_size / 1024:.1f} KB")
+        
+        tables_dir = self.output_dir / "tables"
+        tables_dir.mkdir(exist_ok=True)
+        ndjson_path = self.output_dir / "extracted_data.ndjson"
+        md_path = self.output_dir / "extracted_text.md"
+        
+        self._stream_block_count = 0
+        self._stream_table_count = 0
+        pending = deque()  # (페이지 번호, 텍스트 블록, pdfplumber 테이블, Camelot 작업)
+        batch_size = max(1, window // 2)
+        batch_pages = []  # 아직 Camelot에 넘기지 않은 후보 페이지
+        batch_futures = []  # batch_pages의 Camelot 작업 (제출 전에는 비어 있음)
+        
+        with PDFPageCache(self.pdf_path) as cache, \
+                ProcessPoolExecutor(max_workers=2) as executor, \
+                open(ndjson_path, 'w', encoding='utf-8') as ndjson_file, \
+                open(md_path, 'w', encoding='utf-8') as md_file:
+            self.metadata = cache.metadata
+            pages = cache.pages()
+            if TQDM_AVAILABLE:
+                pages = tqdm(pages, total=cache.page_count, desc="페이지 처리")
+            
+            for parsed in pages:
+                text_blocks, tables, is_candidate = self._extract_page(parsed)
+                futures = None
+                if is_candidate:
+                    # 같은 묶음의 페이지는 Camelot 작업 리스트를 공유함
+                    batch_pages.append(parsed.page_num)
+                    futures = batch_futures
+                pending.append((parsed.page_num, text_blocks, tables, futures))
+                if len(batch_pages) >= batch_size:
+                    self._submit_camelot_batch(executor, batch_pages, batch_futures)
+                    batch_pages, batch_futures = [], []
+                
+                # 창을 벗어난 페이지, 또는 Camelot이 끝난 앞쪽 페이지부터 기록
+                while pending:
+                    futures = pending[0][3]
+                    if len(pending) <= window and futures is not None \
+                            and not (futures and all(f.done() for f in futures)):
+                        break
+                    if futures is batch_futures and batch_pages:
+                        # 창을 벗어난 페이지의 묶음이 아직 덜 찼으면 지금 제출
+                        self._submit_camelot_batch(executor, batch_pages, batch_futures)
+                        batch_pages, batch_futures = [], []
+                    self._write_stream_page(*pending.popleft(), ndjson_file, md_file, tables_dir)
+            
+            if batch_pages:
+                self._submit_camelot_batch(executor, batch_pages, batch_futures)
+            while pending:
+                self._write_stream_page(*pending.popleft(), ndjson_file, md_file, tables_dir)
+        
+        print(f"  ✅ NDJSON: {ndjson_path}")
+        print(f"  ✅ Markdown: {md_path}")
+        print(f"  ✅ Tables: {tables_dir}/")
+        self._save_comparison_report()
+        
+        print("\n✅ 추출 완료!")
+        print(f"📊 텍스트 블록: {self._stream_block_count}개")
+        print(f"📊 테이블: {self._stream_table_count}개")
+    
+    def _submit_camelot_batch(self, executor: ProcessPoolExecutor, page_nums: List[int], futures: list):
+        """후보 페이지 묶음을 stream/lattice 두 모드로 한 번씩 읽도록 제출하고, 작업을 futures에 추가"""
+        pages = ','.join(str(page_num) for page_num in page_nums)
+        futures.extend(
+            executor.submit(_read_camelot_tables, str(self.pdf_path), pages, flavor)
+            for flavor in ('stream', 'lattice')
+        )
+    
+    def _write_stream_page(self, page_num: int, text_blocks: List[TextBlock], tables: List[TableData],
+                           futures: Optional[list], ndjson_file, md_file, tables_dir: Path):
+        """스트리밍 모드에서 한 페이지의 테이블을 확정하고 결과를 기록"""
+        tables = list(tables)
+        if futures:
+            # Camelot 결과는 묶음 전체의 것이므로 이 페이지의 테이블만 사용
+            stream, lattice = futures
+            try:
+                tables.extend(t for t in stream.result() if t.page_num == page_num)
+            except Exception as e:
+                self.comparison_report.append(f"Camelot 오류 (page {page_num}): {str(e)}")
+            try:
+                tables.extend(t for t in lattice.result() if t.page_num == page_num)
+            except Exception:
+                pass  # lattice 모드 실패 시 무시
+        tables = self._select_page_tables(page_num, tables)
+        
+        if not text_blocks and not tables:
+            return
+        self._stream_block_count += len(text_blocks)
+        
+        # NDJSON: _save_json의 페이지 항목과 같은 형태
+        page_data = {
+            'page_number': page_num,
+            'blocks': [self._block_json(block) for block in text_blocks if block.block_type != 'table'],
+            'tables': [self._table_json(table) for table in tables]
+        }
+        ndjson_file.write(json.dumps(page_data, ensure_ascii=False) + '\n')
+        ndjson_file.flush()
+        
+        # Markdown: 페이지 구분 + 블록
+        table_index = self._index_tables(text_blocks, tables)
+        for __, page_blocks in self._page_blocks(text_blocks, table_index):
+            md_lines = [f"\n---\n\n# 📄 Page {page_num}\n"]
+            for block in page_blocks:
+                md_lines.extend(self._markdown_block_lines(block, table_index))
+            md_file.write('\n'.join(md_lines) + '\n')
+            md_file.flush()
+        
+        # 테이블 CSV (번호는 문서 전체에서 이어짐)
+        for table in tables:
+            self._stream_table_count += 1
+            self._save_table_csv(table, self._stream_table_count, tables_dir)
         
     def _extract_with_pdfplumber(self):
         """pdfplumber로 텍스트와 테이블 추출"""
         print("\n🔄 pdfplumber로 추출 중...")
         
-        with pdfplumber.open(str(self.pdf_path)) as pdf:
-            pages = tqdm(pdf.pages, desc="페이지 처리") if TQDM_AVAILABLE else pdf.pages
+        if self.workers > 1:
+            self._extract_with_pdfplumber_parallel()
+            return
+        
+        with PDFPageCache(self.pdf_path) as cache:
+            self.metadata = cache.metadata
+            pages = cache.pages()
+            if TQDM_AVAILABLE:
+                pages = tqdm(pages, total=cache.page_count, desc="페이지 처리")
             
-            for page_num, page in enumerate(pages, 1):
-                # 텍스트 추출 (레이아웃 보존)
-                self._extract_text_with_layout(page, page_num)
+            for parsed in pages:
+                text_blocks, tables, is_candidate = self._extract_page(parsed)
+                self.text_blocks.extend(text_blocks)
+                self.tables.extend(tables)
+                if is_candidate:
+                    self.table_candidate_pages.append(parsed.page_num)
+    
+    def _extract_with_pdfplumber_parallel(self):
+        """페이지 구간을 프로세스 풀에 나눠 추출하고 페이지 순서대로 합침"""
+        with PDFPageCache(self.pdf_path) as cache:
+            self.metadata = cache.metadata
+            page_count = cache.page_count
+        
+        # 페이지마다 처리 시간이 달라서 워커 수보다 잘게 나눠 고르게 분배
+        shard_size = max(1, -(-page_count // (self.workers * PAGE_SHARDS_PER_WORKER)))
+        starts = list(range(0, page_count, shard_size))
+        ends = [min(start + shard_size, page_count) for start in starts]
+        
+        progress = tqdm(total=page_count, desc="페이지 처리") if TQDM_AVAILABLE else None
+        with ProcessPoolExecutor(max_workers=min(self.workers, len(starts) or 1)) as executor:
+            # map은 제출 순서대로 결과를 돌려주므로 페이지 순서가 유지됨
+            results = executor.map(
+                _extract_page_range,
+                [str(self.pdf_path)] * len(starts),
+                starts,
+                ends,
+            )
+            for start, end, (text_blocks, tables, candidate_pages) in zip(starts, ends, results):
+                self.text_blocks.extend(text_blocks)
+                self.tables.extend(tables)
+                self.table_candidate_pages.extend(candidate_pages)
+                if progress is not None:
+                    progress.update(end - start)
+        if progress is not None:
+            progress.close()
+    
+    @staticmethod
+    def _extract_page(parsed: ParsedPage) -> Tuple[List[TextBlock], List[TableData], bool]:
+        """한 페이지의 텍스트 블록과 테이블 추출 (세 번째 값은 Camelot 후보 페이지 여부)"""
+        page_num = parsed.page_num
+        
+        # 텍스트 추출 (레이아웃 보존)
+        text_blocks = PDFExtractor._extract_text_with_layout(parsed)
+        table_list = []
+        
+        # 테이블 추출 (캐시된 페이지의 이미 해석된 객체를 재사용)
+        # extract_tables()와 같은 결과지만, 교차 검증에 쓸 위치(bbox)도 함께 얻음
+        tables = parsed.page.find_tables()
+        for table_idx, found in enumerate(tables):
+            table = found.extract()
+            if table and len(table) > 1:  # 유효한 테이블만
+                table_data = TableData(
+                    data=table,
+                    page_num=page_num,
+                    source='pdfplumber',
+                    confidence=PDFExtractor._calculate_table_confidence(table),
+                    bbox=tuple(found.bbox),
+                    index=table_idx + 1
+                )
+                table_list.append(table_data)
                 
-                # 테이블 추출
-                tables = page.extract_tables()
-                for table_idx, table in enumerate(tables):
-                    if table and len(table) > 1:  # 유효한 테이블만
-                        table_data = TableData(
-                            data=table,
-                            page_num=page_num,
-                            source='pdfplumber',
-                            confidence=self._calculate_table_confidence(table)
-                        )
-                        self.tables.append(table_data)
-                        
-                        # 테이블 위치에 마커 추가
-                        self.text_blocks.append(TextBlock(
-                            text=f"[TABLE_{page_num}_{table_idx + 1}]",
-                            block_type='table',
-                            page_num=page_num
-                        ))
-    
-    def _extract_text_with_layout(self, page, page_num: int):
+                # 테이블 위치에 마커 추가
+                text_blocks.append(TextBlock(
+                    text=f"[TABLE_{page_num}_{table_idx + 1}]",
+                    block_type='table',
+                    page_num=page_num,
+                    bbox=tuple(found.bbox)
+                ))
+        is_candidate = PDFExtractor._is_table_candidate(parsed, bool(tables))
+        return text_blocks, table_list, is_candidate
+    
+    @staticmethod
+    def _is_table_candidate(parsed: ParsedPage, has_pdfplumber_table: bool) -> bool:
+        """Camelot으로 다시 볼 만한 페이지인지 판별
+        
+        pdfplumber가 테이블을 찾았거나, 가로/세로 괘선이 충분하거나(lattice),
+        여러 줄에 걸쳐 같은 위치에서 시작하는 열이 있으면(stream) 후보로 봄.
+        """
+        # 텍스트 레이어가 없는 페이지(스캔, 윤곽선 글꼴)는 Camelot도 읽지 못함
+        if not parsed.chars:
+            return False
+        if has_pdfplumber_table:
+            return True
+        
+        # 괘선 휴리스틱: 선/사각형 테두리 중 충분히 긴 것만 셈
+        horizontal = vertical = 0
+        for line in parsed.lines:
+            if line['height'] < 1 and line['width'] >= MIN_RULING_LENGTH:
+                horizontal += 1
+            elif line['width'] < 1 and line['height'] >= MIN_RULING_LENGTH:
+                vertical += 1
+        for rect in parsed.rects:
+            # 사각형은 위/아래 가로 테두리와 좌/우 세로 테두리로 셈
+            if rect['width'] >= MIN_RULING_LENGTH:
+                horizontal += 2
+            if rect['height'] >= MIN_RULING_LENGTH:
+                vertical += 2
+        if horizontal >= MIN_HORIZONTAL_RULINGS and vertical >= MIN_VERTICAL_RULINGS:
+            return True
+        
+        # 공백 열 휴리스틱: 줄마다 큰 공백으로 나뉜 구간의 시작 위치를 모음
+        lines = {}
+        for word in parsed.words:
+            lines.setdefault(round(word['top']), []).append(word)
+        column_starts = Counter()
+        multi_column_rows = 0
+        for words in lines.values():
+            words = sorted(words, key=lambda w: w['x0'])
+            starts = [words[0]['x0']]
+            for prev, word in zip(words, words[1:]):
+                if word['x0'] - prev['x1'] >= COLUMN_GAP:
+                    starts.append(word['x0'])
+            if len(starts) >= MIN_COLUMNS:
+                multi_column_rows += 1
+                column_starts.update({round(x / COLUMN_BUCKET) for x in starts})
+        if multi_column_rows < MIN_COLUMN_ROWS:
+            return False
+        columns = [x for x, rows in column_starts.items() if rows >= MIN_COLUMN_ROWS]
+        return len(columns) >= MIN_COLUMNS
+    
+    @staticmethod
+    def _extract_text_with_layout(parsed: ParsedPage) -> List[TextBlock]:
         """레이아웃을 보존하며 텍스트 추출"""
+        page_num = parsed.page_num
+        
         # 텍스트를 문자 단위로 추출하여 스타일 정보 분석
-        chars = page.chars if hasattr(page, 'chars') else []
+        chars = parsed.chars
         
         # 폰트 크기별로 그룹화 (heading 감지용)
         font_sizes = {}
@@ -126,10 +437,11 @@ class PDFExtractor:
             avg_size = 12
         
         # 텍스트 라인별로 추출
-        text = page.extract_text()
+        text = parsed.text
         if not text:
-            return
+            return []
         
+        blocks = []
         lines = text.split('\n')
         current_paragraph = []
         
@@ -139,7 +451,7 @@ class PDFExtractor:
                 # 빈 줄 = 단락 구분
                 if current_paragraph:
                     paragraph_text = ' '.join(current_paragraph)
-                    self._add_text_block(paragraph_text, page_num, avg_size)
+                    PDFExtractor._add_text_block(blocks, paragraph_text, page_num, avg_size)
                     current_paragraph = []
                 continue
             
@@ -148,9 +460,11 @@ class PDFExtractor:
         # 마지막 단락 처리
         if current_paragraph:
             paragraph_text = ' '.join(current_paragraph)
-            self._add_text_block(paragraph_text, page_num, avg_size)
+            PDFExtractor._add_text_block(blocks, paragraph_text, page_num, avg_size)
+        return blocks
     
-    def _add_text_block(self, text: str, page_num: int, avg_font_size: float):
+    @staticmethod
+    def _add_text_block(blocks: List[TextBlock], text: str, page_num: int, avg_font_size: float):
         """텍스트 블록 추가 (타입 자동 판별)"""
         if not text:
             return
@@ -209,7 +523,7 @@ class PDFExtractor:
             level = 0
         
         # 텍스트 블록 추가
-        self.text_blocks.append(TextBlock(
+        blocks.append(TextBlock(
             text=text,
             block_type=block_type,
             level=level,
@@ -217,55 +531,35 @@ class PDFExtractor:
         ))
     
     def _extract_tables_with_camelot(self):
-        """Camelot으로 테이블 추출"""
+        """Camelot으로 테이블 추출 (테이블 후보 페이지만)"""
 
         print("\n🔄 Camelot으로 테이블 보완 중...")
         
-        try:
-            # 모든 페이지에서 테이블 추출 시도
-            # stream 모드: 테이블 경계가 명확하지 않은 경우
-            tables_stream = camelot.read_pdf(
-                str(self.pdf_path),
-                pages='all',
-                flavor='stream',
-                suppress_stdout=True
-            )
+        if not self.table_candidate_pages:
+            self.comparison_report.append("Camelot: 테이블 후보 페이지 없음")
+            return
+        pages = ','.join(str(page_num) for page_num in self.table_candidate_pages)
+        self.comparison_report.append(f"Camelot 후보 페이지: {pages}")
+        
+        # stream 모드: 테이블 경계가 명확하지 않은 경우
+        # lattice 모드: 테이블 경계가 명확한 경우
+        # 두 모드는 서로 독립적이므로 별도 프로세스에서 동시에 실행
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            stream = executor.submit(_read_camelot_tables, str(self.pdf_path), pages, 'stream')
+            lattice = executor.submit(_read_camelot_tables, str(self.pdf_path), pages, 'lattice')
             
-            for table in tables_stream:
-                if len(table.df) > 1:  # 유효한 테이블만
-                    table_data = TableData(
-                        data=table.df.values.tolist(),
-                        page_num=table.page,
-                        source='camelot_stream',
-                        confidence=table.accuracy
-                    )
-                    self.tables.append(table_data)
+            try:
+                self.tables.extend(stream.result())
+            except Exception as e:
+                self.comparison_report.append(f"Camelot 오류: {str(e)}")
             
-            # lattice 모드: 테이블 경계가 명확한 경우
             try:
-                tables_lattice = camelot.read_pdf(
-                    str(self.pdf_path),
-                    pages='all',
-                    flavor='lattice',
-                    suppress_stdout=True
-                )
-                
-                for table in tables_lattice:
-                    if len(table.df) > 1:
-                        table_data = TableData(
-                            data=table.df.values.tolist(),
-                            page_num=table.page,
-                            source='camelot_lattice',
-                            confidence=table.accuracy
-                        )
-                        self.tables.append(table_data)
-            except:
+                self.tables.extend(lattice.result())
+            except Exception:
                 pass  # lattice 모드 실패 시 무시
-                
-        except Exception as e:
-            self.comparison_report.append(f"Camelot 오류: {str(e)}")
     
-    def _calculate_table_confidence(self, table: List[List]) -> float:
+    @staticmethod
+    def _calculate_table_confidence(table: List[List]) -> float:
         """테이블 신뢰도 계산"""
         if not table:
             return 0.0
@@ -292,8 +586,26 @@ class PDFExtractor:
         confidence = (fill_rate * 0.6 + consistency_rate * 0.4) * 100
         return round(confidence, 2)
     
+    @staticmethod
+    def _bbox_overlap(boxes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """(N, 4) bbox 배열에서 N x N IoU 행렬과 포함 비율 행렬 계산
+        
+        포함 비율 [i, j]는 i의 면적 중 j와 겹치는 비율 (1이면 i가 j 안에 완전히 들어 있음)
+        """
+        x0 = np.maximum(boxes[:, None, 0], boxes[None, :, 0])
+        top = np.maximum(boxes[:, None, 1], boxes[None, :, 1])
+        x1 = np.minimum(boxes[:, None, 2], boxes[None, :, 2])
+        bottom = np.minimum(boxes[:, None, 3], boxes[None, :, 3])
+        inter = np.clip(x1 - x0, 0, None) * np.clip(bottom - top, 0, None)
+        area = (boxes[:, 2] - boxes[:, 0]) * (boxes[:, 3] - boxes[:, 1])
+        union = area[:, None] + area[None, :] - inter
+        iou = np.divide(inter, union, out=np.zeros_like(inter), where=union > 0)
+        own_area = np.broadcast_to(area[:, None], inter.shape)
+        inside = np.divide(inter, own_area, out=np.zeros_like(inter), where=own_area > 0)
+        return iou, inside
+    
     def _cross_validate_tables(self):
-        """여러 소스의 테이블 교차 검증 및 병합"""
+        """여러 소스의 테이블 교차 검증 및 병합 (추출을 다시 하지 않고 모인 테이블만으로 진행)"""
 
         print("\n🔄 테이블 교차 검증 중...")
         
@@ -306,37 +618,139 @@ class PDFExtractor:
         
         # 각 페이지에서 최적 테이블 선택
         validated_tables = []
-        
         for page_num, page_tables in tables_by_page.items():
-            if len(page_tables) == 1:
-                validated_tables.append(page_tables[0])
-            else:
-                # 여러 소스가 있는 경우 비교
-                sources = {}
-                for table in page_tables:
-                    if table.source not in sources:
-                        sources[table.source] = []
-                    sources[table.source].append(table)
-                
-                # 소스별 최고 신뢰도 테이블 선택
-                best_tables = []
-                for source, tables in sources.items():
-                    best = max(tables, key=lambda t: t.confidence)
-                    best_tables.append(best)
-                
-                # 전체에서 최고 신뢰도 선택
-                if best_tables:
-                    best_table = max(best_tables, key=lambda t: t.confidence)
-                    validated_tables.append(best_table)
-                    
-                    # 비교 리포트 추가
-                    self.comparison_report.append(
-                        f"Page {page_num}: 선택된 소스 = {best_table.source} "
-                        f"(신뢰도: {best_table.confidence:.1f}%)"
-                    )
+            validated_tables.extend(self._select_page_tables(page_num, page_tables))
         
-        # 검증된 테이블로 교체
+        # 검증된 테이블로 교체하고 마커 -> 테이블 색인 생성
         self.tables = validated_tables
+        self.table_index = self._index_tables(self.text_blocks, self.tables)
+    
+    @staticmethod
+    def _table_key(block: TextBlock) -> Optional[Tuple[int, int]]:
+        """테이블 마커 블록의 (페이지, 번호). 마커가 아니면 None"""
+        if block.block_type != 'table':
+            return None
+        table_match = TABLE_MARKER.match(block.text)
+        if not table_match:
+            return None
+        return int(table_match.group(1)), int(table_match.group(2))
+    
+    @staticmethod
+    def _index_tables(text_blocks: List[TextBlock], tables: List[TableData]) -> Dict[Tuple[int, int], TableData]:
+        """(페이지, 번호) -> 테이블 색인 생성
+        
+        pdfplumber 테이블은 자기 마커 번호로 등록하고, 번호가 없는 다른 소스의 테이블은
+        같은 페이지에서 아직 비어 있는 마커 중 위치(bbox IoU >= IOU_THRESHOLD)가 맞는 것에만
+        배정함. 맞는 마커가 없으면 마커와 겹치지 않는 번호로 등록하여 _page_blocks가 페이지
+        끝에 따로 보여주게 함.
+        """
+        markers = {}  # 페이지 -> {마커 번호: 마커 bbox}
+        for block in text_blocks:
+            table_key = PDFExtractor._table_key(block)
+            if table_key:
+                markers.setdefault(table_key[0], {})[table_key[1]] = block.bbox
+        
+        table_index = {}
+        unnumbered = []
+        for table in tables:
+            if table.index is not None:
+                table_index[(table.page_num, table.index)] = table
+            else:
+                unnumbered.append(table)
+        
+        for table in unnumbered:
+            page_markers = markers.get(table.page_num, {})
+            free = [
+                idx for idx, bbox in page_markers.items()
+                if (table.page_num, idx) not in table_index and bbox and table.bbox
+            ]
+            idx = None
+            if free:
+                boxes = np.array([table.bbox] + [page_markers[i] for i in free], dtype=float)
+                overlap = PDFExtractor._bbox_overlap(boxes)[0][0, 1:]
+                if overlap.max() >= IOU_THRESHOLD:
+                    idx = free[int(overlap.argmax())]
+            if idx is None:
+                # 위치가 맞는 마커가 없는 테이블도 색인에는 남김 (마커 번호는 피함)
+                idx = 1
+                while (table.page_num, idx) in table_index or idx in page_markers:
+                    idx += 1
+            table_index[(table.page_num, idx)] = table
+        return table_index
+    
+    @staticmethod
+    def _page_blocks(text_blocks: List[TextBlock], table_index: Dict[Tuple[int, int], TableData]):
+        """페이지 순서대로 (페이지 번호, 블록들) 생성
+        
+        본문에 마커가 없는 테이블(위치를 찾지 못한 다른 소스의 테이블)은 엉뚱한 마커에 끼우지 않고
+        페이지 끝의 별도 제목 아래에 마커 블록을 덧붙여 보여줌.
+        """
+        placed = {PDFExtractor._table_key(block) for block in text_blocks}
+        unplaced = {}
+        for page_num, idx in sorted(table_index):
+            if (page_num, idx) not in placed:
+                unplaced.setdefault(page_num, []).append(idx)
+        
+        blocks_by_page = {}
+        for block in text_blocks:
+            blocks_by_page.setdefault(block.page_num, []).append(block)
+        
+        for page_num in sorted(blocks_by_page.keys() | unplaced.keys()):
+            blocks = blocks_by_page.get(page_num, [])
+            if page_num in unplaced:
+                blocks = blocks + [TextBlock(text='본문 위치를 찾지 못한 테이블', block_type='heading',
+                                             level=1, page_num=page_num)]
+                blocks += [TextBlock(text=f"[TABLE_{page_num}_{idx}]", block_type='table', page_num=page_num)
+                           for idx in unplaced[page_num]]
+            yield page_num, blocks
+    
+    def _select_page_tables(self, page_num: int, page_tables: List[TableData]) -> List[TableData]:
+        """한 페이지의 테이블을 위치로 짝지어 테이블마다 최적 소스 선택
+        
+        소스와 관계없이 bbox IoU가 IOU_THRESHOLD 이상이거나, 한쪽이 다른 쪽 안에 CONTAINMENT_THRESHOLD
+        이상 들어 있는(중첩된) 테이블은 같은 테이블로 묶어 신뢰도가 가장 높은 것만 남기고, 겹치지 않는
+        테이블은 모두 남김. 바깥 테이블(페이지 테두리 등)이 안쪽 테이블보다 신뢰도가 낮으면 안쪽 테이블이 남음.
+        """
+        if len(page_tables) <= 1:
+            return list(page_tables)
+        
+        # 위치를 모르는 테이블은 빈 bbox로 두어 어떤 테이블과도 묶이지 않게 함
+        boxes = np.array([table.bbox or (0, 0, 0, 0) for table in page_tables], dtype=float)
+        iou, inside = self._bbox_overlap(boxes)
+        # 중첩 비율: 두 테이블 중 작은 쪽이 큰 쪽 안에 들어 있는 비율
+        nested = np.maximum(inside, inside.T)
+        
+        # 신뢰도 높은 순으로 보면서, 이미 고른 테이블과 충분히 겹치거나 중첩되면 그 테이블의 후보로 묶음
+        order = sorted(range(len(page_tables)), key=lambda i: page_tables[i].confidence, reverse=True)
+        groups = {}  # 고른 테이블 위치 -> 묶인 후보 위치들
+        for i in order:
+            matches = [k for k in groups if iou[i, k] >= IOU_THRESHOLD or nested[i, k] >= CONTAINMENT_THRESHOLD]
+            if matches:
+                best = max(matches, key=lambda k: (iou[i, k], nested[i, k]))
+                groups[best].append(i)
+                continue
+            groups[i] = [i]
+        
+        selected = []
+        for k in sorted(groups):  # 원래 순서 유지
+            best_table = page_tables[k]
+            candidates = [page_tables[i] for i in groups[k]]
+            if best_table.index is None:
+                # 다른 소스가 선택되어도 가장 많이 겹치는 pdfplumber 테이블의 마커 번호를 이어받음
+                numbered = [i for i in groups[k] if page_tables[i].index is not None]
+                if numbered:
+                    index = page_tables[max(numbered, key=lambda i: iou[k, i])].index
+                    best_table = replace(best_table, index=index)
+            selected.append(best_table)
+            
+            # 비교 리포트 추가
+            if len(candidates) > 1:
+                others = ', '.join(f"{t.source} {t.confidence:.1f}%" for t in candidates[1:])
+                self.comparison_report.append(
+                    f"Page {page_num}: 선택된 소스 = {best_table.source} "
+                    f"(신뢰도: {best_table.confidence:.1f}%, 비교: {others})"
+                )
+        return selected
     
     def _save_results(self):
         """결과 저장"""
@@ -355,6 +769,10 @@ class PDFExtractor:
         self._save_tables()
         
         # 5. 비교 리포트 저장
+        self._save_comparison_report()
+    
+    def _save_comparison_report(self):
+        """비교 리포트 저장"""
         if self.comparison_report:
             report_path = self.output_dir / "comparison_report.txt"
             report_path.write_text('\n'.join(self.comparison_report), encoding='utf-8')
@@ -362,143 +780,126 @@ class PDFExtractor:
     
     def _save_markdown(self):
         """Markdown 형식으로 저장"""
-        md_lines = []
-        current_page = 0
-        
-        for block in self.text_blocks:
+        md_path = self.output_dir / "extracted_text.md"
+        self._write_lines(md_path, self._iter_markdown_lines())
+        print(f"  ✅ Markdown: {md_path}")
+    
+    def _iter_markdown_lines(self):
+        """Markdown 줄을 차례로 생성"""
+        for page_num, blocks in self._page_blocks(self.text_blocks, self.table_index):
             # 페이지 구분
-            if block.page_num != current_page:
-                current_page = block.page_num
-                md_lines.append(f"\n---\n\n# 📄 Page {current_page}\n")
+            yield f"\n---\n\n# 📄 Page {page_num}\n"
             
-            # 블록 타입별 포맷팅
-            if block.block_type == 'heading':
-                prefix = '#' * (block.level + 1)
-                md_lines.append(f"\n{prefix} {block.text}\n")
-            elif block.block_type == 'list_item':
-                indent = '  ' * (block.level - 1)
-                md_lines.append(f"{indent}- {block.text}")
-            elif block.block_type == 'table':
-                # 테이블 마커 찾기
-                table_match = re.match(r'\[TABLE_(\d+)_(\d+)\]', block.text)
-                if table_match:
-                    page_num = int(table_match.group(1))
-                    table_idx = int(table_match.group(2))
-                    
-                    # 해당 테이블 찾기
-                    for table in self.tables:
-                        if table.page_num == page_num:
-                            md_lines.append(f"\n### 📊 Table {table_idx}\n")
-                            if table.data:
-                                # 테이블을 Markdown 형식으로 변환
-                                md_table = tabulate(
-                                    table.data[1:] if len(table.data) > 1 else table.data,
-                                    headers=table.data[0] if table.data else [],
-                                    tablefmt='pipe'
-                                )
-                                md_lines.append(md_table)
-                                md_lines.append(f"\n*Source: {table.source}, Confidence: {table.confidence:.1f}%*\n")
-                            break
-            else:  # paragraph
-                md_lines.append(f"\n{block.text}\n")
+            for block in blocks:
+                yield from self._markdown_block_lines(block, self.table_index)
+    
+    @staticmethod
+    def _markdown_block_lines(block: TextBlock, table_index: Dict[Tuple[int, int], TableData]) -> List[str]:
+        """블록 하나를 Markdown 줄들로 변환 (테이블 마커는 table_index에서 찾아 표로 변환)"""
+        md_lines = []
         
-        # 파일 저장
-        md_path = self.output_dir / "extracted_text.md"
-        md_path.write_text('\n'.join(md_lines), encoding='utf-8')
-        print(f"  ✅ Markdown: {md_path}")
+        # 블록 타입별 포맷팅
+        if block.block_type == 'heading':
+            prefix = '#' * (block.level + 1)
+            md_lines.append(f"\n{prefix} {block.text}\n")
+        elif block.block_type == 'list_item':
+            indent = '  ' * (block.level - 1)
+            md_lines.append(f"{indent}- {block.text}")
+        elif block.block_type == 'table':
+            # 테이블 마커로 해당 테이블 찾기
+            table_key = PDFExtractor._table_key(block)
+            table = table_index.get(table_key) if table_key else None
+            if table is not None:
+                md_lines.append(f"\n### 📊 Table {table_key[1]}\n")
+                if table.data:
+                    # 테이블을 Markdown 형식으로 변환
+                    md_table = tabulate(
+                        table.data[1:] if len(table.data) > 1 else table.data,
+                        headers=table.data[0] if table.data else [],
+                        tablefmt='pipe'
+                    )
+                    md_lines.append(md_table)
+                    md_lines.append(f"\n*Source: {table.source}, Confidence: {table.confidence:.1f}%*\n")
+        else:  # paragraph
+            md_lines.append(f"\n{block.text}\n")
+        return md_lines
     
     def _save_html(self):
         """HTML 형식으로 저장"""
-        html_lines = ["""
-<!DOCTYPE html>
-<html lang="ko">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>PDF 추출 결과</title>
-    <style>
-        body { font-family: 'Malgun Gothic', sans-serif; max-width: 900px; margin: 0 auto; padding: 20px; }
-        h1 { color: #2c3e50; border-bottom: 2px solid #3498db; padding-bottom: 10px; }
-        h2 { color: #34495e; margin-top: 30px; }
-        h3 { color: #7f8c8d; }
-        .page-break { border-top: 3px double #bdc3c7; margin: 40px 0; padding-top: 20px; }
-        .list-item { margin-left: 20px; }
-        .list-item-2 { margin-left: 40px; }
-        table { border-collapse: collapse; width: 100%; margin: 20px 0; }
-        th, td { border: 1px solid #ddd; padding: 8px; text-align: left; }
-        th { background-color: #f2f2f2; }
-        .table-info { font-size: 0.9em; color: #7f8c8d; font-style: italic; }
-        .paragraph { margin: 15px 0; line-height: 1.6; }
-    </style>
-</head>
-<body>
-    <h1>📄 PDF 추출 결과</h1>
-        """]
-        
-        current_page = 0
+        html_path = self.output_dir / "extracted_text.html"
+        self._write_lines(html_path, self._iter_html_lines())
+        print(f"  ✅ HTML: {html_path}")
+    
+    def _iter_html_lines(self):
+        """HTML 줄을 차례로 생성"""
+        yield HTML_HEAD
         
-        for block in self.text_blocks:
+        for page_num, blocks in self._page_blocks(self.text_blocks, self.table_index):
             # 페이지 구분
-            if block.page_num != current_page:
-                if current_page > 0:
-                    html_lines.append('</div>')
-                current_page = block.page_num
-                html_lines.append(f'<div class="page-break"><h2>Page {current_page}</h2>')
+            yield f'<div class="page-break"><h2>Page {page_num}</h2>'
             
-            # 블록 타입별 HTML
-            if block.block_type == 'heading':
-                tag = f'h{min(block.level + 2, 6)}'
-                html_lines.append(f'<{tag}>{block.text}</{tag}>')
-            elif block.block_type == 'list_item':
-                class_name = f'list-item-{block.level}' if block.level > 1 else 'list-item'
-                html_lines.append(f'<div class="{class_name}">• {block.text}</div>')
-            elif block.block_type == 'table':
-                # 테이블 HTML
-                table_match = re.match(r'\[TABLE_(\d+)_(\d+)\]', block.text)
-                if table_match:
-                    page_num = int(table_match.group(1))
-                    table_idx = int(table_match.group(2))
-                    
-                    for table in self.tables:
-                        if table.page_num == page_num:
-                            html_lines.append(f'<h3>Table {table_idx}</h3>')
-                            if table.data:
-                                html_lines.append('<table>')
-                                # 헤더
-                                if len(table.data) > 0:
-                                    html_lines.append('<thead><tr>')
-                                    for cell in table.data[0]:
-                                        html_lines.append(f'<th>{cell if cell else ""}</th>')
-                                    html_lines.append('</tr></thead>')
-                                # 본문
-                                if len(table.data) > 1:
-                                    html_lines.append('<tbody>')
-                                    for row in table.data[1:]:
-                                        html_lines.append('<tr>')
-                                        for cell in row:
-                                            html_lines.append(f'<td>{cell if cell else ""}</td>')
-                                        html_lines.append('</tr>')
-                                    html_lines.append('</tbody>')
-                                html_lines.append('</table>')
-                                html_lines.append(f'<div class="table-info">Source: {table.source}, Confidence: {table.confidence:.1f}%</div>')
-                            break
-            else:  # paragraph
-                html_lines.append(f'<p class="paragraph">{block.text}</p>')
-        
-        if current_page > 0:
-            html_lines.append('</div>')
-        
-        html_lines.append('</body></html>')
+            for block in blocks:
+                yield from self._html_block_lines(block, self.table_index)
+            
+            yield '</div>'
         
-        # 파일 저장
-        html_path = self.output_dir / "extracted_text.html"
-        html_path.write_text('\n'.join(html_lines), encoding='utf-8')
-        print(f"  ✅ HTML: {html_path}")
+        yield '</body></html>'
+    
+    @staticmethod
+    def _html_block_lines(block: TextBlock, table_index: Dict[Tuple[int, int], TableData]) -> List[str]:
+        """블록 하나를 HTML 줄들로 변환"""
+        html_lines = []
+        
+        # 블록 타입별 HTML
+        if block.block_type == 'heading':
+            tag = f'h{min(block.level + 2, 6)}'
+            html_lines.append(f'<{tag}>{block.text}</{tag}>')
+        elif block.block_type == 'list_item':
+            class_name = f'list-item-{block.level}' if block.level > 1 else 'list-item'
+            html_lines.append(f'<div class="{class_name}">• {block.text}</div>')
+        elif block.block_type == 'table':
+            # 테이블 HTML
+            table_key = PDFExtractor._table_key(block)
+            table = table_index.get(table_key) if table_key else None
+            if table is not None:
+                html_lines.append(f'<h3>Table {table_key[1]}</h3>')
+                if table.data:
+                    html_lines.append('<table>')
+                    # 헤더
+                    if len(table.data) > 0:
+                        html_lines.append('<thead><tr>')
+                        for cell in table.data[0]:
+                            html_lines.append(f'<th>{cell if cell else ""}</th>')
+                        html_lines.append('</tr></thead>')
+                    # 본문
+                    if len(table.data) > 1:
+                        html_lines.append('<tbody>')
+                        for row in table.data[1:]:
+                            html_lines.append('<tr>')
+                            for cell in row:
+                                html_lines.append(f'<td>{cell if cell else ""}</td>')
+                            html_lines.append('</tr>')
+                        html_lines.append('</tbody>')
+                    html_lines.append('</table>')
+                    html_lines.append(f'<div class="table-info">Source: {table.source}, Confidence: {table.confidence:.1f}%</div>')
+        else:  # paragraph
+            html_lines.append(f'<p class="paragraph">{block.text}</p>')
+        return html_lines
+    
+    @staticmethod
+    def _write_lines(path: Path, lines):
+        """줄들을 버퍼링된 파일에 바로 씀 ('\\n'.join 결과와 같은 내용, 전체 문자열을 만들지 않음)"""
+        with open(path, 'w', encoding='utf-8', buffering=WRITE_BUFFER_SIZE) as f:
+            for i, line in enumerate(lines):
+                if i:
+                    f.write('\n')
+                f.write(line)
     
     def _save_json(self):
         """JSON 형식으로 저장"""
         data = {
             'pdf_file': str(self.pdf_path),
+            'metadata': self.metadata,
             'total_pages': max([b.page_num for b in self.text_blocks]) if self.text_blocks else 0,
             'total_blocks': len(self.text_blocks),
             'total_tables': len(self.tables),
@@ -516,29 +917,37 @@ class PDFExtractor:
                 }
             
             if block.block_type != 'table':
-                pages[block.page_num]['blocks'].append({
-                    'type': block.block_type,
-                    'level': block.level,
-                    'text': block.text
-                })
+                pages[block.page_num]['blocks'].append(self._block_json(block))
         
         # 테이블 추가
         for table in self.tables:
             if table.page_num in pages:
-                pages[table.page_num]['tables'].append({
-                    'source': table.source,
-                    'confidence': table.confidence,
-                    'data': table.data
-                })
+                pages[table.page_num]['tables'].append(self._table_json(table))
         
         data['content'] = list(pages.values())
         
         # 파일 저장
         json_path = self.output_dir / "extracted_data.json"
         with open(json_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+            json.dump(data, f, ensure_ascii=False, indent=2, default=str)  # 메타데이터에 PDF 객체가 섞일 수 있음
         print(f"  ✅ JSON: {json_path}")
     
+    @staticmethod
+    def _block_json(block: TextBlock) -> Dict[str, Any]:
+        return {
+            'type': block.block_type,
+            'level': block.level,
+            'text': block.text
+        }
+    
+    @staticmethod
+    def _table_json(table: TableData) -> Dict[str, Any]:
+        return {
+            'source': table.source,
+            'confidence': table.confidence,
+            'data': table.data
+        }
+    
     def _save_tables(self):
         """테이블을 CSV와 Excel로 저장"""
         if not self.tables:
@@ -549,10 +958,7 @@ class PDFExtractor:
         
         # 개별 CSV 저장
         for idx, table in enumerate(self.tables, 1):
-            if table.data:
-                df = pd.DataFrame(table.data[1:], columns=table.data[0] if table.data else None)
-                csv_path = tables_dir / f"page{table.page_num}_table{idx}.csv"
-                df.to_csv(csv_path, index=False, encoding='utf-8-sig')
+            self._save_table_csv(table, idx, tables_dir)
         
         # 통합 Excel 저장
         excel_path = tables_dir / "all_tables.xlsx"
@@ -564,15 +970,67 @@ class PDFExtractor:
                     df.to_excel(writer, sheet_name=sheet_name, index=False)
         
         print(f"  ✅ Tables: {tables_dir}/")
+    
+    @staticmethod
+    def _save_table_csv(table: TableData, idx: int, tables_dir: Path):
+        """테이블 하나를 page{페이지}_table{번호}.csv로 저장"""
+        if table.data:
+            df = pd.DataFrame(table.data[1:], columns=table.data[0] if table.data else None)
+            csv_path = tables_dir / f"page{table.page_num}_table{idx}.csv"
+            df.to_csv(csv_path, index=False, encoding='utf-8-sig')
+
+
+def _extract_page_range(pdf_path: str, start: int, end: int) -> Tuple[List[TextBlock], List[TableData], List[int]]:
+    """워커 프로세스에서 PDF를 직접 열어 pages[start:end] 구간을 추출"""
+    text_blocks = []
+    tables = []
+    candidate_pages = []
+    # 캐시가 오래된 페이지를 닫으므로 구간이 길어도 메모리가 쌓이지 않음
+    with PDFPageCache(pdf_path) as cache:
+        for parsed in cache.pages(start + 1, end):
+            page_blocks, page_tables, is_candidate = PDFExtractor._extract_page(parsed)
+            text_blocks.extend(page_blocks)
+            tables.extend(page_tables)
+            if is_candidate:
+                candidate_pages.append(parsed.page_num)
+    return text_blocks, tables, candidate_pages
+
+
+def _read_camelot_tables(pdf_path: str, pages: str, flavor: str) -> List[TableData]:
+    """Camelot으로 지정한 페이지들의 테이블을 읽음 (워커 프로세스에서 실행)"""
+    tables = camelot.read_pdf(
+        pdf_path,
+        pages=pages,
+        flavor=flavor,
+        suppress_stdout=True
+    )
+    results = []
+    for table in tables:
+        if len(table.df) > 1:  # 유효한 테이블만
+            # Camelot bbox는 (x1, y1, x2, y2), 원점이 페이지 왼쪽 아래 -> pdfplumber 좌표로 변환
+            x1, y1, x2, y2 = table._bbox
+            page_height = table.pdf_size[1]
+            results.append(TableData(
+                data=table.df.values.tolist(),
+                page_num=table.page,
+                source=f'camelot_{flavor}',
+                confidence=table.accuracy,
+                bbox=(x1, page_height - y2, x2, page_height - y1)
+            ))
+    return results
 
 
 def main():
     """메인 함수"""
-    if len(sys.argv) < 2:
-        print("사용법: python extract_pdf_advanced.py <PDF파일>")
-        sys.exit(1)
+    parser = argparse.ArgumentParser(description="PDF에서 텍스트와 테이블을 추출합니다.")
+    parser.add_argument("pdf_file", help="PDF 파일 경로")
+    parser.add_argument("--output-dir", default="output", help="결과 저장 디렉토리")
+    parser.add_argument("--workers", type=int, default=1, help="pdfplumber 추출 프로세스 수 (0이면 CPU 수)")
+    parser.add_argument("--stream", action="store_true",
+                        help="페이지 단위로 바로 기록 (NDJSON/Markdown/CSV, 메모리 사용량 일정)")
+    args = parser.parse_args()
     
-    pdf_file = sys.argv[1]
+    pdf_file = args.pdf_file
     
     # 파일 존재 확인
     if not Path(pdf_file).exists():
@@ -580,9 +1038,13 @@ def main():
         sys.exit(1)
     
     # 추출기 실행
-    extractor = PDFExtractor(pdf_file)
-    extractor.extract_all()
+    extractor = PDFExtractor(pdf_file, output_dir=args.output_dir, workers=args.workers or None)
+    if args.stream:
+        extractor.extract_streaming()
+    else:
+        extractor.extract_all()
 
 
+# ProcessPoolExecutor의 워커가 이 파일을 다시 import해도 main()이 실행되지 않도록 보호
 if __name__ == "__main__":
     main()
\ No newline at end of file
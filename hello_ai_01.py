@@ -1,6 +1,8 @@
 import os
+import time
 from dotenv import load_dotenv
 from openai import OpenAI
+from metering import meter, record_usage
 
 load_dotenv()
 
@@ -25,16 +27,31 @@ while True:
         {"role" : "user", "content": user_content}
     )
 
-    response = client.chat.completions.create(
+    # stream=True: 응답이 완성될 때까지 기다리지 않고 조각(delta)마다 출력
+    started_at = time.perf_counter()
+    stream = client.chat.completions.create(
         model="gpt-4o-mini",
         messages=messages,
+        stream=True,
+        stream_options={"include_usage": True},
     )
 
-    assistant_content: str = response.choices[0].message.content
+    print("AI : ", end="", flush=True)
+    parts = []
+    for chunk in stream:
+        if chunk.choices and chunk.choices[0].delta.content:
+            parts.append(chunk.choices[0].delta.content)
+            print(chunk.choices[0].delta.content, end="", flush=True)
+        if chunk.usage:  # 마지막 청크에 usage가 담겨서 옴
+            record_usage("gpt-4o-mini", started_at, chunk.usage, caller="hello_ai_01")
+    print()
+
+    assistant_content: str = "".join(parts)
     messages.append(
         {"role": "assistant", "content": assistant_content}
     )
-    print("AI : ", assistant_content)
 
     # print("response.usage : ", response.usage)
     # print(response.choices[0].message.content)
+
+print("누적 사용량 :", meter.grand_total())
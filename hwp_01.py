@@ -1,6 +1,9 @@
+import argparse
 import os
 import subprocess
 
+from hwp_bulk import convert_hwp_files
+
 def find_업무분장_hwp_files(base_path: str):
     """
     지정 경로 내의 모든 하위 디렉토리에서
@@ -30,11 +33,26 @@ def run_convert_cmd(hwp_path: str):
       print(f"변환 성공: {output_path}")
 
 def main():
-    hwp_files = find_업무분장_hwp_files(".")
-    print("찾은 업무분장 hwp 파일들:", hwp_files)
-    for hwp_path in hwp_files:
-        # html_path = run_convert_cmd(hwp_path)
-        html_str = hwp_to_html(hwp_path=hwp_path)
-        print("created")
-        print(html_str)  # 앞 500자만 출력
-main() 
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="업무분장 hwp 파일들을 html로 일괄 변환합니다.")
+    parser.add_argument("base_path", nargs="?", default=".", help="검색할 디렉토리")
+    parser.add_argument("--workers", type=int, default=None, help="워커 프로세스 수 (기본: CPU 수)")
+    parser.add_argument("--timeout", type=float, default=300.0, help="파일 1건의 최대 변환 시간(초)")
+    args = parser.parse_args()
+
+    hwp_files = find_업무분장_hwp_files(args.base_path)
+    print(f"찾은 업무분장 hwp 파일: {len(hwp_files)}건")
+
+    # for hwp_path in hwp_files:
+    #     html_path = run_convert_cmd(hwp_path)
+    failed = 0
+    for result in convert_hwp_files(hwp_files, workers=args.workers, timeout=args.timeout):
+        if result.ok:
+            print(f"변환 성공: {result.html_path} ({result.elapsed:.2f}초)")
+        else:
+            failed += 1
+            print(f"변환 실패: {result.hwp_path}: {result.error}")
+    print(f"완료: 성공 {len(hwp_files) - failed}건, 실패 {failed}건")
+
+# ProcessPoolExecutor의 워커가 이 파일을 다시 import해도 main()이 실행되지 않도록 보호
+if __name__ == "__main__":
+    main()
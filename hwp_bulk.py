@@ -0,0 +1,189 @@
+import multiprocessing
+import os
+import signal
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from multiprocessing.queues import SimpleQueue
+from typing import Iterable, Iterator
+
+from utils import hwp_to_html
+
+# 워커 프로세스가 비정상 종료되어 같이 실패한 파일을 다시 시도하는 최대 횟수
+MAX_ATTEMPTS = 2
+
+
+@dataclass
+class ConversionResult:
+    """HWP 파일 1건의 변환 결과.
+
+    Attributes:
+        hwp_path: 원본 HWP 파일 경로
+        html_path: 저장한 HTML 파일 경로
+        elapsed: 변환에 걸린 시간(초). 실패한 경우 실패까지 걸린 시간
+        error: 실패 사유. 성공했으면 None
+    """
+
+    hwp_path: str
+    html_path: str
+    elapsed: float
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def html_path_for(hwp_path: str) -> str:
+    """HWP 파일과 같은 위치에 저장할 HTML 파일 경로를 반환합니다."""
+    return os.path.splitext(hwp_path)[0] + ".html"
+
+
+def convert_to_file(hwp_path: str, html_path: str, use_cache: bool = True) -> float:
+    """HWP 파일 하나를 HTML 파일로 저장하고, 걸린 시간(초)을 반환합니다.
+
+    임시 파일에 쓴 뒤 교체하므로, 중간에 중단되어도 반쯤 쓰인 HTML이 남지 않습니다.
+    """
+    started_at = time.perf_counter()
+    html = hwp_to_html(hwp_path=hwp_path, cache=use_cache)
+    temp_path = html_path + ".tmp"
+    with open(temp_path, "wt", encoding="utf-8") as f:
+        f.write(html)
+    os.replace(temp_path, html_path)
+    return time.perf_counter() - started_at
+
+
+def _report_pid(pid_queue: SimpleQueue) -> None:
+    """워커 프로세스 initializer: 자신의 PID를 부모 프로세스에 알립니다."""
+    pid_queue.put(os.getpid())
+
+
+def _new_executor(workers: int) -> tuple[ProcessPoolExecutor, SimpleQueue]:
+    """워커 PID를 pid_queue로 보고하는 프로세스 풀을 만듭니다."""
+    context = multiprocessing.get_context()
+    pid_queue = context.SimpleQueue()
+    executor = ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=context,
+        initializer=_report_pid,
+        initargs=(pid_queue,),
+    )
+    return executor, pid_queue
+
+
+def _terminate(executor: ProcessPoolExecutor, pid_queue: SimpleQueue) -> None:
+    """실행 중인 작업까지 포함해 풀의 워커 프로세스를 모두 종료합니다."""
+    # 실행 중인 작업은 cancel()로 멈출 수 없으므로 워커 프로세스를 직접 종료.
+    # 작업을 실행 중인 워커는 initializer를 이미 거쳤으므로 PID가 큐에 들어 있음
+    while not pid_queue.empty():
+        try:
+            os.kill(pid_queue.get(), signal.SIGTERM)
+        except OSError:  # 이미 종료된 워커
+            pass
+    executor.shutdown(wait=False, cancel_futures=True)
+    pid_queue.close()
+
+
+def convert_hwp_files(
+    hwp_paths: Iterable[str],
+    workers: int | None = None,
+    timeout: float | None = 300.0,
+    use_cache: bool = True,
+) -> Iterator[ConversionResult]:
+    """여러 HWP 파일을 프로세스 풀에서 병렬로 HTML로 변환합니다.
+
+    각 HWP 옆에 같은 이름의 .html 파일을 저장하며, 결과는 끝나는 순서대로
+    하나씩 돌려줍니다. 한 파일의 실패(예외, 시간 초과, 워커 비정상 종료)는
+    해당 파일의 결과로만 보고되고 나머지 변환은 계속됩니다.
+
+    Args:
+        hwp_paths (Iterable[str]): 변환할 HWP 파일 경로들
+        workers (int | None, optional): 워커 프로세스 수. None이면 CPU 수.
+        timeout (float | None, optional): 파일 1건의 최대 변환 시간(초).
+            초과하면 워커를 종료하고 풀을 새로 만듭니다. None이면 무제한.
+        use_cache (bool, optional): hwp_to_html 변환 캐시 사용 여부. 기본값은 True.
+
+    Yields:
+        ConversionResult: 파일 1건의 변환 결과
+    """
+    workers = workers or os.cpu_count() or 1
+    pending = deque((path, 1) for path in hwp_paths)
+    # future -> (hwp_path, 시도 횟수, 제출 시각)
+    running: dict[Future, tuple[str, int, float]] = {}
+    executor, pid_queue = _new_executor(workers)
+
+    try:
+        while pending or running:
+            # 워커 수만큼만 제출하므로 제출 시각 = 시작 시각으로 보고 시간 초과를 판단
+            while pending and len(running) < workers:
+                path, attempt = pending.popleft()
+                future = executor.submit(
+                    convert_to_file, path, html_path_for(path), use_cache
+                )
+                running[future] = (path, attempt, time.monotonic())
+
+            wait_timeout = None
+            if timeout is not None:
+                oldest = min(started_at for _, _, started_at in running.values())
+                wait_timeout = max(0.0, oldest + timeout - time.monotonic())
+            done, _ = wait(running, timeout=wait_timeout, return_when=FIRST_COMPLETED)
+
+            broken = False
+            for future in done:
+                path, attempt, started_at = running.pop(future)
+                try:
+                    elapsed = future.result()
+                except BrokenProcessPool:
+                    # 어느 파일이 워커를 죽였는지 알 수 없으므로 같이 실행 중이던 파일은 재시도
+                    broken = True
+                    if attempt < MAX_ATTEMPTS:
+                        pending.append((path, attempt + 1))
+                        continue
+                    yield ConversionResult(
+                        path,
+                        html_path_for(path),
+                        time.monotonic() - started_at,
+                        "워커 프로세스가 비정상 종료되었습니다.",
+                    )
+                except Exception as e:
+                    yield ConversionResult(
+                        path,
+                        html_path_for(path),
+                        time.monotonic() - started_at,
+                        str(e),
+                    )
+                else:
+                    yield ConversionResult(path, html_path_for(path), elapsed)
+
+            now = time.monotonic()
+            expired = [
+                future
+                for future, (_, _, started_at) in running.items()
+                if timeout is not None and now - started_at >= timeout
+            ]
+            for future in expired:
+                path, _, started_at = running.pop(future)
+                yield ConversionResult(
+                    path,
+                    html_path_for(path),
+                    now - started_at,
+                    f"{timeout}초 안에 변환이 끝나지 않았습니다.",
+                )
+
+            if broken or expired:
+                # 시간 초과된 작업은 멈출 수 없으므로 풀을 새로 만들고 나머지는 다시 제출
+                _terminate(executor, pid_queue)
+                pending.extendleft(
+                    (path, attempt) for path, attempt, _ in running.values()
+                )
+                running.clear()
+                executor, pid_queue = _new_executor(workers)
+    finally:
+        if running:
+            # 호출한 쪽이 중간에 반복을 멈춘 경우
+            _terminate(executor, pid_queue)
+        else:
+            executor.shutdown()
+            pid_queue.close()
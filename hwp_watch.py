@@ -0,0 +1,345 @@
+import argparse
+import os
+import sqlite3
+import threading
+from contextlib import closing
+from dataclasses import dataclass
+from datetime import datetime
+from hashlib import sha256
+
+from hwp_bulk import ConversionResult, convert_hwp_files
+
+# watchdog 임포트 (없거나 inotify를 쓸 수 없으면 주기적 스캔으로 동작)
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+
+    WATCHDOG_AVAILABLE = True
+except ImportError:
+    WATCHDOG_AVAILABLE = False
+
+
+@dataclass
+class ManifestRow:
+    """변환이 끝난 HWP 파일 1건의 기록.
+
+    Attributes:
+        path: HWP 파일 경로
+        mtime: 변환 당시 수정 시각
+        size: 변환 당시 파일 크기 (바이트)
+        sha256: 변환 당시 파일 내용의 해시
+        html_path: 저장한 HTML 파일 경로
+        converted_at: 변환한 시각 (ISO 형식)
+    """
+
+    path: str
+    mtime: float
+    size: int
+    sha256: str
+    html_path: str
+    converted_at: str
+
+
+class HwpManifest:
+    """HWP 경로 -> ManifestRow 를 SQLite에 저장하는 클래스."""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        dir_path = os.path.dirname(db_path)
+        if dir_path:
+            os.makedirs(dir_path, exist_ok=True)
+        with closing(self._connect()) as conn, conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS hwp_files (
+                    path TEXT PRIMARY KEY,
+                    mtime REAL NOT NULL,
+                    size INTEGER NOT NULL,
+                    sha256 TEXT NOT NULL,
+                    html_path TEXT NOT NULL,
+                    converted_at TEXT NOT NULL
+                )
+            """)
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def load(self) -> dict[str, ManifestRow]:
+        """전체 기록을 경로별 dict로 읽어옵니다."""
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT path, mtime, size, sha256, html_path, converted_at FROM hwp_files"
+            ).fetchall()
+        return {row[0]: ManifestRow(*row) for row in rows}
+
+    def upsert(self, rows: list[ManifestRow]) -> None:
+        if not rows:
+            return
+        with closing(self._connect()) as conn, conn:
+            conn.executemany(
+                """
+                INSERT OR REPLACE INTO hwp_files
+                    (path, mtime, size, sha256, html_path, converted_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """,
+                [
+                    (r.path, r.mtime, r.size, r.sha256, r.html_path, r.converted_at)
+                    for r in rows
+                ],
+            )
+
+    def delete(self, paths: list[str]) -> None:
+        if not paths:
+            return
+        with closing(self._connect()) as conn, conn:
+            conn.executemany(
+                "DELETE FROM hwp_files WHERE path = ?", [(path,) for path in paths]
+            )
+
+
+def find_hwp_files(base_path: str) -> list[str]:
+    """base_path 아래의 모든 .hwp 파일 경로를 정렬된 리스트로 반환합니다."""
+    hwp_files = []
+    for root, __, files in os.walk(base_path):
+        for filename in files:
+            if filename.lower().endswith(".hwp"):
+                hwp_files.append(os.path.join(root, filename))
+    return sorted(hwp_files)
+
+
+def _file_hash(path: str) -> str:
+    digest = sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class HwpWatcher:
+    """디렉토리 트리를 감시하며 새로 생기거나 바뀐 HWP 파일만 HTML로 변환합니다.
+
+    각 HWP 옆에 같은 이름의 .html을 저장하고(업무분장/ 폴더와 같은 배치),
+    변환한 파일의 수정 시각/크기/해시를 SQLite manifest에 기록합니다.
+    watchdog(inotify 등)을 쓸 수 있으면 파일 변경 이벤트로, 아니면
+    interval초마다 다시 스캔하여 변경을 찾습니다.
+
+    Examples:
+        >>> watcher = HwpWatcher("./업무분장")
+        >>> watcher.sync()  # 한 번만 확인
+        >>> watcher.run()  # Ctrl+C로 종료할 때까지 감시
+    """
+
+    def __init__(
+        self,
+        base_path: str,
+        db_path: str = ".cache/hwp_manifest.sqlite3",
+        interval: float = 60.0,
+        debounce: float = 2.0,
+        workers: int | None = None,
+        timeout: float | None = 300.0,
+    ):
+        """HwpWatcher 인스턴스 생성.
+
+        Args:
+            base_path: 감시할 디렉토리
+            db_path: manifest SQLite 파일 경로
+            interval: 주기적 스캔 간격(초). 이벤트 감시 중에도 놓친 변경을 잡기 위해 사용
+            debounce: 마지막 이벤트 후 변환을 시작하기까지 기다리는 시간(초)
+            workers: 변환 워커 프로세스 수. None이면 CPU 수
+            timeout: 파일 1건의 최대 변환 시간(초)
+        """
+        # manifest를 여러 디렉토리가 함께 쓰므로 경로는 정규화한 절대 경로로 기록
+        self.base_path = os.path.realpath(base_path)
+        self.manifest = HwpManifest(db_path)
+        self.interval = interval
+        self.debounce = debounce
+        self.workers = workers
+        self.timeout = timeout
+
+        self._changed = threading.Event()
+        self._stop = threading.Event()
+
+    def find_changes(self) -> tuple[list[str], list[str]]:
+        """변환이 필요한 파일과 사라진 파일을 찾습니다.
+
+        크기/수정 시각이 manifest와 같으면 건너뛰고, 다르면 내용 해시로 한 번 더
+        확인합니다. 내용이 그대로인 파일은 manifest의 수정 시각만 갱신합니다.
+
+        Returns:
+            tuple[list[str], list[str]]: (변환할 경로들, manifest에서 제거한 경로들)
+        """
+        snapshots, removed = self._scan()
+        return list(snapshots), removed
+
+    def _scan(self) -> tuple[dict[str, tuple[float, int, str]], list[str]]:
+        """find_changes의 본체. 변환할 파일은 (mtime, size, sha256) 스냅샷과 함께 반환합니다.
+
+        스냅샷은 변환 전 상태로 manifest에 기록되므로, 변환 도중 파일이 바뀌면
+        다음 스캔에서 다시 변환됩니다.
+        """
+        entries = self.manifest.load()
+        sources = find_hwp_files(self.base_path)
+
+        # 다른 디렉토리의 기록은 건드리지 않도록 base_path 아래 경로만 정리
+        prefix = os.path.join(self.base_path, "")
+        removed = sorted(
+            path for path in set(entries) - set(sources) if path.startswith(prefix)
+        )
+        self.manifest.delete(removed)
+
+        snapshots = {}
+        touched = []
+        for source in sources:
+            entry = entries.get(source)
+            try:
+                stat = os.stat(source)
+                unchanged = (
+                    entry is not None
+                    and entry.size == stat.st_size
+                    and entry.mtime == stat.st_mtime
+                )
+                if unchanged and os.path.exists(entry.html_path):
+                    continue
+                digest = _file_hash(source)
+            except OSError as e:
+                # 스캔 도중 삭제되었거나 잠겨 있는 파일은 다음 스캔에서 다시 확인
+                print(f"⚠️ 건너뜀: {source}: {e}")
+                continue
+            if (
+                entry is not None
+                and entry.sha256 == digest
+                and os.path.exists(entry.html_path)
+            ):
+                entry.size, entry.mtime = stat.st_size, stat.st_mtime
+                touched.append(entry)
+            else:
+                snapshots[source] = (stat.st_mtime, stat.st_size, digest)
+        self.manifest.upsert(touched)
+        return snapshots, removed
+
+    def sync(self) -> list[ConversionResult]:
+        """변경된 파일을 한 번 찾아 변환하고, 변환 결과 리스트를 반환합니다."""
+        snapshots, removed = self._scan()
+        for source in removed:
+            print(f"🗑️ 삭제됨: {source}")
+        if not snapshots:
+            return []
+
+        results = []
+        for result in convert_hwp_files(
+            list(snapshots), workers=self.workers, timeout=self.timeout
+        ):
+            results.append(result)
+            if not result.ok:
+                print(f"❌ {result.hwp_path}: {result.error}")
+                continue
+            mtime, size, digest = snapshots[result.hwp_path]
+            self.manifest.upsert(
+                [
+                    ManifestRow(
+                        path=result.hwp_path,
+                        mtime=mtime,
+                        size=size,
+                        sha256=digest,
+                        html_path=result.html_path,
+                        converted_at=datetime.now().isoformat(timespec="seconds"),
+                    )
+                ]
+            )
+            print(
+                f"✅ {result.hwp_path} -> {result.html_path} ({result.elapsed:.2f}초)"
+            )
+        return results
+
+    def _start_observer(self):
+        """watchdog 감시를 시작합니다. 사용할 수 없으면 None을 반환합니다."""
+        if not WATCHDOG_AVAILABLE:
+            return None
+
+        watcher = self
+
+        class _HwpEventHandler(FileSystemEventHandler):
+            def on_any_event(self, event):
+                paths = [event.src_path, getattr(event, "dest_path", "")]
+                if any(str(path).lower().endswith(".hwp") for path in paths):
+                    watcher._changed.set()
+
+        observer = Observer()
+        try:
+            observer.schedule(_HwpEventHandler(), self.base_path, recursive=True)
+            observer.start()
+        except OSError as e:
+            # inotify 감시 개수 제한 초과, 네트워크 드라이브 등
+            print(
+                f"파일 변경 감시를 사용할 수 없어 {self.interval}초마다 스캔합니다: {e}"
+            )
+            return None
+        return observer
+
+    def run(self) -> None:
+        """stop()이 호출되거나 Ctrl+C를 누를 때까지 감시하며 변환합니다."""
+        observer = self._start_observer()
+        mode = "파일 변경 이벤트" if observer else f"{self.interval}초 주기 스캔"
+        print(f"{self.base_path} 감시 시작 ({mode})")
+
+        try:
+            self.sync()
+            while not self._stop.is_set():
+                if self._changed.wait(timeout=self.interval):
+                    # 복사/저장 중인 파일을 피하기 위해 이벤트가 잠잠해질 때까지 대기
+                    while True:
+                        self._changed.clear()
+                        if not self._changed.wait(timeout=self.debounce):
+                            break
+                if self._stop.is_set():
+                    break
+                self.sync()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            if observer:
+                observer.stop()
+                observer.join()
+
+    def stop(self) -> None:
+        """다른 스레드에서 run()을 멈춥니다."""
+        self._stop.set()
+        self._changed.set()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="HWP 폴더를 감시하며 새로 생기거나 바뀐 파일만 HTML로 변환합니다."
+    )
+    parser.add_argument(
+        "base_path", nargs="?", default="./업무분장", help="감시할 디렉토리"
+    )
+    parser.add_argument(
+        "--manifest", default=".cache/hwp_manifest.sqlite3", help="manifest 경로"
+    )
+    parser.add_argument("--interval", type=float, default=60.0, help="스캔 간격(초)")
+    parser.add_argument(
+        "--workers", type=int, default=None, help="워커 프로세스 수 (기본: CPU 수)"
+    )
+    parser.add_argument(
+        "--timeout", type=float, default=300.0, help="파일 1건의 최대 변환 시간(초)"
+    )
+    parser.add_argument("--once", action="store_true", help="한 번만 확인하고 종료")
+    args = parser.parse_args()
+
+    watcher = HwpWatcher(
+        args.base_path,
+        db_path=args.manifest,
+        interval=args.interval,
+        workers=args.workers,
+        timeout=args.timeout,
+    )
+    if args.once:
+        results = watcher.sync()
+        failed = sum(not result.ok for result in results)
+        print(f"완료: 변환 {len(results) - failed}건, 실패 {failed}건")
+    else:
+        watcher.run()
+
+
+if __name__ == "__main__":
+    main()
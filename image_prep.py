@@ -0,0 +1,154 @@
+import io
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, astuple
+from hashlib import sha256
+
+# Pillow 임포트 (없으면 이미지를 원본 그대로 업로드)
+try:
+    from PIL import Image, ImageOps
+
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+
+# detail="low"는 이미지를 512px로 줄여서 보므로, 그 이하 크기면 low로도 정보 손실이 없음
+LOW_DETAIL_MAX_SIDE = 512
+
+
+@dataclass(frozen=True)
+class ImageOptions:
+    """업로드 전 이미지 변환 설정.
+
+    Attributes:
+        max_side: 긴 변의 최대 픽셀 수
+        max_bytes: 인코딩 결과의 목표 최대 크기(바이트)
+        format: 재인코딩 형식 ("JPEG" 또는 "WEBP")
+        quality: 처음 시도할 품질
+        min_quality: max_bytes를 맞추기 위해 내려갈 수 있는 최저 품질
+    """
+
+    max_side: int = 2048
+    max_bytes: int = 1_000_000
+    format: str = "JPEG"
+    quality: int = 85
+    min_quality: int = 55
+
+
+@dataclass
+class PreparedImage:
+    """업로드용으로 변환된 이미지.
+
+    Attributes:
+        data: 인코딩된 이미지 바이트
+        mime_type: MIME 타입
+        detail: OpenAI image_url의 detail 값 ("low" 또는 "high")
+        width: 가로 픽셀 수
+        height: 세로 픽셀 수
+    """
+
+    data: bytes
+    mime_type: str
+    detail: str
+    width: int
+    height: int
+
+
+# 내용 해시 -> 변환 결과 (같은 이미지를 다시 올리면 재인코딩 생략)
+_cache: OrderedDict[tuple, PreparedImage] = OrderedDict()
+_cache_lock = threading.Lock()
+_CACHE_MAX_ENTRIES = 64
+
+
+def _choose_detail(width: int, height: int) -> str:
+    return "low" if max(width, height) <= LOW_DETAIL_MAX_SIDE else "high"
+
+
+def prepare_image(
+    data: bytes | memoryview, mime_type: str, options: ImageOptions | None = None
+) -> PreparedImage:
+    """이미지를 업로드하기 좋은 크기/형식으로 변환합니다.
+
+    EXIF 회전 정보를 적용한 뒤 EXIF를 제거하고, 긴 변을 max_side 이하로 줄이며,
+    max_bytes를 넘으면 품질을 낮추고 그래도 크면 해상도를 더 줄입니다.
+    이미 충분히 작고 EXIF가 없는 이미지는 원본을 그대로 사용합니다.
+
+    Args:
+        data (bytes | memoryview): 원본 이미지 바이트
+        mime_type (str): 원본 MIME 타입
+        options (ImageOptions | None, optional): 변환 설정. None이면 기본값.
+
+    Returns:
+        PreparedImage: 변환된 이미지. Pillow가 없거나 읽을 수 없는 이미지면 원본.
+    """
+    options = options or ImageOptions()
+    data = bytes(data)
+    key = (sha256(data).hexdigest(), astuple(options))
+
+    with _cache_lock:
+        cached = _cache.get(key)
+        if cached is not None:
+            _cache.move_to_end(key)
+            return cached
+
+    prepared = _prepare(data, mime_type, options)
+
+    with _cache_lock:
+        _cache[key] = prepared
+        while len(_cache) > _CACHE_MAX_ENTRIES:
+            _cache.popitem(last=False)
+    return prepared
+
+
+def _prepare(data: bytes, mime_type: str, options: ImageOptions) -> PreparedImage:
+    if not PIL_AVAILABLE:
+        return PreparedImage(data, mime_type, "high", 0, 0)
+
+    try:
+        image = Image.open(io.BytesIO(data))
+        image.load()
+    except Exception:
+        # Pillow가 읽지 못하는 형식은 원본 그대로 전송
+        return PreparedImage(data, mime_type, "high", 0, 0)
+
+    width, height = image.size
+    if (
+        len(data) <= options.max_bytes
+        and max(width, height) <= options.max_side
+        and not image.getexif()
+        and image.format in ("JPEG", "PNG", "WEBP")
+    ):
+        return PreparedImage(
+            data, mime_type, _choose_detail(width, height), width, height
+        )
+
+    # 휴대폰 사진의 회전 정보를 픽셀에 반영 (EXIF는 저장 시 제외됨)
+    image = ImageOps.exif_transpose(image)
+    if image.mode not in ("RGB", "L"):
+        image = image.convert("RGB")
+    image.thumbnail((options.max_side, options.max_side), Image.LANCZOS)
+
+    while True:
+        quality = options.quality
+        while True:
+            buffer = io.BytesIO()
+            image.save(buffer, format=options.format, quality=quality, optimize=True)
+            if buffer.tell() <= options.max_bytes or quality <= options.min_quality:
+                break
+            quality = max(options.min_quality, quality - 10)
+
+        if buffer.tell() <= options.max_bytes or max(image.size) <= LOW_DETAIL_MAX_SIDE:
+            break
+        # 최저 품질로도 크면 해상도를 75%로 줄여서 다시 시도
+        image = image.resize(
+            (int(image.width * 0.75), int(image.height * 0.75)), Image.LANCZOS
+        )
+
+    width, height = image.size
+    return PreparedImage(
+        data=buffer.getvalue(),
+        mime_type=f"image/{options.format.lower()}",
+        detail=_choose_detail(width, height),
+        width=width,
+        height=height,
+    )
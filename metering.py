@@ -0,0 +1,289 @@
+import sqlite3
+import threading
+import time
+from collections import deque
+from contextlib import closing, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, astuple
+from typing import Iterator
+
+# 현재 호출을 일으킨 페이지/작업 이름 (스레드/태스크마다 따로 유지됨)
+DEFAULT_CALLER = "unknown"
+_caller_tag: ContextVar[str] = ContextVar("caller_tag", default=DEFAULT_CALLER)
+
+
+@dataclass
+class CallRecord:
+    """API 호출 1건의 계량 기록.
+
+    Attributes:
+        timestamp: 호출이 끝난 시각 (epoch 초)
+        caller: 호출한 페이지/작업 이름
+        model: 모델명
+        latency: 소요 시간(초)
+        input_tokens: 입력 토큰 수
+        output_tokens: 출력 토큰 수
+        cache_hit: 응답 캐시 적중 여부
+    """
+
+    timestamp: float
+    caller: str
+    model: str
+    latency: float
+    input_tokens: int
+    output_tokens: int
+    cache_hit: bool
+
+
+@dataclass
+class UsageTotals:
+    """(caller, model)별 누적 사용량."""
+
+    calls: int = 0
+    cache_hits: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    latency: float = 0.0
+
+    @property
+    def total_tokens(self) -> int:
+        return self.input_tokens + self.output_tokens
+
+
+class Meter:
+    """프로세스 안의 모든 API 호출 사용량을 모으는 스레드 안전 레지스트리.
+
+    누적값(totals)은 계속 유지되고, 개별 기록(records)은 flush_to_sqlite()로
+    내보낼 때까지 최대 max_records개까지 보관합니다.
+    """
+
+    def __init__(self, max_records: int = 10_000):
+        self._lock = threading.Lock()
+        self._records: deque[CallRecord] = deque(maxlen=max_records)
+        self._totals: dict[tuple[str, str], UsageTotals] = {}
+
+    def record(
+        self,
+        model: str,
+        latency: float,
+        input_tokens: int = 0,
+        output_tokens: int = 0,
+        cache_hit: bool = False,
+        caller: str | None = None,
+    ) -> CallRecord:
+        """호출 1건을 기록합니다. caller가 None이면 현재 caller 태그를 사용합니다."""
+        record = CallRecord(
+            timestamp=time.time(),
+            caller=caller or _caller_tag.get(),
+            model=model,
+            latency=latency,
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            cache_hit=cache_hit,
+        )
+        with self._lock:
+            self._records.append(record)
+            totals = self._totals.setdefault(
+                (record.caller, record.model), UsageTotals()
+            )
+            totals.calls += 1
+            totals.cache_hits += int(cache_hit)
+            totals.input_tokens += input_tokens
+            totals.output_tokens += output_tokens
+            totals.latency += latency
+        return record
+
+    def totals(self) -> dict[tuple[str, str], UsageTotals]:
+        """(caller, model)별 누적 사용량의 복사본을 반환합니다."""
+        with self._lock:
+            return {
+                key: UsageTotals(**vars(value)) for key, value in self._totals.items()
+            }
+
+    def grand_total(self) -> UsageTotals:
+        """전체 누적 사용량을 반환합니다."""
+        total = UsageTotals()
+        for value in self.totals().values():
+            total.calls += value.calls
+            total.cache_hits += value.cache_hits
+            total.input_tokens += value.input_tokens
+            total.output_tokens += value.output_tokens
+            total.latency += value.latency
+        return total
+
+    def reset(self) -> None:
+        """모든 기록과 누적값을 지웁니다."""
+        with self._lock:
+            self._records.clear()
+            self._totals.clear()
+
+    def flush_to_sqlite(self, db_path: str = "usage.db") -> int:
+        """쌓인 개별 기록을 SQLite에 저장하고 비웁니다.
+
+        Args:
+            db_path (str, optional): SQLite 파일 경로. 기본값은 "usage.db".
+
+        Returns:
+            int: 저장한 기록 수
+        """
+        with self._lock:
+            records = list(self._records)
+            self._records.clear()
+        if not records:
+            return 0
+
+        with closing(sqlite3.connect(db_path)) as conn, conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS llm_calls (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    timestamp REAL NOT NULL,
+                    caller TEXT NOT NULL,
+                    model TEXT NOT NULL,
+                    latency REAL NOT NULL,
+                    input_tokens INTEGER NOT NULL,
+                    output_tokens INTEGER NOT NULL,
+                    cache_hit INTEGER NOT NULL
+                )
+            """
+            )
+            conn.executemany(
+                """
+                INSERT INTO llm_calls (timestamp, caller, model, latency,
+                                       input_tokens, output_tokens, cache_hit)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """,
+                [astuple(record) for record in records],
+            )
+        return len(records)
+
+    def to_prometheus(self, prefix: str = "llm") -> str:
+        """누적값을 Prometheus 텍스트 노출 형식으로 반환합니다."""
+        metrics = [
+            ("calls_total", "counter", "API 호출 수", lambda t: t.calls),
+            ("cache_hits_total", "counter", "응답 캐시 적중 수", lambda t: t.cache_hits),
+            ("input_tokens_total", "counter", "입력 토큰 수", lambda t: t.input_tokens),
+            ("output_tokens_total", "counter", "출력 토큰 수", lambda t: t.output_tokens),
+            ("latency_seconds_total", "counter", "누적 소요 시간(초)", lambda t: t.latency),
+        ]
+        totals = self.totals()
+        lines = []
+        for name, metric_type, help_text, getter in metrics:
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} {metric_type}")
+            for (caller, model), value in sorted(totals.items()):
+                labels = f'caller="{_escape(caller)}",model="{_escape(model)}"'
+                lines.append(f"{prefix}_{name}{{{labels}}} {getter(value)}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+# 프로세스 전역 레지스트리
+meter = Meter()
+
+
+def record_call(
+    model: str,
+    latency: float,
+    input_tokens: int = 0,
+    output_tokens: int = 0,
+    cache_hit: bool = False,
+    caller: str | None = None,
+    fallback_caller: str | None = None,
+) -> CallRecord:
+    """전역 meter에 호출 1건을 기록합니다.
+
+    caller가 None이면 현재 caller 태그를 쓰고, 태그가 지정되지 않았으면 fallback_caller를 씁니다.
+    """
+    if caller is None and fallback_caller and _caller_tag.get() == DEFAULT_CALLER:
+        caller = fallback_caller
+    return meter.record(
+        model=model,
+        latency=latency,
+        input_tokens=input_tokens,
+        output_tokens=output_tokens,
+        cache_hit=cache_hit,
+        caller=caller,
+    )
+
+
+def record_usage(
+    model: str,
+    started_at: float,
+    usage,
+    caller: str | None = None,
+    fallback_caller: str | None = None,
+) -> CallRecord:
+    """OpenAI 응답의 usage 객체(CompletionUsage)로 호출 1건을 기록합니다.
+
+    make_response를 거치지 않고 클라이언트를 직접 호출하는 코드에서 사용합니다.
+
+    Args:
+        model (str): 모델명
+        started_at (float): 호출 시작 시각 (time.perf_counter() 값)
+        usage: response.usage (없으면 None)
+        caller (str | None, optional): caller 태그. None이면 현재 태그.
+        fallback_caller (str | None, optional): caller 태그가 지정되지 않았을 때 쓸 이름
+            (보통 호출한 함수 이름).
+    """
+    return record_call(
+        model=model,
+        latency=time.perf_counter() - started_at,
+        input_tokens=usage.prompt_tokens if usage else 0,
+        output_tokens=usage.completion_tokens if usage else 0,
+        caller=caller,
+        fallback_caller=fallback_caller,
+    )
+
+
+def set_caller_tag(tag: str) -> None:
+    """현재 실행 흐름(스레드/태스크)의 caller 태그를 지정합니다.
+
+    Streamlit 페이지 맨 위에서 한 번 호출해두면 해당 페이지의
+    모든 make_response 호출이 이 이름으로 집계됩니다.
+    """
+    _caller_tag.set(tag)
+
+
+@contextmanager
+def caller_tag(tag: str) -> Iterator[None]:
+    """with 블록 안에서만 caller 태그를 바꿉니다."""
+    token = _caller_tag.set(tag)
+    try:
+        yield
+    finally:
+        _caller_tag.reset(token)
+
+
+def show_usage_sidebar() -> None:
+    """Streamlit 사이드바에 누적 토큰/시간 사용량을 표시합니다."""
+    import streamlit as st  # Streamlit 페이지에서만 필요
+
+    total = meter.grand_total()
+    with st.sidebar:
+        st.subheader("API 사용량")
+        col1, col2 = st.columns(2)
+        col1.metric("호출 수", total.calls)
+        col2.metric("캐시 적중", total.cache_hits)
+        col1.metric("입력 토큰", f"{total.input_tokens:,}")
+        col2.metric("출력 토큰", f"{total.output_tokens:,}")
+        st.metric("누적 소요 시간", f"{total.latency:.1f}초")
+
+        rows = [
+            {
+                "caller": caller,
+                "model": model,
+                "calls": value.calls,
+                "tokens": value.total_tokens,
+                "latency(s)": round(value.latency, 2),
+            }
+            for (caller, model), value in meter.totals().items()
+        ]
+        if rows:
+            st.dataframe(
+                sorted(rows, key=lambda row: row["tokens"], reverse=True),
+                hide_index=True,
+            )
@@ -17,8 +17,8 @@ def get_pdf_info(pdf_path: str) -> Document:
         author = reader.metadata.get("/Author","")
         subject = reader.metadata.get("/Subject","")
 
+        # 같은 reader로 본문도 읽어 PDF를 한 번만 파싱
         page_content_list = []
-        reader = PyPDF2.PdfReader(f)
         for page_no, page in enumerate(reader.pages, start=1):
             page_content: str = page.extract_text()
             page_content_list.append(page_content)
@@ -41,6 +41,6 @@ def get_pdf_info(pdf_path: str) -> Document:
 def main():
     pdf_path = "./PDFs/sample2.pdf"
     document = get_pdf_info(pdf_path)
-    print("title :", repr(info["title"]))
+    print("title :", repr(document.title))
 
 main()
\ No newline at end of file
@@ -0,0 +1,128 @@
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any
+
+import pdfplumber
+
+# 한 번에 메모리에 들고 있을 파싱된 페이지 수 (앞 단계와 뒤 단계가 같은 페이지를 쓰는 동안만 필요)
+DEFAULT_MAX_PAGES = 16
+
+
+@dataclass
+class ParsedPage:
+    """한 번 파싱한 페이지의 객체들.
+
+    텍스트 추출, 테이블 탐지, 레이아웃 분석이 모두 이 객체를 읽으므로
+    페이지의 content stream은 실행당 한 번만 해석됩니다.
+
+    Attributes:
+        page_num: 1부터 시작하는 페이지 번호
+        width: 페이지 너비 (pt)
+        height: 페이지 높이 (pt)
+        chars: 문자 객체 (pdfplumber의 page.chars)
+        lines: 선 객체
+        rects: 사각형 객체
+        words: extract_words() 결과
+        text: extract_text() 결과
+        page: 원본 pdfplumber 페이지 (extract_tables 등 같은 객체를 재사용하는 호출용)
+    """
+
+    page_num: int
+    width: float
+    height: float
+    chars: list[dict[str, Any]]
+    lines: list[dict[str, Any]]
+    rects: list[dict[str, Any]]
+    words: list[dict[str, Any]]
+    text: str
+    page: Any = field(default=None, repr=False, compare=False)
+
+
+class PDFPageCache:
+    """PDF 문서 하나를 한 번만 열고, 페이지별 파싱 결과를 캐시하는 클래스.
+
+    최근에 쓴 max_pages개의 페이지만 들고 있다가 오래된 페이지부터 닫으므로
+    페이지 순서대로 처리하면 문서 길이와 상관없이 메모리가 일정합니다.
+
+    Examples:
+        >>> with PDFPageCache("./PDFs/sample2.pdf") as pages:
+        ...     print(pages.metadata.get("Title"), pages.page_count)
+        ...     first = pages.page(1)
+        ...     print(len(first.chars), len(first.words))
+    """
+
+    def __init__(self, pdf_path: str, max_pages: int = DEFAULT_MAX_PAGES):
+        """PDFPageCache 인스턴스 생성.
+
+        Args:
+            pdf_path: PDF 파일 경로
+            max_pages: 캐시에 유지할 최대 페이지 수
+        """
+        self.pdf_path = str(pdf_path)
+        self.max_pages = max(1, max_pages)
+        self._pdf = pdfplumber.open(self.pdf_path)
+        self._pages: OrderedDict[int, ParsedPage] = OrderedDict()
+
+    @property
+    def page_count(self) -> int:
+        return len(self._pdf.pages)
+
+    @property
+    def metadata(self) -> dict[str, Any]:
+        """문서 정보 사전 (Title, Author, Subject 등, 키에 '/' 없음)"""
+        return self._pdf.metadata
+
+    def page(self, page_num: int) -> ParsedPage:
+        """page_num 페이지의 파싱 결과를 반환합니다. 처음 요청할 때만 파싱합니다.
+
+        Args:
+            page_num: 1부터 시작하는 페이지 번호
+
+        Returns:
+            ParsedPage: 파싱된 페이지
+
+        Raises:
+            IndexError: 페이지 번호가 범위를 벗어난 경우
+        """
+        if page_num in self._pages:
+            self._pages.move_to_end(page_num)
+            return self._pages[page_num]
+        if not 1 <= page_num <= self.page_count:
+            raise IndexError(f"페이지 번호가 범위를 벗어났습니다: {page_num}")
+
+        page = self._pdf.pages[page_num - 1]
+        # chars/lines/rects는 page.objects에서 나오고, objects는 첫 접근 때 한 번만 해석됨
+        parsed = ParsedPage(
+            page_num=page_num,
+            width=float(page.width),
+            height=float(page.height),
+            chars=page.chars,
+            lines=page.lines,
+            rects=page.rects,
+            words=page.extract_words(),
+            text=page.extract_text() or "",
+            page=page,
+        )
+        self._pages[page_num] = parsed
+        while len(self._pages) > self.max_pages:
+            __, evicted = self._pages.popitem(last=False)
+            evicted.page.close()
+        return parsed
+
+    def pages(self, start: int = 1, end: int | None = None):
+        """start~end 페이지(양끝 포함)를 순서대로 파싱하며 반환하는 제너레이터."""
+        end = self.page_count if end is None else end
+        for page_num in range(start, end + 1):
+            yield self.page(page_num)
+
+    def close(self) -> None:
+        for parsed in self._pages.values():
+            parsed.page.close()
+        self._pages.clear()
+        self._pdf.close()
+
+    def __enter__(self) -> "PDFPageCache":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,347 @@
+import asyncio
+import random
+import threading
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Awaitable, Callable, TypeVar
+
+import openai
+
+# tiktoken은 선택 의존성: 없으면 바이트 수 기반으로 추정
+try:
+    import tiktoken
+
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
+
+
+@lru_cache(maxsize=None)
+def _get_encoding():
+    """처음 토큰을 셀 때 인코딩을 불러옵니다. 사용할 수 없으면 None."""
+    if not TIKTOKEN_AVAILABLE:
+        return None
+    try:
+        # 처음 쓸 때 인코딩 파일을 내려받으므로 오프라인/프록시 환경에서는 실패할 수 있음
+        return tiktoken.get_encoding("o200k_base")
+    except Exception:
+        return None
+
+
+def _count_text_tokens(text: str) -> int:
+    encoding = _get_encoding()
+    if encoding is None:
+        return len(text.encode("utf-8")) // 3 + 1
+    return len(encoding.encode(text))
+
+
+R = TypeVar("R")
+
+# 이미지 1장을 high detail로 보낼 때의 대략적인 토큰 수
+IMAGE_TOKEN_ESTIMATE = 765
+# PDF 등 파일 첨부 1개의 대략적인 토큰 수
+FILE_TOKEN_ESTIMATE = 1500
+
+
+@dataclass
+class RateLimitConfig:
+    """분당 요청 수/토큰 수 한도.
+
+    Attributes:
+        requests_per_minute: 분당 최대 요청 수 (RPM)
+        tokens_per_minute: 분당 최대 토큰 수 (TPM, 입력 + 출력)
+        expected_output_tokens: 요청 전에 미리 잡아두는 출력 토큰 수
+    """
+
+    requests_per_minute: int = 500
+    tokens_per_minute: int = 200_000
+    expected_output_tokens: int = 500
+
+
+@dataclass
+class RetryConfig:
+    """재시도 정책.
+
+    Attributes:
+        max_retries: 최대 재시도 횟수
+        base_delay: 첫 재시도 대기 시간(초). 이후 2배씩 증가
+        max_delay: 최대 대기 시간(초)
+    """
+
+    max_retries: int = 6
+    base_delay: float = 1.0
+    max_delay: float = 60.0
+
+
+class RateLimiter:
+    """요청 수/토큰 수 두 개의 토큰 버킷으로 구성된 속도 제한기.
+
+    내부 상태는 threading.Lock으로 보호하고 잠금은 계산하는 동안만 잡으므로,
+    한 프로세스 안의 여러 스레드와 asyncio 태스크가 같은 인스턴스를 공유할 수 있습니다.
+    """
+
+    def __init__(self, config: RateLimitConfig | None = None):
+        self.config = config or RateLimitConfig()
+        self._lock = threading.Lock()
+        self._requests = float(self.config.requests_per_minute)
+        self._tokens = float(self.config.tokens_per_minute)
+        self._updated_at = time.monotonic()
+        self._paused_until = 0.0
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated_at
+        self._updated_at = now
+        self._requests = min(
+            self.config.requests_per_minute,
+            self._requests + elapsed * self.config.requests_per_minute / 60,
+        )
+        self._tokens = min(
+            self.config.tokens_per_minute,
+            self._tokens + elapsed * self.config.tokens_per_minute / 60,
+        )
+
+    def try_acquire(self, tokens: int) -> float:
+        """요청 1건과 tokens만큼을 차감해봅니다.
+
+        Args:
+            tokens (int): 이번 요청에 필요한 예상 토큰 수
+
+        Returns:
+            float: 0이면 차감 성공, 양수면 다시 시도하기 전에 기다려야 할 시간(초)
+        """
+        # 버킷 용량보다 큰 요청은 버킷이 가득 찼을 때 통과시킴 (교착 방지)
+        tokens = min(tokens, self.config.tokens_per_minute)
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            if now < self._paused_until:
+                return self._paused_until - now
+            if self._requests >= 1 and self._tokens >= tokens:
+                self._requests -= 1
+                self._tokens -= tokens
+                return 0.0
+            request_wait = (1 - self._requests) * 60 / self.config.requests_per_minute
+            token_wait = (tokens - self._tokens) * 60 / self.config.tokens_per_minute
+            return max(request_wait, token_wait, 0.01)
+
+    def acquire(self, tokens: int) -> None:
+        """한도가 허락할 때까지 현재 스레드를 대기시킵니다."""
+        while (wait := self.try_acquire(tokens)) > 0:
+            time.sleep(wait)
+
+    async def aacquire(self, tokens: int) -> None:
+        """한도가 허락할 때까지 이벤트 루프를 막지 않고 대기합니다."""
+        while (wait := self.try_acquire(tokens)) > 0:
+            await asyncio.sleep(wait)
+
+    def reconcile(self, estimated: int, actual: int) -> None:
+        """실제 사용 토큰 수로 예상치와의 차이를 보정합니다."""
+        with self._lock:
+            self._tokens = min(
+                self.config.tokens_per_minute, self._tokens + estimated - actual
+            )
+
+    def pause(self, seconds: float) -> None:
+        """서버가 429와 함께 Retry-After를 보냈을 때 모든 요청을 잠시 멈춥니다."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+
+# 프로세스 전역 설정/레지스트리 (모델별로 한도가 따로 적용됨)
+_default_config = RateLimitConfig()
+_model_configs: dict[str, RateLimitConfig] = {}
+_limiters: dict[str, RateLimiter] = {}
+_limiters_lock = threading.Lock()
+retry_config = RetryConfig()
+
+
+def configure_rate_limit(model: str | None = None, **kwargs) -> RateLimitConfig:
+    """속도 제한 한도를 변경합니다.
+
+    Args:
+        model (str | None, optional): 특정 모델에만 적용할 경우 모델명. None이면 기본 한도.
+        **kwargs: RateLimitConfig의 필드명과 값 (예: tokens_per_minute=30_000)
+
+    Returns:
+        RateLimitConfig: 변경된 설정
+
+    Raises:
+        ValueError: 알 수 없는 설정 이름인 경우
+    """
+    with _limiters_lock:
+        if model is None:
+            config = _default_config
+        else:
+            base = _model_configs.get(model) or _default_config
+            config = _model_configs[model] = RateLimitConfig(**vars(base))
+        for name, value in kwargs.items():
+            if not hasattr(config, name):
+                raise ValueError(f"알 수 없는 속도 제한 설정입니다: {name}")
+            setattr(config, name, value)
+        # 새 한도로 다시 만들어지도록 기존 제한기 제거
+        if model is None:
+            _limiters.clear()
+        else:
+            _limiters.pop(model, None)
+    return config
+
+
+def get_rate_limiter(model: str) -> RateLimiter:
+    """모델별로 공유되는 RateLimiter를 반환합니다."""
+    with _limiters_lock:
+        limiter = _limiters.get(model)
+        if limiter is None:
+            config = _model_configs.get(model) or RateLimitConfig(
+                **vars(_default_config)
+            )
+            limiter = _limiters[model] = RateLimiter(config)
+        return limiter
+
+
+def count_tokens(text: str) -> int:
+    """텍스트 하나의 토큰 수를 셉니다 (tiktoken이 없으면 추정값)."""
+    return _count_text_tokens(text)
+
+
+def estimate_tokens(messages: list[dict]) -> int:
+    """요청 전에 메시지의 입력 토큰 수를 대략 추정합니다.
+
+    tiktoken이 설치되어 있으면 사용하고, 없으면 UTF-8 바이트 수 / 3으로
+    계산합니다 (한글 1글자 ≈ 1토큰, 영문 약 3~4글자 ≈ 1토큰).
+    """
+    total = 0
+    for message in messages:
+        total += 4  # 메시지별 역할/구분자 오버헤드
+        content = message.get("content")
+        if isinstance(content, str):
+            total += _count_text_tokens(content)
+        elif isinstance(content, list):
+            for part in content:
+                if part.get("type") == "text":
+                    total += _count_text_tokens(part["text"])
+                elif part.get("type") == "image_url":
+                    total += IMAGE_TOKEN_ESTIMATE
+                else:
+                    total += FILE_TOKEN_ESTIMATE
+    return total
+
+
+def estimate_request_tokens(model: str, messages: list[dict]) -> int:
+    """요청 1건에 대해 limiter에서 미리 차감하는 토큰 수 (입력 추정치 + 예상 출력)."""
+    limiter = get_rate_limiter(model)
+    return estimate_tokens(messages) + limiter.config.expected_output_tokens
+
+
+def reconcile_tokens(model: str, estimated: int, actual: int) -> None:
+    """응답이 끝난 뒤 실제 사용량으로 모델의 limiter를 보정합니다.
+
+    스트리밍 응답처럼 호출이 반환될 때 usage를 알 수 없는 경우,
+    마지막 청크에서 usage를 받은 뒤 호출합니다.
+    """
+    get_rate_limiter(model).reconcile(estimated, actual)
+
+
+def _retry_after(error: Exception) -> float | None:
+    """응답 헤더의 Retry-After(초) 또는 retry-after-ms 값을 읽습니다."""
+    response = getattr(error, "response", None)
+    if response is None:
+        return None
+    headers = response.headers
+    try:
+        if "retry-after-ms" in headers:
+            return float(headers["retry-after-ms"]) / 1000
+        if "retry-after" in headers:
+            return float(headers["retry-after"])
+    except ValueError:
+        return None
+    return None
+
+
+def _is_retryable(error: Exception) -> bool:
+    return isinstance(
+        error,
+        (
+            openai.RateLimitError,
+            openai.APIConnectionError,  # APITimeoutError 포함
+            openai.InternalServerError,
+        ),
+    )
+
+
+def _backoff_delay(attempt: int, error: Exception, limiter: RateLimiter) -> float:
+    """지수 백오프 + full jitter 대기 시간을 계산합니다.
+
+    Retry-After가 있으면 그보다 짧게 기다리지 않으며, 429인 경우
+    같은 모델을 쓰는 다른 요청들도 함께 멈추도록 limiter를 일시 정지합니다.
+    """
+    delay = random.uniform(
+        0, min(retry_config.max_delay, retry_config.base_delay * 2**attempt)
+    )
+    retry_after = _retry_after(error)
+    if retry_after is not None:
+        delay = max(delay, retry_after)
+    if isinstance(error, openai.RateLimitError):
+        limiter.pause(delay)
+    return delay
+
+
+def _actual_tokens(response) -> int | None:
+    usage = getattr(response, "usage", None)
+    return getattr(usage, "total_tokens", None) if usage else None
+
+
+def call_with_rate_limit(
+    fn: Callable[[], R], *, model: str, messages: list[dict]
+) -> R:
+    """속도 제한과 재시도를 적용하여 fn()을 호출합니다.
+
+    Args:
+        fn: 실제 API를 호출하는 인자 없는 함수
+        model (str): 모델명 (모델별 한도 적용)
+        messages (list[dict]): 토큰 수 추정에 사용할 메시지 리스트
+
+    Returns:
+        fn()의 반환값
+
+    Raises:
+        openai.APIError: 재시도할 수 없는 오류이거나 재시도 횟수를 초과한 경우
+    """
+    limiter = get_rate_limiter(model)
+    estimated = estimate_request_tokens(model, messages)
+
+    for attempt in range(retry_config.max_retries + 1):
+        limiter.acquire(estimated)
+        try:
+            response = fn()
+        except Exception as e:
+            if not _is_retryable(e) or attempt == retry_config.max_retries:
+                raise
+            time.sleep(_backoff_delay(attempt, e, limiter))
+            continue
+        actual = _actual_tokens(response)
+        if actual is not None:
+            limiter.reconcile(estimated, actual)
+        return response
+
+
+async def acall_with_rate_limit(
+    fn: Callable[[], Awaitable[R]], *, model: str, messages: list[dict]
+) -> R:
+    """call_with_rate_limit의 비동기 버전입니다. fn은 코루틴 함수입니다."""
+    limiter = get_rate_limiter(model)
+    estimated = estimate_request_tokens(model, messages)
+
+    for attempt in range(retry_config.max_retries + 1):
+        await limiter.aacquire(estimated)
+        try:
+            response = await fn()
+        except Exception as e:
+            if not _is_retryable(e) or attempt == retry_config.max_retries:
+                raise
+            await asyncio.sleep(_backoff_delay(attempt, e, limiter))
+            continue
+        actual = _actual_tokens(response)
+        if actual is not None:
+            limiter.reconcile(estimated, actual)
+        return response
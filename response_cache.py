@@ -0,0 +1,248 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import closing
+from dataclasses import dataclass, asdict
+from hashlib import sha256
+
+
+@dataclass
+class CacheStats:
+    """응답 캐시의 적중/실패 통계.
+
+    Attributes:
+        hits: 전체 적중 수 (메모리 + 디스크)
+        misses: 실패 수
+        memory_hits: 메모리(LRU) 계층 적중 수
+        disk_hits: 디스크(SQLite) 계층 적중 수
+        writes: 저장 횟수
+        evictions: TTL 만료/용량 초과로 제거된 항목 수
+    """
+
+    hits: int = 0
+    misses: int = 0
+    memory_hits: int = 0
+    disk_hits: int = 0
+    writes: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """적중률 (0.0 ~ 1.0)"""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+def make_cache_key(
+    model: str,
+    temperature: float,
+    messages: list[dict],
+    response_format: type | None = None,
+) -> str:
+    """요청 내용으로부터 캐시 키(SHA-256)를 만듭니다.
+
+    messages에는 system/user 내용과 base64로 인코딩된 첨부 파일이
+    모두 들어 있으므로, 같은 파일이면 같은 키가 만들어집니다.
+
+    Args:
+        model (str): 모델명
+        temperature (float): 온도
+        messages (list[dict]): Chat Completion 메시지 리스트
+        response_format (type | None, optional): Pydantic 모델 클래스. 기본값은 None.
+
+    Returns:
+        str: 16진수 SHA-256 문자열
+    """
+    schema = None
+    if response_format is not None:
+        schema = {
+            "name": response_format.__name__,
+            "schema": response_format.model_json_schema(),
+        }
+    payload = {
+        "model": model,
+        "temperature": temperature,
+        "messages": messages,
+        "response_format": schema,
+    }
+    raw = json.dumps(payload, ensure_ascii=False, sort_keys=True)
+    return sha256(raw.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """메모리 LRU + SQLite 디스크 2계층 응답 캐시.
+
+    값은 JSON으로 직렬화 가능한 dict이며, 응답 객체로의 복원은
+    호출하는 쪽(utils.make_response)에서 담당합니다.
+    """
+
+    def __init__(
+        self,
+        db_path: str | None = ".cache/responses.sqlite3",
+        max_memory_entries: int = 256,
+        ttl: float | None = 7 * 24 * 60 * 60,
+        max_disk_bytes: int = 256 * 1024 * 1024,
+    ):
+        """ResponseCache 인스턴스 생성.
+
+        Args:
+            db_path: SQLite 파일 경로. None이면 메모리 계층만 사용
+            max_memory_entries: 메모리 계층의 최대 항목 수
+            ttl: 항목 유효 시간(초). None이면 만료 없음
+            max_disk_bytes: 디스크 계층의 최대 저장 용량(바이트)
+        """
+        self.db_path = db_path
+        self.max_memory_entries = max_memory_entries
+        self.ttl = ttl
+        self.max_disk_bytes = max_disk_bytes
+        self.stats = CacheStats()
+
+        self._memory: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+        self._lock = threading.Lock()
+
+        if db_path:
+            dir_path = os.path.dirname(db_path)
+            if dir_path:
+                os.makedirs(dir_path, exist_ok=True)
+            with closing(self._connect()) as conn, conn:
+                conn.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS responses (
+                        key TEXT PRIMARY KEY,
+                        payload TEXT NOT NULL,
+                        size INTEGER NOT NULL,
+                        created_at REAL NOT NULL,
+                        accessed_at REAL NOT NULL
+                    )
+                """
+                )
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def _expired(self, created_at: float, now: float) -> bool:
+        return self.ttl is not None and now - created_at > self.ttl
+
+    def get(self, key: str) -> dict | None:
+        """캐시에서 값을 조회합니다. 없거나 만료되었으면 None."""
+        now = time.time()
+        with self._lock:
+            # 1. 메모리 계층
+            entry = self._memory.get(key)
+            if entry is not None:
+                created_at, value = entry
+                if not self._expired(created_at, now):
+                    self._memory.move_to_end(key)
+                    self.stats.hits += 1
+                    self.stats.memory_hits += 1
+                    return value
+                del self._memory[key]
+                self.stats.evictions += 1
+
+            # 2. 디스크 계층
+            if self.db_path:
+                with closing(self._connect()) as conn, conn:
+                    row = conn.execute(
+                        "SELECT payload, created_at FROM responses WHERE key = ?",
+                        (key,),
+                    ).fetchone()
+                    if row is not None:
+                        payload, created_at = row
+                        if not self._expired(created_at, now):
+                            conn.execute(
+                                "UPDATE responses SET accessed_at = ? WHERE key = ?",
+                                (now, key),
+                            )
+                            value = json.loads(payload)
+                            self._remember(key, created_at, value)
+                            self.stats.hits += 1
+                            self.stats.disk_hits += 1
+                            return value
+                        conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                        self.stats.evictions += 1
+
+            self.stats.misses += 1
+            return None
+
+    def set(self, key: str, value: dict) -> None:
+        """캐시에 값을 저장합니다."""
+        now = time.time()
+        with self._lock:
+            self._remember(key, now, value)
+            self.stats.writes += 1
+
+            if self.db_path:
+                payload = json.dumps(value, ensure_ascii=False)
+                with closing(self._connect()) as conn, conn:
+                    conn.execute(
+                        """
+                        INSERT OR REPLACE INTO responses
+                            (key, payload, size, created_at, accessed_at)
+                        VALUES (?, ?, ?, ?, ?)
+                    """,
+                        (key, payload, len(payload.encode("utf-8")), now, now),
+                    )
+                    self._evict_disk(conn, now)
+
+    def _remember(self, key: str, created_at: float, value: dict) -> None:
+        """메모리 계층에 저장하고 LRU 순서로 초과분을 제거합니다."""
+        self._memory[key] = (created_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+            self.stats.evictions += 1
+
+    def _evict_disk(self, conn: sqlite3.Connection, now: float) -> None:
+        """만료된 항목과 용량 초과분(오래 사용되지 않은 순)을 제거합니다."""
+        if self.ttl is not None:
+            cursor = conn.execute(
+                "DELETE FROM responses WHERE created_at < ?", (now - self.ttl,)
+            )
+            self.stats.evictions += cursor.rowcount
+
+        (total,) = conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()
+        if total <= self.max_disk_bytes:
+            return
+
+        rows = conn.execute(
+            "SELECT key, size FROM responses ORDER BY accessed_at ASC"
+        ).fetchall()
+        for key, size in rows:
+            if total <= self.max_disk_bytes:
+                break
+            conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self._memory.pop(key, None)
+            total -= size
+            self.stats.evictions += 1
+
+    def clear(self) -> None:
+        """메모리와 디스크의 모든 항목을 삭제합니다."""
+        with self._lock:
+            self._memory.clear()
+            if self.db_path:
+                with closing(self._connect()) as conn, conn:
+                    conn.execute("DELETE FROM responses")
+
+    def stats_dict(self) -> dict:
+        """통계를 dict로 반환합니다 (화면 출력/로그용)."""
+        data = asdict(self.stats)
+        data["hit_rate"] = round(self.stats.hit_rate, 4)
+        return data
+
+
+_default_cache: ResponseCache | None = None
+_default_cache_lock = threading.Lock()
+
+
+def get_default_cache() -> ResponseCache:
+    """make_response(cache=True)에서 사용하는 공유 캐시를 반환합니다."""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = ResponseCache()
+        return _default_cache
@@ -1,8 +1,10 @@
 import streamlit as st
 from dotenv import load_dotenv
 from utils import make_response
+from metering import set_caller_tag, show_usage_sidebar
 
 load_dotenv()
+set_caller_tag("streamlit_01")  # 페이지별 사용량 집계용
 
 st.title("한국서부발전")
 
@@ -14,5 +16,9 @@ st.markdown(
 
 question = st.text_input("질문을 입력하세요.")
 if st.button("전송") and question:
-   ai_content = make_response(user_content=question)
-   st.write(f"AI: {ai_content}")
\ No newline at end of file
+   # 응답을 받는 즉시 한 조각씩 화면에 출력
+   st.write("AI:")
+   ai_content = st.write_stream(make_response(user_content=question, stream=True))
+
+# 이번 실행의 호출까지 반영되도록 페이지 맨 끝에서 표시
+show_usage_sidebar()
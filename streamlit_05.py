@@ -1,8 +1,10 @@
 import streamlit as st
 from utils import make_response
 from dotenv import load_dotenv
+from metering import set_caller_tag, show_usage_sidebar
 
 load_dotenv()
+set_caller_tag("streamlit_05")  # 페이지별 사용량 집계용
 
 user_content = st.text_input("지시사항 :") or "이 이미지를 보고 설명해줘"
 
@@ -17,5 +19,9 @@ if image_file is not None:
     ai_content = make_response(
         user_content = user_content,
         image_file =image_file,
+        cache=True,  # 같은 이미지/지시사항은 재실행 시 캐시에서 응답
     )
-    st.write(f"AI: {ai_content}")
\ No newline at end of file
+    st.write(f"AI: {ai_content}")
+
+# 이번 실행의 호출까지 반영되도록 페이지 맨 끝에서 표시
+show_usage_sidebar()
@@ -2,6 +2,7 @@ from dotenv import load_dotenv
 import streamlit as st
 from utils import make_response
 from pydantic import BaseModel
+from metering import set_caller_tag, show_usage_sidebar
 
 class Person(BaseModel):
     담당: str
@@ -11,6 +12,7 @@ class PersonList(BaseModel):
     persons: list[Person]
 
 load_dotenv()
+set_caller_tag("streamlit_08")  # 페이지별 사용량 집계용
 
 input_textarea = st.text_area("추출할 텍스트를 입력하세요")
 
@@ -26,4 +28,6 @@ if input_textarea:
         person.업무
     
     st.text(f"AI : {ai_response.parsed}")
-    
\ No newline at end of file
+
+# 이번 실행의 호출까지 반영되도록 페이지 맨 끝에서 표시
+show_usage_sidebar()
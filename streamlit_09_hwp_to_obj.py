@@ -1,60 +1,43 @@
 import streamlit as st
 from utils import hwp_to_html
+from html_compact import compact_html
+from duty_parser import Doc, extract_duty_doc
 from dotenv import load_dotenv
-from utils import make_response
-from pydantic import BaseModel
+from metering import set_caller_tag, show_usage_sidebar
 load_dotenv()
-
-prompt = """
-다음 HTML 문서에서 업무분장 정보를 추출해주세요.
-
-HTML 내용:
-{html}
-
-위 HTML에서 테이블 구조를 분석하여 다음 정보를 추출해주세요:
-1. 문서 제목과 날짜
-2. 부서별 구성원 정보:
-    - 직위 (부장, 차장, 직원 등)
-    - 성명
-    - 전화번호 (있는 경우)
-    - 담당 업무 목록 (•로 구분된 각 업무를 리스트로)
-    - 대행자 (있는 경우)
-
-부서가 여러 개인 경우 각 부서별로 구분하여 추출해주세요.
-"""
- 
-class Person(BaseModel):
-    이름: str
-    담당: str
-    업무: list[str]
-    전화번호: str   
-
-class Doc(BaseModel):
-    persons: list[Person]
-    제목: str
-    날짜: str
+set_caller_tag("streamlit_09")  # 페이지별 사용량 집계용
 
 hwp_file = st.file_uploader(
-    "변환할 hwp 파일을 업로드하세요", 
+    "변환할 hwp 파일을 업로드하세요",
     type=["hwp"],
     accept_multiple_files=False,)
+use_rules = st.checkbox("정형 양식은 LLM 없이 규칙으로 파싱", value=True)
 
 if hwp_file is not None:
     html = hwp_to_html(hwp_file=hwp_file) # 위치 인자
-    user_content = prompt.format(html=html)
-
-    ai_response = make_response(
-        user_content = user_content,
-        response_format = Doc
-    )
-
-    obj: Doc=ai_response.parsed
-    st.text(obj.제목, obj.날짜)
+    # HTML 마크업 대신 문단 텍스트 + Markdown 표로 보내 입력 토큰을 줄임
+    compact = compact_html(html)
+    st.caption(f"입력 토큰(추정): HTML {compact.tokens_before:,} → {compact.tokens_after:,} ({compact.ratio:.1f}배 감소)")
+
+    # 신뢰도가 낮을 때만 make_response로 LLM 추출 (같은 문서는 재실행 시 캐시에서 응답)
+    result = extract_duty_doc(html, use_rules=use_rules)
+    if result.source == "rules":
+        st.caption(f"규칙 기반 파싱 (신뢰도 {result.confidence:.0%}, API 호출 없음)")
+    else:
+        st.caption(f"LLM 추출 (규칙 기반 신뢰도 {result.confidence:.0%})")
+    for warning in result.warnings:
+        st.warning(warning)
+
+    obj: Doc=result.doc
+    st.text(f"{obj.제목} {obj.날짜}")
     for person in obj.persons:
         person.이름
         person.담당
         person.업무
         person.전화번호
-    
-    st.text(user_content)
-    st.text(f"AI : {ai_response.parsed}")
\ No newline at end of file
+
+    st.text(compact.text)
+    st.text(f"결과 : {result.doc}")
+
+# 이번 실행의 호출까지 반영되도록 페이지 맨 끝에서 표시
+show_usage_sidebar()
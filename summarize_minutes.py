@@ -0,0 +1,281 @@
+import argparse
+import json
+import os
+import sqlite3
+import threading
+from contextlib import closing
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, astuple
+from datetime import datetime
+from hashlib import sha256
+
+from dotenv import load_dotenv
+from metering import caller_tag
+from tasks import summarize_meeting
+
+
+@dataclass
+class ManifestEntry:
+    """요약이 끝난 회의록 1건의 기록.
+
+    Attributes:
+        sha256: 원본 회의록 파일 내용의 해시
+        size: 원본 파일 크기 (바이트)
+        mtime: 원본 파일 수정 시각
+        summary_path: 요약 결과 파일 경로
+        input_tokens: 입력 토큰 수
+        output_tokens: 출력 토큰 수
+        summarized_at: 요약한 시각 (ISO 형식)
+    """
+
+    sha256: str
+    size: int
+    mtime: float
+    summary_path: str
+    input_tokens: int
+    output_tokens: int
+    summarized_at: str
+
+
+class Manifest:
+    """회의록 경로 -> ManifestEntry 를 SQLite에 저장하는 클래스.
+
+    요약이 하나 끝날 때마다 그 행만 바로 저장하므로, 중간에 중단되어도
+    다음 실행에서 이미 끝난 파일은 건너뛰고, 저장 비용은 바뀐 파일 수에만 비례합니다.
+    키는 normalize_path로 정규화한 절대 경로라서, 같은 파일을 './회의록'과
+    '회의록'처럼 다르게 지정해도 같은 항목으로 취급합니다.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        with closing(self._connect()) as conn, conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS minutes (
+                    source TEXT PRIMARY KEY,
+                    sha256 TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    mtime REAL NOT NULL,
+                    summary_path TEXT NOT NULL,
+                    input_tokens INTEGER NOT NULL,
+                    output_tokens INTEGER NOT NULL,
+                    summarized_at TEXT NOT NULL
+                )
+            """)
+            rows = conn.execute("SELECT * FROM minutes").fetchall()
+        self.entries: dict[str, ManifestEntry] = {
+            row[0]: ManifestEntry(*row[1:]) for row in rows
+        }
+        if not self.entries:
+            self._import_json(os.path.splitext(path)[0] + ".json")
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=30)
+
+    def _import_json(self, json_path: str) -> None:
+        """예전 형식(JSON 파일) manifest가 있으면 한 번 옮겨옵니다."""
+        if not os.path.exists(json_path):
+            return
+        with open(json_path, "rt", encoding="utf-8") as f:
+            # 예전 manifest의 상대 경로 키도 절대 경로로 맞춤
+            self.update_many(
+                {
+                    normalize_path(source): ManifestEntry(**entry)
+                    for source, entry in json.load(f).items()
+                }
+            )
+
+    def is_up_to_date(self, source: str, stat: os.stat_result) -> bool | None:
+        """크기/수정 시각만으로 판단할 수 있으면 True/False, 해시 비교가 필요하면 None."""
+        entry = self.entries.get(source)
+        if entry is None or not os.path.exists(entry.summary_path):
+            return False
+        if entry.size == stat.st_size and entry.mtime == stat.st_mtime:
+            return True
+        return None
+
+    def matches(self, source: str, digest: str) -> bool:
+        entry = self.entries.get(source)
+        return entry is not None and entry.sha256 == digest
+
+    def update(self, source: str, entry: ManifestEntry) -> None:
+        self.update_many({source: entry})
+
+    def update_many(self, entries: dict[str, ManifestEntry]) -> None:
+        """여러 항목을 한 트랜잭션으로 저장합니다."""
+        if not entries:
+            return
+        with self._lock, closing(self._connect()) as conn, conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO minutes VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [(source, *astuple(entry)) for source, entry in entries.items()],
+            )
+            self.entries.update(entries)
+
+    def prune(self, base_path: str, existing_sources: set[str]) -> list[str]:
+        """base_path 아래에서 원본이 사라진 항목을 제거하고, 제거한 경로 리스트를 반환합니다.
+
+        manifest를 여러 회의록 디렉토리가 함께 쓸 수 있으므로
+        base_path 밖의 항목은 건드리지 않습니다.
+        """
+        prefix = os.path.join(normalize_path(base_path), "")
+        with self._lock:
+            removed = [
+                s
+                for s in self.entries
+                if s.startswith(prefix) and s not in existing_sources
+            ]
+            if removed:
+                with closing(self._connect()) as conn, conn:
+                    conn.executemany(
+                        "DELETE FROM minutes WHERE source = ?",
+                        [(source,) for source in removed],
+                    )
+            for source in removed:
+                del self.entries[source]
+            return removed
+
+
+def normalize_path(path: str) -> str:
+    """manifest 키로 쓰는 정규화된 절대 경로를 반환합니다."""
+    return os.path.realpath(os.path.abspath(path))
+
+
+def find_minutes_files(
+    base_path: str, extensions: tuple[str, ...] = (".txt",)
+) -> list[str]:
+    """base_path 아래의 모든 회의록 파일 경로를 정렬된 리스트로 반환합니다."""
+    minutes_files = []
+    for root, __, files in os.walk(base_path):
+        for filename in files:
+            if filename.lower().endswith(extensions):
+                minutes_files.append(os.path.join(root, filename))
+    return sorted(minutes_files)
+
+
+def summarize_file(
+    source: str,
+    base_path: str,
+    output_dir: str,
+    api_key: str | None,
+) -> ManifestEntry:
+    """회의록 1건을 요약하여 output_dir 아래 같은 상대 경로에 .md로 저장합니다."""
+    stat = os.stat(source)
+    with open(source, "rb") as f:
+        content = f.read()
+    text = content.decode("utf-8")
+
+    # 파일마다 태그를 만들면 Prometheus 라벨이 끝없이 늘어나므로 고정 태그 사용
+    with caller_tag("summarize_minutes"):
+        summary = summarize_meeting(회의록=text, api_key=api_key)
+
+    relative = os.path.relpath(source, base_path)
+    summary_path = os.path.join(output_dir, os.path.splitext(relative)[0] + ".md")
+    os.makedirs(os.path.dirname(summary_path), exist_ok=True)
+    with open(summary_path, "wt", encoding="utf-8") as f:
+        f.write(summary)
+
+    usage = summary.usage
+    return ManifestEntry(
+        sha256=sha256(content).hexdigest(),
+        size=stat.st_size,
+        mtime=stat.st_mtime,
+        summary_path=summary_path,
+        input_tokens=usage.input_tokens if usage else 0,
+        output_tokens=usage.output_tokens if usage else 0,
+        summarized_at=datetime.now().isoformat(timespec="seconds"),
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="회의록 디렉토리에서 새로 추가되거나 바뀐 회의록만 요약합니다."
+    )
+    parser.add_argument(
+        "base_path", nargs="?", default="./회의록", help="회의록 디렉토리"
+    )
+    parser.add_argument(
+        "--output-dir", default="./회의록_요약", help="요약 저장 디렉토리"
+    )
+    parser.add_argument(
+        "--manifest",
+        default=None,
+        help="manifest 경로 (기본: <output-dir>/manifest.sqlite3)",
+    )
+    parser.add_argument("--workers", type=int, default=4, help="동시에 요약할 파일 수")
+    parser.add_argument(
+        "--force", action="store_true", help="바뀌지 않은 파일도 다시 요약"
+    )
+    args = parser.parse_args()
+
+    load_dotenv()  # 프로그램의 진입점에서 한번만 실행
+    api_key = os.environ.get("OPENAI_API_KEY", default=None) or None
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    manifest = Manifest(
+        args.manifest or os.path.join(args.output_dir, "manifest.sqlite3")
+    )
+
+    base_path = normalize_path(args.base_path)
+    sources = find_minutes_files(base_path)
+    removed = manifest.prune(base_path, set(sources))
+    if removed:
+        print(f"삭제된 회의록 {len(removed)}건을 manifest에서 제거했습니다.")
+
+    # 크기/수정 시각이 같으면 바로 건너뛰고, 다르면 내용 해시로 한 번 더 확인
+    pending = []
+    touched = {}
+    for source in sources:
+        try:
+            stat = os.stat(source)
+            up_to_date = False if args.force else manifest.is_up_to_date(source, stat)
+            if up_to_date is None:
+                with open(source, "rb") as f:
+                    digest = sha256(f.read()).hexdigest()
+        except OSError as e:
+            # 스캔 도중 삭제되었거나 잠겨 있는 파일은 다음 실행에서 다시 확인
+            print(f"⚠️ 건너뜀: {source}: {e}")
+            continue
+        if up_to_date is None:
+            if manifest.matches(source, digest):
+                # 내용은 그대로이고 수정 시각만 바뀐 경우: manifest만 갱신 (스캔 후 한 번에 저장)
+                entry = manifest.entries[source]
+                entry.size, entry.mtime = stat.st_size, stat.st_mtime
+                touched[source] = entry
+                continue
+        if not up_to_date:
+            pending.append(source)
+    manifest.update_many(touched)
+
+    print(f"전체 {len(sources)}건 중 {len(pending)}건을 요약합니다.")
+
+    failed = 0
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        futures = {
+            executor.submit(
+                summarize_file,
+                source,
+                base_path,
+                args.output_dir,
+                api_key,
+            ): source
+            for source in pending
+        }
+        for future in as_completed(futures):
+            source = futures[future]
+            try:
+                entry = future.result()
+            except Exception as e:
+                failed += 1
+                print(f"❌ {source}: {e}")
+                continue
+            manifest.update(source, entry)
+            tokens = entry.input_tokens + entry.output_tokens
+            print(f"✅ {source} -> {entry.summary_path} ({tokens} tokens)")
+
+    skipped = len(sources) - len(pending)
+    print(f"완료: 성공 {len(pending) - failed}건, 실패 {failed}건, 건너뜀 {skipped}건")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,210 @@
+import re
+import time
+from hashlib import sha1
 from typing import Optional
-from openai import OpenAI
+from utils import (
+    ResponseWithUsage,
+    Usage,
+    get_client,
+    make_response,
+    make_responses_batch,
+)
+from rate_limit import call_with_rate_limit, estimate_tokens
+from metering import record_usage
 
-def summarize_meeting(회의록: str, api_key: str) -> str:
+# "김철수 부장: ..." 처럼 발언자로 시작하는 줄
+SPEAKER_TURN_PATTERN = re.compile(r"^[^\s:：]{2,10}(?: [^\s:：]{1,10})?\s*[:：]")
+
+# 발언자가 아니라 회의 정보(머리말)를 나타내는 항목명
+HEADER_LABELS = ("참석", "참석자", "일시", "장소", "안건", "주제", "작성", "작성자")
+
+# 이 토큰 수를 넘는 회의록은 자동으로 map-reduce 방식으로 요약
+MAP_REDUCE_THRESHOLD = 6000
+
+MAP_PROMPT_TEMPLATE = """
+다음은 긴 회의록의 일부입니다. 이 부분에서 나온 내용을 빠짐없이 정리해주세요:
+
+- 논의사항 (누가 어떤 의견을 냈는지)
+- 결정사항
+- Action Items (담당자 | 과제 | 기한)
+
+[회의 정보]
+{머리말}
+
+[회의록 일부]
+{회의록}"""
+
+# 단일 요약과 map-reduce의 reduce 단계가 같은 출력 형식을 쓰도록 한 곳에서 관리
+SUMMARY_FORMAT = """
+[요약 형식]
+📅 회의 개요:
+- 일시:
+- 참석자:
+- 주제:
+
+🎯 주요 논의사항:
+1.
+2.
+3.
+
+✅ 결정사항:
+-
+
+📋 Action Items:
+- 담당자 | 과제 | 기한"""
+
+SUMMARY_PROMPT_TEMPLATE = """
+다음 회의록을 분석하여 구조화된 요약을 작성해주세요:
+{요약형식}
+
+[회의록]
+{회의록}"""
+
+REDUCE_PROMPT_TEMPLATE = """
+다음은 하나의 회의록을 여러 부분으로 나누어 정리한 내용입니다.
+이를 종합하여 중복 없이 하나의 구조화된 요약을 작성해주세요:
+{요약형식}
+
+[회의 정보]
+{머리말}
+
+[부분별 정리]
+{부분요약}"""
+
+
+def split_meeting_turns(회의록: str) -> tuple[str, list[str]]:
+    """
+    회의록을 머리말(일시/참석자 등)과 발언 단위 리스트로 나눕니다.
+
+    반환값:
+        tuple[str, list[str]]: (첫 발언 이전의 머리말, 발언 리스트)
+            발언자 표시가 없는 줄은 직전 발언에 이어 붙입니다.
+    """
+    머리말_lines, turns = [], []
+    for line in 회의록.splitlines():
+        if not line.strip():
+            continue
+        label = re.split(r"[:：]", line, maxsplit=1)[0].strip()
+        if label in HEADER_LABELS:
+            머리말_lines.append(line)
+        elif SPEAKER_TURN_PATTERN.match(line):
+            turns.append(line)
+        elif turns:
+            turns[-1] += "\n" + line
+        else:
+            머리말_lines.append(line)
+    return "\n".join(머리말_lines), turns
+
+
+def chunk_meeting_turns(turns: list[str], max_chunk_tokens: int = 3000) -> list[str]:
+    """
+    발언 리스트를 토큰 수 기준으로 묶어 청크 리스트를 만듭니다.
+
+    청크 경계는 최소 크기(max_chunk_tokens의 절반)를 넘긴 뒤 발언 내용의 해시로
+    정해지므로(content-defined chunking), 회의록 일부를 고쳐도 고친 곳 주변의
+    청크만 바뀌고 나머지 청크는 그대로 유지되어 캐시를 재사용할 수 있습니다.
+    """
+    min_chunk_tokens = max_chunk_tokens // 2
+    chunks, current, current_tokens = [], [], 0
+    for turn in turns:
+        turn_tokens = estimate_tokens([{"role": "user", "content": turn}])
+        if current and current_tokens + turn_tokens > max_chunk_tokens:
+            chunks.append("\n".join(current))
+            current, current_tokens = [], 0
+        current.append(turn)
+        current_tokens += turn_tokens
+        # 최소 크기를 넘겼고, 발언 해시가 경계 조건을 만족하면 여기서 자름
+        is_boundary = sha1(turn.encode("utf-8")).digest()[0] % 4 == 0
+        if current_tokens >= min_chunk_tokens and is_boundary:
+            chunks.append("\n".join(current))
+            current, current_tokens = [], 0
+    if current:
+        chunks.append("\n".join(current))
+    return chunks
+
+
+def summarize_meeting_map_reduce(
+    회의록: str,
+    api_key: Optional[str] = None,
+    max_chunk_tokens: int = 3000,
+    max_concurrency: int = 8,
+    map_model: str = "gpt-4o-mini",
+    reduce_model: str = "gpt-4o",
+) -> ResponseWithUsage:
+    """
+    긴 회의록을 발언 단위 청크로 나누어 동시에 요약(map)한 뒤, 하나로 합칩니다(reduce).
+
+    청크 요약은 응답 캐시(make_response(cache=True))를 사용하므로, 회의록을
+    고친 후 다시 실행하면 바뀐 청크만 새로 요약합니다.
+
+    매개변수:
+        회의록 (str): 요약할 원본 회의록 텍스트
+        api_key (str | None): OpenAI API 인증 키
+        max_chunk_tokens (int): 청크 하나의 최대 토큰 수
+        max_concurrency (int): 동시에 요약할 최대 청크 수
+        map_model (str): 청크 요약에 사용할 모델
+        reduce_model (str): 최종 요약에 사용할 모델
+
+    반환값:
+        ResponseWithUsage: summarize_meeting과 같은 형식의 구조화된 회의 요약문 (map + reduce 전체 usage 포함)
+    """
+    머리말, turns = split_meeting_turns(회의록)
+    chunks = chunk_meeting_turns(turns, max_chunk_tokens=max_chunk_tokens)
+
+    results = make_responses_batch(
+        [
+            {
+                "user_content": MAP_PROMPT_TEMPLATE.format(머리말=머리말, 회의록=chunk),
+                "model": map_model,
+                "api_key": api_key,
+                "cache": True,
+            }
+            for chunk in chunks
+        ],
+        max_concurrency=max_concurrency,
+    )
+    for result in results:
+        if isinstance(result, Exception):
+            raise result
+
+    부분요약 = "\n\n".join(
+        f"[{idx}/{len(results)}]\n{result}" for idx, result in enumerate(results, 1)
+    )
+    response = make_response(
+        user_content=REDUCE_PROMPT_TEMPLATE.format(
+            요약형식=SUMMARY_FORMAT, 머리말=머리말, 부분요약=부분요약
+        ),
+        model=reduce_model,
+        api_key=api_key,
+        cache=True,
+    )
+    print("usage:", response.usage) #비용 확인 목적
+
+    # map + reduce 전체 사용량
+    usages = [result.usage for result in [*results, response] if result.usage]
+    usage = Usage(
+        input_tokens=sum(u.input_tokens for u in usages),
+        output_tokens=sum(u.output_tokens for u in usages),
+        total_tokens=sum(u.total_tokens for u in usages),
+    )
+    return ResponseWithUsage(content=str(response), usage=usage)
+
+
+def summarize_meeting(
+    회의록: str, api_key: str, chunked: Optional[bool] = None
+) -> ResponseWithUsage:
     """
     OpenAI의 GPT 모델을 활용하여 회의록을 구조화된 형식으로 요약합니다.
 
     매개변수:
         회의록 (str): 요약할 원본 회의록 텍스트
         api_key (str): OpenAI API 인증 키
+        chunked (bool | None): True면 map-reduce 방식(summarize_meeting_map_reduce)으로 요약.
+            None이면 회의록이 MAP_REDUCE_THRESHOLD 토큰을 넘을 때만 map-reduce 사용
 
     반환값:
-        str: 회의 개요, 주요 논의사항, 결정사항, Action Items가 포함된 구조화된 회의 요약문
+        ResponseWithUsage: 회의 개요, 주요 논의사항, 결정사항, Action Items가 포함된 구조화된 회의 요약문
+            (문자열처럼 사용 가능하며, usage 속성으로 토큰 사용량 확인)
 
     요약 형식:
         - 회의 개요 (일시, 참석자, 주제)
@@ -18,41 +212,36 @@ def summarize_meeting(회의록: str, api_key: str) -> str:
         - 결정사항
         - Action Items (담당자, 과제, 기한)
     """
-    user_prompt_template = """
-    다음 회의록을 분석하여 구조화된 요약을 작성해주세요:
+    if chunked is None:
+        chunked = estimate_tokens([{"role": "user", "content": 회의록}]) > MAP_REDUCE_THRESHOLD
+    if chunked:
+        return summarize_meeting_map_reduce(회의록, api_key=api_key)
 
-    [요약 형식]
-    📅 회의 개요:
-    - 일시:
-    - 참석자:
-    - 주제:
-
-    🎯 주요 논의사항:
-    1.
-    2.
-    3.
-
-    ✅ 결정사항:
-    -
-
-    📋 Action Items:
-    - 담당자 | 과제 | 기한
-
-    [회의록]
-    {회의록}"""
-    user_content = user_prompt_template.format(회의록=회의록)
-    client = OpenAI(api_key=api_key)
+    user_content = SUMMARY_PROMPT_TEMPLATE.format(요약형식=SUMMARY_FORMAT, 회의록=회의록)
+    client = get_client(api_key=api_key, rate_limited=True)
    
     #openai api가 모든 텍스트 응답을 생성하고 나서, 반환
-    reponse = client.chat.completions.create(
+    messages = [
+        {"role": "user", "content": user_content}
+    ]
+    started_at = time.perf_counter()
+    reponse = call_with_rate_limit(
+        lambda: client.chat.completions.create(
+            model="gpt-4o",
+            messages=messages,
+        ),
         model="gpt-4o",
-        messages=[
-            {"role": "user", "content": user_content}
-        ],
+        messages=messages,
     )
     print("usage:", reponse.usage) #비용 확인 목적
+    record_usage("gpt-4o", started_at, reponse.usage, fallback_caller="summarize_meeting")
     ai_content = reponse.choices[0].message.content
-    return ai_content
+    usage = Usage(
+        input_tokens=reponse.usage.prompt_tokens,
+        output_tokens=reponse.usage.completion_tokens,
+        total_tokens=reponse.usage.total_tokens,
+    ) if reponse.usage else None
+    return ResponseWithUsage(content=ai_content or "", usage=usage)
 
 def create_email_body(
     받는사람: str,
@@ -81,14 +270,21 @@ def create_email_body(
         받는사람=받는사람, 용건=용건, 핵심내용=핵심내용,
     )
 
-    client = OpenAI(api_key=api_key)
-    response = client.chat.completions.create(
+    client = get_client(api_key=api_key, rate_limited=True)
+    messages = [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": user_content},
+    ]
+    started_at = time.perf_counter()
+    response = call_with_rate_limit(
+        lambda: client.chat.completions.create(
+            model="gpt-4o-mini",
+            messages=messages,
+        ),
         model="gpt-4o-mini",
-        messages=[
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": user_content},
-        ],
+        messages=messages,
     )
 
     print("response.usage :", response.usage)
+    record_usage("gpt-4o-mini", started_at, response.usage, fallback_caller="create_email_body")
     return response.choices[0].message.content
\ No newline at end of file
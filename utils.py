@@ -1,17 +1,51 @@
 import os
+import asyncio
+import contextvars
+import io
 import mimetypes
+import mmap
+import binascii
+import threading
+import time
 import requests
-import tempfile
-from base64 import b64encode
-from dataclasses import dataclass
-from typing import BinaryIO, Protocol, TypeVar, Generic, overload
+import httpx
+from dataclasses import dataclass, asdict
+from functools import lru_cache, partial
+from hashlib import sha256
+from typing import (
+    AsyncIterator,
+    BinaryIO,
+    Callable,
+    Generic,
+    Iterator,
+    Literal,
+    Protocol,
+    TypeVar,
+    overload,
+)
 from pydantic import BaseModel
-from openai import OpenAI
+from openai import (
+    OpenAI,
+    AsyncOpenAI,
+    DefaultHttpxClient,
+    DefaultAsyncHttpxClient,
+)
 from openai.types.shared.chat_model import ChatModel
-from bs4 import BeautifulSoup
 from hwp5.xmlmodel import Hwp5File
-from hwp5.hwp5html import HTMLTransform
+from hwp5.hwp5html import RESOURCE_PATH_XSL_XHTML, HTMLTransform
+from hwp5.storage.ole import OleStorage
+from hwp5.utils import hwp5_resources_path
+from olefile import MAGIC as OLE_MAGIC
 from contextlib import closing
+from response_cache import ResponseCache, get_default_cache, make_cache_key
+from rate_limit import (
+    acall_with_rate_limit,
+    call_with_rate_limit,
+    estimate_request_tokens,
+    reconcile_tokens,
+)
+from metering import record_call
+from image_prep import ImageOptions, prepare_image
 
 
 class FileUploadProtocol(Protocol):
@@ -99,6 +133,261 @@ class StructuredResponseWithUsage(Generic[T]):
         self.usage = usage
 
 
+class StreamingResponse:
+    """텍스트 조각(delta)을 순서대로 내보내는 스트리밍 응답 클래스.
+
+    for 문이나 st.write_stream()에 그대로 넘겨 사용할 수 있으며,
+    끝까지 읽은 뒤에는 text와 usage 속성으로 전체 내용과 토큰 사용량을 확인할 수 있습니다.
+
+    Attributes:
+        usage: 토큰 사용량 정보 (스트림을 끝까지 읽은 후에 채워짐)
+        done: 스트림을 끝까지 읽었는지 여부
+    """
+
+    def __init__(
+        self,
+        deltas: Iterator[tuple[str, Usage | None]],
+        on_complete: Callable[[ResponseWithUsage], None] | None = None,
+    ):
+        """StreamingResponse 인스턴스 생성.
+
+        Args:
+            deltas: (텍스트 조각, usage) 튜플을 내보내는 이터레이터
+            on_complete: 스트림이 끝났을 때 완성된 ResponseWithUsage로 호출할 함수 (캐시 저장 등)
+        """
+        self._deltas = deltas
+        self._on_complete = on_complete
+        self._parts: list[str] = []
+        self.usage: Usage | None = None
+        self.done = False
+
+    def __iter__(self) -> Iterator[str]:
+        for delta, usage in self._deltas:
+            if usage is not None:
+                self.usage = usage
+            if delta:
+                self._parts.append(delta)
+                yield delta
+        self.done = True
+        if self._on_complete:
+            self._on_complete(self.to_response())
+
+    @property
+    def text(self) -> str:
+        """지금까지 받은 전체 텍스트"""
+        return "".join(self._parts)
+
+    def to_response(self) -> ResponseWithUsage:
+        """지금까지 받은 내용을 ResponseWithUsage로 변환합니다."""
+        return ResponseWithUsage(content=self.text, usage=self.usage)
+
+
+class AsyncStreamingResponse(StreamingResponse):
+    """StreamingResponse의 비동기 버전 (async for로 사용)."""
+
+    def __init__(
+        self,
+        deltas: AsyncIterator[tuple[str, Usage | None]],
+        on_complete: Callable[[ResponseWithUsage], None] | None = None,
+    ):
+        super().__init__(deltas, on_complete)  # type: ignore[arg-type]
+
+    def __iter__(self):
+        raise TypeError("AsyncStreamingResponse는 async for로 사용해야 합니다.")
+
+    async def __aiter__(self) -> AsyncIterator[str]:
+        async for delta, usage in self._deltas:
+            if usage is not None:
+                self.usage = usage
+            if delta:
+                self._parts.append(delta)
+                yield delta
+        self.done = True
+        if self._on_complete:
+            self._on_complete(self.to_response())
+
+
+@dataclass
+class ClientConfig:
+    """OpenAI 클라이언트의 커넥션 풀/타임아웃 설정.
+
+    Attributes:
+        max_connections: 풀 전체의 최대 동시 연결 수
+        max_keepalive_connections: 재사용을 위해 유지할 유휴(keep-alive) 연결 수
+        keepalive_expiry: 유휴 연결을 유지하는 시간(초)
+        timeout: 요청 전체 타임아웃(초)
+        connect_timeout: TCP/TLS 연결 타임아웃(초)
+        max_retries: openai 라이브러리 자체 재시도 횟수 (라이브러리 기본값과 같은 2).
+            call_with_rate_limit으로 감싸는 호출은 rate_limit 모듈이 재시도하므로
+            get_client(rate_limited=True)로 재시도를 끈 클라이언트를 씁니다.
+    """
+
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 30.0
+    timeout: float = 60.0
+    connect_timeout: float = 10.0
+    max_retries: int = 2
+
+
+# 프로세스 전역 클라이언트 레지스트리: (api_key, base_url) -> OpenAI
+_client_config = ClientConfig()
+_clients: dict[tuple[str | None, str | None], OpenAI] = {}
+# 같은 커넥션 풀을 쓰면서 SDK 재시도만 끈 클라이언트 (rate_limit 모듈이 재시도하는 호출용)
+_limited_clients: dict[tuple[str | None, str | None], OpenAI] = {}
+_clients_lock = threading.Lock()
+
+
+def configure_client(**kwargs) -> ClientConfig:
+    """공유 클라이언트의 풀 크기/타임아웃 설정을 변경합니다.
+
+    이미 만들어진 클라이언트는 닫고 레지스트리에서 제거하므로,
+    다음 get_client() 호출부터 새 설정이 적용됩니다.
+
+    Args:
+        **kwargs: ClientConfig의 필드명과 값 (예: max_connections=50)
+
+    Returns:
+        ClientConfig: 변경된 설정
+
+    Raises:
+        ValueError: 알 수 없는 설정 이름인 경우
+    """
+    for name, value in kwargs.items():
+        if not hasattr(_client_config, name):
+            raise ValueError(f"알 수 없는 클라이언트 설정입니다: {name}")
+        setattr(_client_config, name, value)
+    close_clients()
+    return _client_config
+
+
+def close_clients() -> None:
+    """레지스트리에 등록된 모든 클라이언트의 연결을 닫습니다."""
+    with _clients_lock:
+        for client in _clients.values():
+            client.close()
+        _clients.clear()
+        _limited_clients.clear()
+        # 비동기 클라이언트는 루프 밖에서 닫을 수 없으므로 참조만 정리
+        _async_clients.clear()
+
+
+def _client_key(
+    api_key: str | None, base_url: str | None
+) -> tuple[str | None, str | None]:
+    """환경 변수까지 반영한 레지스트리 키를 만듭니다."""
+    return (
+        api_key or os.environ.get("OPENAI_API_KEY"),
+        base_url or os.environ.get("OPENAI_BASE_URL"),
+    )
+
+
+def get_client(
+    api_key: str | None = None,
+    base_url: str | None = None,
+    rate_limited: bool = False,
+) -> OpenAI:
+    """api_key/base_url별로 공유되는 OpenAI 클라이언트를 반환합니다.
+
+    매 호출마다 OpenAI()를 새로 만들면 커넥션 풀과 TLS 핸드셰이크가
+    매번 새로 생기므로, 같은 키/주소에 대해서는 keep-alive 연결을
+    유지하는 클라이언트 하나를 프로세스 전체에서 재사용합니다.
+
+    Args:
+        api_key (str | None, optional): OpenAI API 키. None이면 OPENAI_API_KEY 환경 변수.
+        base_url (str | None, optional): API 주소. None이면 OPENAI_BASE_URL 환경 변수 또는 기본 주소.
+        rate_limited (bool, optional): call_with_rate_limit으로 감싸서 쓸 클라이언트이면 True.
+            재시도가 겹치지 않도록 SDK 자체 재시도를 끈 클라이언트(커넥션 풀은 공유)를 반환합니다.
+
+    Returns:
+        OpenAI: 공유 클라이언트
+    """
+    key = _client_key(api_key, base_url)
+    if rate_limited:
+        client = _limited_clients.get(key)
+        if client is None:
+            client = get_client(*key).with_options(max_retries=0)
+            with _clients_lock:
+                client = _limited_clients.setdefault(key, client)
+        return client
+
+    client = _clients.get(key)
+    if client is not None:
+        return client
+
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            config = _client_config
+            client = OpenAI(
+                api_key=key[0],
+                base_url=key[1],
+                max_retries=config.max_retries,
+                http_client=DefaultHttpxClient(
+                    limits=httpx.Limits(
+                        max_connections=config.max_connections,
+                        max_keepalive_connections=config.max_keepalive_connections,
+                        keepalive_expiry=config.keepalive_expiry,
+                    ),
+                    timeout=httpx.Timeout(
+                        config.timeout, connect=config.connect_timeout
+                    ),
+                ),
+            )
+            _clients[key] = client
+    return client
+
+
+# 비동기 클라이언트는 이벤트 루프에 묶이므로 루프별로 따로 관리합니다.
+_async_clients: dict[
+    tuple[str | None, str | None, int],
+    tuple[asyncio.AbstractEventLoop, AsyncOpenAI, AsyncOpenAI],
+] = {}
+
+
+def get_async_client(
+    api_key: str | None = None,
+    base_url: str | None = None,
+    rate_limited: bool = False,
+) -> AsyncOpenAI:
+    """현재 이벤트 루프에서 공유되는 AsyncOpenAI 클라이언트를 반환합니다.
+
+    get_client()와 같은 풀/타임아웃 설정(ClientConfig)을 사용합니다.
+    반드시 실행 중인 이벤트 루프 안에서 호출해야 합니다.
+    rate_limited=True이면 get_client()와 같이 SDK 자체 재시도를 끈 클라이언트를 반환합니다.
+    """
+    loop = asyncio.get_running_loop()
+    key = (*_client_key(api_key, base_url), id(loop))
+
+    with _clients_lock:
+        # 종료된 이벤트 루프의 클라이언트는 정리
+        for stale_key in [k for k, (l, *_) in _async_clients.items() if l.is_closed()]:
+            del _async_clients[stale_key]
+
+        entry = _async_clients.get(key)
+        if entry is None:
+            config = _client_config
+            client = AsyncOpenAI(
+                api_key=key[0],
+                base_url=key[1],
+                max_retries=config.max_retries,
+                http_client=DefaultAsyncHttpxClient(
+                    limits=httpx.Limits(
+                        max_connections=config.max_connections,
+                        max_keepalive_connections=config.max_keepalive_connections,
+                        keepalive_expiry=config.keepalive_expiry,
+                    ),
+                    timeout=httpx.Timeout(
+                        config.timeout, connect=config.connect_timeout
+                    ),
+                ),
+            )
+            # (루프, 기본 클라이언트, 같은 풀을 쓰면서 SDK 재시도를 끈 클라이언트)
+            entry = (loop, client, client.with_options(max_retries=0))
+            _async_clients[key] = entry
+    return entry[2] if rate_limited else entry[1]
+
+
 def get_mime_type(file_path: str) -> str:
     """파일 경로에서 MIME 타입을 추론합니다.
 
@@ -116,6 +405,168 @@ def get_mime_type(file_path: str) -> str:
     return mime_type or "application/octet-stream"
 
 
+def build_messages(
+    user_content: str,
+    file_path: str | None = None,
+    file: FileUploadProtocol | BinaryIO | None = None,
+    system_content: str | None = None,
+    optimize_image: bool | ImageOptions = True,
+) -> list[dict]:
+    """make_response에서 사용할 Chat Completion 메시지 리스트를 구성합니다.
+
+    batch_api처럼 요청을 직접 보내는 모듈도 같은 메시지 형식을 쓰도록 공개합니다.
+    인자는 make_response와 같습니다.
+    """
+    messages = []
+    if system_content:
+        messages.append({"role": "system", "content": system_content})
+
+    user_message_content = user_content  # 기본값: 텍스트만
+
+    if file_path or file:
+        # 파일 정보 추출 (삼항 연산자 활용)
+        filename = os.path.basename(file_path) if file_path else file.name
+        mime_type = get_mime_type(file_path) if file_path else file.type
+
+        detail = "high"
+        if mime_type.startswith("image/") and optimize_image:
+            # 이미지: 업로드 전에 축소/재압축하고 크기에 맞는 detail 선택
+            if file_path:
+                with open(file_path, "rb") as f:
+                    data = f.read()
+            else:
+                data = file.read()
+            prepared = prepare_image(
+                data,
+                mime_type,
+                optimize_image if isinstance(optimize_image, ImageOptions) else None,
+            )
+            mime_type, detail = prepared.mime_type, prepared.detail
+            base64_url = make_base64_url(data=prepared.data, mime_type=mime_type)
+        else:
+            # base64 URL 생성
+            base64_url = make_base64_url(file_path=file_path, file=file)
+
+        # 파일 딕셔너리 생성 (삼항 연산자로 단순화)
+        file_dict = (
+            {
+                "type": "image_url",
+                "image_url": {"url": base64_url, "detail": detail},
+            }
+            if mime_type.startswith("image/")
+            else {
+                "type": "file",
+                "file": {"filename": filename, "file_data": base64_url},
+            }
+        )
+
+        # 텍스트와 파일을 포함한 content 구성
+        user_message_content = [
+            {"type": "text", "text": user_content},
+            file_dict,
+        ]
+
+    messages.append({"role": "user", "content": user_message_content})
+    return messages
+
+
+def _to_usage(usage) -> Usage | None:
+    """OpenAI 응답의 usage 객체를 Usage로 변환합니다."""
+    if not usage:
+        return None
+    return Usage(
+        input_tokens=usage.prompt_tokens,
+        output_tokens=usage.completion_tokens,
+        total_tokens=usage.total_tokens,
+    )
+
+
+def _chunk_deltas(stream) -> Iterator[tuple[str, Usage | None]]:
+    """ChatCompletionChunk 스트림을 (텍스트 조각, usage) 튜플로 변환합니다."""
+    for chunk in stream:
+        delta = chunk.choices[0].delta.content if chunk.choices else None
+        yield delta or "", _to_usage(chunk.usage)
+
+
+async def _achunk_deltas(stream) -> AsyncIterator[tuple[str, Usage | None]]:
+    """_chunk_deltas의 비동기 버전입니다."""
+    async for chunk in stream:
+        delta = chunk.choices[0].delta.content if chunk.choices else None
+        yield delta or "", _to_usage(chunk.usage)
+
+
+async def _aiter_once(
+    item: tuple[str, Usage | None],
+) -> AsyncIterator[tuple[str, Usage | None]]:
+    """캐시 적중 시 전체 내용을 한 번에 내보내는 비동기 이터레이터."""
+    yield item
+
+
+def _finish_call(
+    result: ResponseWithUsage | StructuredResponseWithUsage,
+    *,
+    model: str,
+    started_at: float,
+    response_cache: ResponseCache | None = None,
+    cache_key: str | None = None,
+    cache_hit: bool = False,
+    rate_limit_estimate: int | None = None,
+) -> ResponseWithUsage | StructuredResponseWithUsage:
+    """응답을 캐시에 저장하고 사용량을 계량 레지스트리에 기록합니다.
+
+    rate_limit_estimate가 있으면(스트리밍 응답) 최종 usage로 속도 제한 예상치를 보정합니다.
+    """
+    if response_cache is not None and not cache_hit:
+        response_cache.set(cache_key, _to_cache_payload(result))
+
+    usage = result.usage
+    if rate_limit_estimate is not None and usage and not cache_hit:
+        reconcile_tokens(model, rate_limit_estimate, usage.total_tokens)
+    record_call(
+        model=model,
+        latency=time.perf_counter() - started_at,
+        # 캐시 적중은 실제로 토큰을 쓰지 않았으므로 0으로 기록
+        input_tokens=usage.input_tokens if usage and not cache_hit else 0,
+        output_tokens=usage.output_tokens if usage and not cache_hit else 0,
+        cache_hit=cache_hit,
+    )
+    return result
+
+
+def _resolve_cache(cache: bool | ResponseCache) -> ResponseCache | None:
+    """cache 인자를 실제 ResponseCache 인스턴스(또는 None)로 변환합니다."""
+    if cache is True:
+        return get_default_cache()
+    return cache or None
+
+
+def _to_cache_payload(
+    result: ResponseWithUsage | StructuredResponseWithUsage,
+) -> dict:
+    """응답 객체를 캐시에 저장할 수 있는 dict로 변환합니다."""
+    usage = asdict(result.usage) if result.usage else None
+    if isinstance(result, StructuredResponseWithUsage):
+        return {
+            "kind": "structured",
+            "content": result.parsed.model_dump_json(),
+            "usage": usage,
+        }
+    return {"kind": "text", "content": str(result), "usage": usage}
+
+
+def _from_cache_payload(
+    payload: dict, response_format: type[BaseModel] | None
+) -> ResponseWithUsage | StructuredResponseWithUsage:
+    """캐시에 저장된 dict를 원래 응답 객체로 복원합니다."""
+    usage = Usage(**payload["usage"]) if payload.get("usage") else None
+    if response_format is not None:
+        return StructuredResponseWithUsage(
+            parsed=response_format.model_validate_json(payload["content"]),
+            usage=usage,
+        )
+    return ResponseWithUsage(content=payload["content"], usage=usage)
+
+
 # Overload for when response_format is provided (returns StructuredResponseWithUsage)
 @overload
 def make_response(
@@ -130,6 +581,9 @@ def make_response(
     model: str | ChatModel = "gpt-4o-mini",
     temperature: float = 0.25,
     api_key: str | None = None,
+    base_url: str | None = None,
+    cache: bool | ResponseCache = False,
+    optimize_image: bool | ImageOptions = True,
 ) -> StructuredResponseWithUsage[T]: ...
 
 
@@ -145,11 +599,34 @@ def make_response(
     model: str | ChatModel = "gpt-4o-mini",
     temperature: float = 0.25,
     api_key: str | None = None,
+    base_url: str | None = None,
     *,
     response_format: None = None,
+    cache: bool | ResponseCache = False,
+    optimize_image: bool | ImageOptions = True,
 ) -> ResponseWithUsage: ...
 
 
+# Overload for stream=True (returns StreamingResponse)
+@overload
+def make_response(
+    user_content: str,
+    file_path: str | None = None,
+    file: FileUploadProtocol | BinaryIO | None = None,
+    image_path: str | None = None,
+    image_file: FileUploadProtocol | BinaryIO | None = None,
+    system_content: str | None = None,
+    model: str | ChatModel = "gpt-4o-mini",
+    temperature: float = 0.25,
+    api_key: str | None = None,
+    base_url: str | None = None,
+    *,
+    stream: Literal[True],
+    cache: bool | ResponseCache = False,
+    optimize_image: bool | ImageOptions = True,
+) -> StreamingResponse: ...
+
+
 def make_response(
     user_content: str,
     file_path: str | None = None,  # 새로운 범용 파일 경로 (이미지/PDF)
@@ -163,7 +640,11 @@ def make_response(
     temperature: float = 0.25,
     api_key: str | None = None,
     response_format: type[BaseModel] | None = None,  # 새로운 파라미터
-) -> ResponseWithUsage | StructuredResponseWithUsage:
+    base_url: str | None = None,
+    cache: bool | ResponseCache = False,
+    optimize_image: bool | ImageOptions = True,
+    stream: bool = False,
+) -> ResponseWithUsage | StructuredResponseWithUsage | StreamingResponse:
     """OpenAI의 Chat Completion API를 사용하여 AI의 응답을 생성합니다.
 
     이미지 파일(.png, .jpg, .jpeg)과 PDF 파일을 지원하며,
@@ -180,11 +661,22 @@ def make_response(
         temperature (float, optional): 생성 결과의 창의성. 기본값은 0.25.
         api_key (str | None, optional): OpenAI API 키. 기본값은 None.
         response_format (type[BaseModel] | None, optional): Pydantic 모델 클래스. 기본값은 None.
+        base_url (str | None, optional): OpenAI 호환 API 주소. 기본값은 None.
+        cache (bool | ResponseCache, optional): 응답 캐시 사용 여부. True면 공유 캐시,
+            ResponseCache 인스턴스면 해당 캐시를 사용합니다. 기본값은 False.
+        stream (bool, optional): True면 응답을 텍스트 조각 단위로 받습니다.
+            response_format과 함께 사용할 수 없습니다. 기본값은 False.
+        optimize_image (bool | ImageOptions, optional): 이미지를 업로드 전에 축소/재압축하고
+            EXIF를 제거할지 여부. ImageOptions로 목표 크기를 지정할 수 있습니다. 기본값은 True.
 
     Returns:
-        ResponseWithUsage | StructuredResponseWithUsage:
+        ResponseWithUsage | StructuredResponseWithUsage | StreamingResponse:
             - response_format이 None인 경우: ResponseWithUsage (문자열처럼 사용 가능)
             - response_format이 제공된 경우: StructuredResponseWithUsage (파싱된 Pydantic 모델 포함)
+            - stream=True인 경우: StreamingResponse (텍스트 조각을 내보내는 이터러블)
+
+    Raises:
+        ValueError: stream과 response_format을 함께 지정한 경우
 
     Examples:
         일반 텍스트 응답:
@@ -202,102 +694,382 @@ def make_response(
         ... )
         >>> print(response.parsed.name)  # "철수"
         >>> print(response.parsed.age)  # 25
+
+        스트리밍 응답:
+        >>> response = make_response("안녕하세요", stream=True)
+        >>> for delta in response:
+        ...     print(delta, end="", flush=True)
+        >>> print(response.usage.total_tokens)  # 스트림을 다 읽은 후 사용 가능
     """
+    if stream and response_format is not None:
+        raise ValueError("stream=True는 response_format과 함께 사용할 수 없습니다.")
+
+    started_at = time.perf_counter()
+
     # 1. 호환성 처리 (간단하게)
     file_path = file_path or image_path
     file = file or image_file
 
-    # 2. 메시지 리스트 초기화
-    messages = []
-    if system_content:
-        messages.append({"role": "system", "content": system_content})
-
-    # 3. 사용자 메시지 구성
-    user_message_content = user_content  # 기본값: 텍스트만
-
-    if file_path or file:
-        # 파일 정보 추출 (삼항 연산자 활용)
-        filename = os.path.basename(file_path) if file_path else file.name
-        mime_type = get_mime_type(file_path) if file_path else file.type
-
-        # base64 URL 생성
-        base64_url = make_base64_url(file_path=file_path, file=file)
-
-        # 파일 딕셔너리 생성 (삼항 연산자로 단순화)
-        file_dict = (
-            {
-                "type": "image_url",
-                "image_url": {"url": base64_url, "detail": "high"},
-            }
-            if mime_type.startswith("image/")
-            else {
-                "type": "file",
-                "file": {"filename": filename, "file_data": base64_url},
-            }
+    # 2~3. 메시지 리스트 구성
+    messages = build_messages(
+        user_content,
+        file_path=file_path,
+        file=file,
+        system_content=system_content,
+        optimize_image=optimize_image,
+    )
+
+    # 캐시 조회 (opt-in)
+    response_cache = _resolve_cache(cache)
+    cache_key = None
+    if response_cache is not None:
+        cache_key = make_cache_key(model, temperature, messages, response_format)
+        cached = response_cache.get(cache_key)
+        if cached is not None:
+            result = _from_cache_payload(cached, response_format)
+            finish = partial(
+                _finish_call, model=model, started_at=started_at, cache_hit=True
+            )
+            if stream:
+                return StreamingResponse(
+                    iter([(str(result), result.usage)]), on_complete=finish
+                )
+            return finish(result)
+
+    # 4. API 호출 (공유 클라이언트 재사용)
+    client = get_client(api_key=api_key, base_url=base_url, rate_limited=True)
+
+    # 스트리밍 - 텍스트 조각을 받는 즉시 내보내고, 마지막 청크에서 usage 수신
+    if stream:
+        chunks = call_with_rate_limit(
+            lambda: client.chat.completions.create(
+                model=model,
+                messages=messages,
+                temperature=temperature,
+                stream=True,
+                stream_options={"include_usage": True},
+            ),
+            model=model,
+            messages=messages,
         )
-
-        # 텍스트와 파일을 포함한 content 구성
-        user_message_content = [
-            {"type": "text", "text": user_content},
-            file_dict,
-        ]
-
-    messages.append({"role": "user", "content": user_message_content})
-
-    # 4. API 호출
-    client = OpenAI(api_key=api_key)
+        on_complete = partial(
+            _finish_call,
+            model=model,
+            started_at=started_at,
+            response_cache=response_cache,
+            cache_key=cache_key,
+            # 스트림은 호출이 반환될 때 usage가 없으므로 다 읽은 뒤 limiter를 보정
+            rate_limit_estimate=estimate_request_tokens(model, messages),
+        )
+        return StreamingResponse(_chunk_deltas(chunks), on_complete=on_complete)
 
     # Pydantic 모델이 제공된 경우 - Structured Output 사용
     if response_format is not None:
         # beta.chat.completions.parse를 사용하여 구조화된 출력 생성
-        response = client.beta.chat.completions.parse(
+        response = call_with_rate_limit(
+            lambda: client.beta.chat.completions.parse(
+                model=model,
+                messages=messages,
+                response_format=response_format,
+                temperature=temperature,
+            ),
             model=model,
             messages=messages,
-            response_format=response_format,
-            temperature=temperature,
-        )
-
-        # Usage 정보 추출
-        usage = (
-            Usage(
-                input_tokens=response.usage.prompt_tokens,
-                output_tokens=response.usage.completion_tokens,
-                total_tokens=response.usage.total_tokens,
-            )
-            if response.usage
-            else None
         )
 
         # 파싱된 객체와 usage 정보를 함께 반환
-        return StructuredResponseWithUsage(
+        result = StructuredResponseWithUsage(
             parsed=response.choices[0].message.parsed,
-            usage=usage,
+            usage=_to_usage(response.usage),
         )
 
     # 기존 방식 - 일반 텍스트 응답
     else:
-        response = client.chat.completions.create(
+        response = call_with_rate_limit(
+            lambda: client.chat.completions.create(
+                model=model,
+                messages=messages,
+                temperature=temperature,
+            ),
             model=model,
             messages=messages,
-            temperature=temperature,
         )
 
         # 5. Usage 정보 추출 및 반환
-        usage = (
-            Usage(
-                input_tokens=response.usage.prompt_tokens,
-                output_tokens=response.usage.completion_tokens,
-                total_tokens=response.usage.total_tokens,
+        result = ResponseWithUsage(
+            content=response.choices[0].message.content or "",
+            usage=_to_usage(response.usage),
+        )
+
+    return _finish_call(
+        result,
+        model=model,
+        started_at=started_at,
+        response_cache=response_cache,
+        cache_key=cache_key,
+    )
+
+
+# Overload for when response_format is provided (returns StructuredResponseWithUsage)
+@overload
+async def amake_response(
+    user_content: str,
+    *,
+    response_format: type[T],
+    file_path: str | None = None,
+    file: FileUploadProtocol | BinaryIO | None = None,
+    image_path: str | None = None,
+    image_file: FileUploadProtocol | BinaryIO | None = None,
+    system_content: str | None = None,
+    model: str | ChatModel = "gpt-4o-mini",
+    temperature: float = 0.25,
+    api_key: str | None = None,
+    base_url: str | None = None,
+    cache: bool | ResponseCache = False,
+    optimize_image: bool | ImageOptions = True,
+) -> StructuredResponseWithUsage[T]: ...
+
+
+# Overload for when response_format is not provided (returns ResponseWithUsage)
+@overload
+async def amake_response(
+    user_content: str,
+    file_path: str | None = None,
+    file: FileUploadProtocol | BinaryIO | None = None,
+    image_path: str | None = None,
+    image_file: FileUploadProtocol | BinaryIO | None = None,
+    system_content: str | None = None,
+    model: str | ChatModel = "gpt-4o-mini",
+    temperature: float = 0.25,
+    api_key: str | None = None,
+    base_url: str | None = None,
+    *,
+    response_format: None = None,
+    cache: bool | ResponseCache = False,
+    optimize_image: bool | ImageOptions = True,
+) -> ResponseWithUsage: ...
+
+
+# Overload for stream=True (returns AsyncStreamingResponse)
+@overload
+async def amake_response(
+    user_content: str,
+    file_path: str | None = None,
+    file: FileUploadProtocol | BinaryIO | None = None,
+    image_path: str | None = None,
+    image_file: FileUploadProtocol | BinaryIO | None = None,
+    system_content: str | None = None,
+    model: str | ChatModel = "gpt-4o-mini",
+    temperature: float = 0.25,
+    api_key: str | None = None,
+    base_url: str | None = None,
+    *,
+    stream: Literal[True],
+    cache: bool | ResponseCache = False,
+    optimize_image: bool | ImageOptions = True,
+) -> AsyncStreamingResponse: ...
+
+
+async def amake_response(
+    user_content: str,
+    file_path: str | None = None,
+    file: FileUploadProtocol | BinaryIO | None = None,
+    image_path: str | None = None,
+    image_file: FileUploadProtocol | BinaryIO | None = None,
+    system_content: str | None = None,
+    model: str | ChatModel = "gpt-4o-mini",
+    temperature: float = 0.25,
+    api_key: str | None = None,
+    response_format: type[BaseModel] | None = None,
+    base_url: str | None = None,
+    cache: bool | ResponseCache = False,
+    optimize_image: bool | ImageOptions = True,
+    stream: bool = False,
+) -> ResponseWithUsage | StructuredResponseWithUsage | AsyncStreamingResponse:
+    """make_response의 비동기(asyncio) 버전입니다.
+
+    인자와 반환값은 make_response와 동일하며, 여러 요청을 동시에
+    보내야 하는 배치 작업에서 사용합니다.
+
+    Examples:
+        >>> response = await amake_response("안녕하세요")
+        >>> print(response.usage.total_tokens)
+
+        >>> response = await amake_response("안녕하세요", stream=True)
+        >>> async for delta in response:
+        ...     print(delta, end="", flush=True)
+    """
+    if stream and response_format is not None:
+        raise ValueError("stream=True는 response_format과 함께 사용할 수 없습니다.")
+
+    started_at = time.perf_counter()
+    file_path = file_path or image_path
+    file = file or image_file
+
+    messages = build_messages(
+        user_content,
+        file_path=file_path,
+        file=file,
+        system_content=system_content,
+        optimize_image=optimize_image,
+    )
+
+    response_cache = _resolve_cache(cache)
+    cache_key = None
+    if response_cache is not None:
+        cache_key = make_cache_key(model, temperature, messages, response_format)
+        cached = response_cache.get(cache_key)
+        if cached is not None:
+            result = _from_cache_payload(cached, response_format)
+            finish = partial(
+                _finish_call, model=model, started_at=started_at, cache_hit=True
             )
-            if response.usage
-            else None
+            if stream:
+                return AsyncStreamingResponse(
+                    _aiter_once((str(result), result.usage)), on_complete=finish
+                )
+            return finish(result)
+
+    client = get_async_client(api_key=api_key, base_url=base_url, rate_limited=True)
+
+    if stream:
+        chunks = await acall_with_rate_limit(
+            lambda: client.chat.completions.create(
+                model=model,
+                messages=messages,
+                temperature=temperature,
+                stream=True,
+                stream_options={"include_usage": True},
+            ),
+            model=model,
+            messages=messages,
         )
+        on_complete = partial(
+            _finish_call,
+            model=model,
+            started_at=started_at,
+            response_cache=response_cache,
+            cache_key=cache_key,
+            rate_limit_estimate=estimate_request_tokens(model, messages),
+        )
+        return AsyncStreamingResponse(_achunk_deltas(chunks), on_complete=on_complete)
 
-        return ResponseWithUsage(
+    if response_format is not None:
+        response = await acall_with_rate_limit(
+            lambda: client.beta.chat.completions.parse(
+                model=model,
+                messages=messages,
+                response_format=response_format,
+                temperature=temperature,
+            ),
+            model=model,
+            messages=messages,
+        )
+        result = StructuredResponseWithUsage(
+            parsed=response.choices[0].message.parsed,
+            usage=_to_usage(response.usage),
+        )
+    else:
+        response = await acall_with_rate_limit(
+            lambda: client.chat.completions.create(
+                model=model,
+                messages=messages,
+                temperature=temperature,
+            ),
+            model=model,
+            messages=messages,
+        )
+        result = ResponseWithUsage(
             content=response.choices[0].message.content or "",
-            usage=usage,
+            usage=_to_usage(response.usage),
         )
 
+    return _finish_call(
+        result,
+        model=model,
+        started_at=started_at,
+        response_cache=response_cache,
+        cache_key=cache_key,
+    )
+
+
+async def amake_responses_batch(
+    items: list[dict],
+    max_concurrency: int = 8,
+) -> list[ResponseWithUsage | StructuredResponseWithUsage | Exception]:
+    """여러 요청을 asyncio로 동시에 보내고, 입력 순서대로 결과를 반환합니다.
+
+    Args:
+        items (list[dict]): amake_response에 전달할 키워드 인자 dict의 리스트.
+            예: [{"user_content": "...", "response_format": Doc}, ...]
+        max_concurrency (int, optional): 동시에 진행할 최대 요청 수. 기본값은 8.
+
+    Returns:
+        list: 각 요청의 응답 객체. 실패한 항목은 발생한 예외 객체가 그 자리에 들어가며,
+            나머지 요청은 중단되지 않습니다.
+    """
+    if max_concurrency < 1:
+        raise ValueError("max_concurrency는 1 이상이어야 합니다.")
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def run(kwargs: dict):
+        async with semaphore:
+            try:
+                return await amake_response(**kwargs)
+            except Exception as e:
+                return e
+
+    return await asyncio.gather(*(run(kwargs) for kwargs in items))
+
+
+def make_responses_batch(
+    items: list[dict],
+    max_concurrency: int = 8,
+) -> list[ResponseWithUsage | StructuredResponseWithUsage | Exception]:
+    """amake_responses_batch를 일반 함수에서 실행합니다.
+
+    이미 이벤트 루프가 실행 중인 환경(Jupyter, 비동기 서버 등)에서 호출되면
+    asyncio.run을 쓸 수 없으므로 별도 스레드에서 새 이벤트 루프로 실행합니다.
+    이 경우 호출한 루프는 배치가 끝날 때까지 멈추므로, 가능하면
+    await amake_responses_batch(...)를 직접 사용하세요.
+
+    Examples:
+        >>> results = make_responses_batch(
+        ...     [{"user_content": text} for text in 문서_리스트],
+        ...     max_concurrency=16,
+        ... )
+        >>> for result in results:
+        ...     if isinstance(result, Exception):
+        ...         print("실패:", result)
+    """
+    batch = partial(amake_responses_batch, items, max_concurrency=max_concurrency)
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(batch())
+
+    # 실행 중인 루프 안에서는 asyncio.run이 RuntimeError를 내므로 작업 스레드에서 실행
+    result: list = []
+    error: list[BaseException] = []
+
+    def run_in_thread() -> None:
+        try:
+            result.extend(asyncio.run(batch()))
+        except BaseException as exc:
+            error.append(exc)
+
+    # 스레드는 contextvars를 물려받지 않으므로 caller 태그 등 현재 컨텍스트에서 실행
+    context = contextvars.copy_context()
+    worker = threading.Thread(
+        target=context.run, args=(run_in_thread,), name="make_responses_batch"
+    )
+    worker.start()
+    worker.join()
+    if error:
+        raise error[0]
+    return result
+
 
 def download_file(
     file_url: str,
@@ -346,6 +1118,32 @@ def multiply(a: int, b: int) -> int:
     return a * b
 
 
+# base64는 3바이트 -> 4글자 단위이므로 청크 크기는 3의 배수여야 함
+_B64_CHUNK_SIZE = 3 * 1024 * 1024
+
+
+def _b64_data_url(data: bytes | memoryview, mime_type: str) -> str:
+    """data URL을 미리 할당한 버퍼 하나에 청크 단위로 인코딩하여 만듭니다.
+
+    b64encode(data).decode()와 문자열 연결을 거치면 원본 외에 base64 사본이
+    세 벌(bytes, str, 연결된 str) 생기지만, 이 방식은 버퍼 하나와 최종 str만 만듭니다.
+    """
+    view = memoryview(data).cast("B")
+    prefix = f"data:{mime_type};base64,".encode("ascii")
+    buffer = bytearray(len(prefix) + 4 * ((len(view) + 2) // 3))
+    buffer[: len(prefix)] = prefix
+
+    pos = len(prefix)
+    for start in range(0, len(view), _B64_CHUNK_SIZE):
+        encoded = binascii.b2a_base64(
+            view[start : start + _B64_CHUNK_SIZE], newline=False
+        )
+        buffer[pos : pos + len(encoded)] = encoded
+        pos += len(encoded)
+
+    return buffer.decode("ascii")
+
+
 def make_base64_url(
     file_path: str | None = None,
     file: FileUploadProtocol | BinaryIO | None = None,
@@ -353,14 +1151,21 @@ def make_base64_url(
     image_file: (
         FileUploadProtocol | BinaryIO | None
     ) = None,  # deprecated but kept for compatibility
+    data: bytes | bytearray | memoryview | mmap.mmap | None = None,
+    mime_type: str | None = None,
 ) -> str:
     """파일을 base64 URL로 변환합니다.
 
+    파일 경로는 mmap으로, BytesIO 계열(Streamlit UploadedFile 포함)은 내부 버퍼를
+    그대로 참조하여 읽으므로 큰 PDF도 파일 크기만큼의 사본을 따로 만들지 않습니다.
+
     Args:
         file_path (str | None): 파일 경로 (새로운 방식)
         file (FileUploadProtocol | BinaryIO | None): 파일 객체 (새로운 방식)
         image_path (str | None): 이미지 파일 경로 (호환성 유지)
         image_file (FileUploadProtocol | BinaryIO | None): 이미지 파일 객체 (호환성 유지)
+        data (bytes | bytearray | memoryview | mmap.mmap | None): 이미 메모리에 있는 파일 내용
+        mime_type (str | None): MIME 타입. None이면 파일 경로/객체에서 추론
 
     Returns:
         str: base64로 인코딩된 data URL
@@ -371,131 +1176,47 @@ def make_base64_url(
     if image_file and not file:
         file = image_file
 
+    if data is not None:
+        return _b64_data_url(data, mime_type or "application/octet-stream")
+
     if file_path:
         # 파일 경로에서 MIME 타입 추론
-        mime_type = get_mime_type(file_path)
+        mime_type = mime_type or get_mime_type(file_path)
         with open(file_path, "rb") as f:
-            data: bytes = f.read()
-    elif file:
-        # 파일 객체에서 MIME 타입 가져오기
-        mime_type = file.type if hasattr(file, "type") else "application/octet-stream"
-        data = file.read()
-    else:
-        raise ValueError("file_path 혹은 file 인자를 지정해주세요.")
-
-    b64_str: str = b64encode(data).decode()
-    url = f"data:{mime_type};base64," + b64_str
-    return url
-
-
-def hwp_to_html(
-    hwp_path: str | None = None, hwp_file: FileUploadProtocol | BinaryIO | None = None
-) -> str:
-    """
-    HWP 파일을 HTML 문자열로 변환합니다.
-
-    Args:
-        hwp_path: HWP 파일의 경로
-        hwp_file: FileUploadProtocol 또는 BinaryIO 타입의 파일 객체
-
-    Returns:
-        정제된 HTML 문자열
-
-    Raises:
-        ValueError: 입력이 잘못된 경우
-        RuntimeError: HWP 변환 실패
-    """
-    # 입력 검증
-    if not hwp_path and not hwp_file:
-        raise ValueError("hwp_path 또는 hwp_file 중 하나는 필수입니다.")
-    if hwp_path and hwp_file:
-        raise ValueError("hwp_path와 hwp_file을 동시에 제공할 수 없습니다.")
-
-    temp_hwp_path = None
-    temp_output_dir = None
+            if os.fstat(f.fileno()).st_size == 0:  # 빈 파일은 mmap 불가
+                return _b64_data_url(b"", mime_type)
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                return _b64_data_url(mapped, mime_type)
 
-    try:
-        # hwp_file이 제공된 경우 임시 파일로 저장
-        if hwp_file:
-            # 파일 내용 읽기
-            if hasattr(hwp_file, "read"):
-                content = hwp_file.read()
-                # bytes가 아닌 경우 처리
-                if isinstance(content, str):
-                    content = content.encode("utf-8")
-            else:
-                raise ValueError("hwp_file은 read() 메서드를 가져야 합니다.")
-
-            # 임시 HWP 파일 생성
-            with tempfile.NamedTemporaryFile(suffix=".hwp", delete=False) as temp_hwp:
-                temp_hwp.write(content)
-                temp_hwp_path = temp_hwp.name
-                working_hwp_path = temp_hwp_path
-        else:
-            working_hwp_path = hwp_path
-
-        # xmlmodel.Hwp5File을 사용하여 HWP 파일 열기 (hwp5html과 동일한 방식)
-        with closing(Hwp5File(working_hwp_path)) as hwp5file:
-            # HTMLTransform 인스턴스 생성
-            transform = HTMLTransform()
-
-            # 임시 출력 디렉토리 생성
-            temp_output_dir = tempfile.mkdtemp()
-
-            # HWP를 HTML로 변환 (디렉토리에 출력)
-            transform.transform_hwp5_to_dir(hwp5file, temp_output_dir)
-
-            # 생성된 index.xhtml 파일 읽기
-            html_path = os.path.join(temp_output_dir, "index.xhtml")
-
-            if not os.path.exists(html_path):
-                raise RuntimeError("HTML 변환 결과를 찾을 수 없습니다.")
-
-            with open(html_path, "r", encoding="utf-8") as f:
-                html_content = f.read()
-
-        # BeautifulSoup으로 HTML 파싱 및 정제
-        soup = BeautifulSoup(html_content, "html.parser")
-
-        # 불필요한 태그 제거
-        for tag in soup.find_all(["script", "style", "link", "img", "meta"]):
-            tag.decompose()
-
-        # 모든 인라인 style 속성 제거
-        for tag in soup.find_all(True):  # 모든 태그 선택
-            if tag.has_attr("style"):
-                del tag["style"]
-            # 다른 불필요한 속성들도 제거 (class는 유지)
-            for attr in ["width", "height", "align", "valign", "bgcolor", "border"]:
-                if tag.has_attr(attr):
-                    del tag[attr]
-
-        # head 태그 찾기 또는 생성
-        head = soup.find("head")
-        if not head:
-            head = soup.new_tag("head")
-            if soup.html:
-                soup.html.insert(0, head)
-            else:
-                # html 태그도 없으면 생성
-                html = soup.new_tag("html")
-                body = soup.find("body")
-                if body:
-                    body.extract()
-                    html.append(head)
-                    html.append(body)
-                else:
-                    # body도 없으면 전체 콘텐츠를 body로 감싸기
-                    body = soup.new_tag("body")
-                    for child in list(soup.children):
-                        body.append(child.extract())
-                    html.append(head)
-                    html.append(body)
-                soup.append(html)
-
-        # 최소한의 CSS 스타일 추가
-        style_tag = soup.new_tag("style")
-        style_tag.string = """
+    if file:
+        # 파일 객체에서 MIME 타입 가져오기
+        mime_type = mime_type or (
+            file.type if hasattr(file, "type") else "application/octet-stream"
+        )
+        if hasattr(file, "getbuffer"):
+            # BytesIO: 현재 위치부터의 내부 버퍼를 복사 없이 참조
+            position = file.tell()
+            with file.getbuffer() as buffer:
+                url = _b64_data_url(buffer[position:], mime_type)
+            file.seek(0, os.SEEK_END)  # read()와 같이 끝까지 읽은 상태로
+            return url
+        return _b64_data_url(file.read(), mime_type)
+
+    raise ValueError("file_path 혹은 file 인자를 지정해주세요.")
+
+
+# hwp_to_html 정제 규칙 (바꾸면 HWP_HTML_VERSION이 바뀌어 캐시가 자동으로 무효화됨)
+HWP_REMOVED_TAGS = ["script", "style", "link", "img", "meta"]
+HWP_REMOVED_ATTRIBUTES = [
+    "style",
+    "width",
+    "height",
+    "align",
+    "valign",
+    "bgcolor",
+    "border",
+]
+HWP_BASE_CSS = """
             body {
                 font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
                 line-height: 1.6;
@@ -524,33 +1245,249 @@ def hwp_to_html(
                 margin: 10px 0;
             }
         """
-        head.append(style_tag)
+# hwp5html XSLT가 내보내는 문서 형식. 정제 후에도 그대로 유지
+HWP_XHTML_DOCTYPE = (
+    '<!DOCTYPE html PUBLIC "-//W3C//DTD XHTML 1.0 Transitional//EN" '
+    '"http://www.w3.org/TR/xhtml1/DTD/xhtml1-transitional.dtd">'
+)
+XHTML_NAMESPACE = "http://www.w3.org/1999/xhtml"
+# 정제 코드 자체를 고쳤을 때는 이 숫자를 올려주세요.
+_HWP_CLEANUP_REVISION = 3
+HWP_HTML_VERSION = sha256(
+    repr(
+        (
+            _HWP_CLEANUP_REVISION,
+            HWP_REMOVED_TAGS,
+            HWP_REMOVED_ATTRIBUTES,
+            HWP_BASE_CSS,
+        )
+    ).encode("utf-8")
+).hexdigest()[:12]
+
+_hwp_cache: ResponseCache | None = None
+_hwp_cache_lock = threading.Lock()
+
+
+def get_hwp_cache() -> ResponseCache:
+    """hwp_to_html(cache=True)에서 사용하는 공유 변환 캐시를 반환합니다."""
+    global _hwp_cache
+    with _hwp_cache_lock:
+        if _hwp_cache is None:
+            _hwp_cache = ResponseCache(
+                db_path=".cache/hwp_html.sqlite3",
+                max_memory_entries=64,
+                ttl=None,  # 변환 결과는 내용과 정제 규칙이 같으면 변하지 않음
+                max_disk_bytes=512 * 1024 * 1024,
+            )
+        return _hwp_cache
+
+
+def hwp_to_html(
+    hwp_path: str | None = None,
+    hwp_file: FileUploadProtocol | BinaryIO | None = None,
+    cache: bool | ResponseCache = True,
+) -> str:
+    """
+    HWP 파일을 HTML 문자열로 변환합니다.
+
+    변환 결과는 HWP 파일 내용의 SHA-256과 정제 규칙 버전(HWP_HTML_VERSION)을
+    키로 캐시되므로, 같은 파일을 다시 변환하면 즉시 반환됩니다.
+
+    Args:
+        hwp_path: HWP 파일의 경로
+        hwp_file: FileUploadProtocol 또는 BinaryIO 타입의 파일 객체
+        cache: 변환 캐시 사용 여부. True면 공유 캐시, ResponseCache 인스턴스면 해당 캐시
+
+    Returns:
+        정제된 HTML 문자열
+
+    Raises:
+        ValueError: 입력이 잘못된 경우
+        RuntimeError: HWP 변환 실패
+    """
+    # 입력 검증
+    if not hwp_path and not hwp_file:
+        raise ValueError("hwp_path 또는 hwp_file 중 하나는 필수입니다.")
+    if hwp_path and hwp_file:
+        raise ValueError("hwp_path와 hwp_file을 동시에 제공할 수 없습니다.")
+
+    # 파일 내용 읽기
+    if hwp_file:
+        if not hasattr(hwp_file, "read"):
+            raise ValueError("hwp_file은 read() 메서드를 가져야 합니다.")
+        content = hwp_file.read()
+        # bytes가 아닌 경우 처리
+        if isinstance(content, str):
+            content = content.encode("utf-8")
+    else:
+        with open(hwp_path, "rb") as f:
+            content = f.read()
+
+    hwp_cache = get_hwp_cache() if cache is True else cache or None
+    cache_key = None
+    if hwp_cache is not None:
+        cache_key = sha256(HWP_HTML_VERSION.encode() + content).hexdigest()
+        cached = hwp_cache.get(cache_key)
+        if cached is not None:
+            return cached["html"]
+
+    html_str = _convert_hwp(content)
+
+    if hwp_cache is not None:
+        hwp_cache.set(cache_key, {"html": html_str})
+    return html_str
+
+
+@lru_cache(maxsize=1)
+def _get_lxml_etree():
+    """lxml.etree 모듈을 반환합니다. 설치되어 있지 않으면 None.
+
+    HWP 변환에서만 쓰므로 utils를 import할 때가 아니라 처음 변환할 때 import합니다.
+    """
+    try:
+        from lxml import etree
+    except ImportError:
+        return None
+    return etree
+
+
+@lru_cache(maxsize=1)
+def _get_hwp_xslt():
+    """hwp5html의 XHTML 변환 스타일시트를 lxml로 한 번만 컴파일합니다."""
+    etree = _get_lxml_etree()
+    with hwp5_resources_path(RESOURCE_PATH_XSL_XHTML) as xsl_path:
+        return etree.XSLT(etree.parse(xsl_path))
+
 
-        # HTML 문자열로 변환 (XML 선언 제거)
-        html_str = str(soup)
+def _open_hwp5(content: bytes) -> Hwp5File:
+    """HWP 내용(bytes)을 임시 파일 없이 Hwp5File로 엽니다."""
+    # 짧은 bytes는 OleStorage가 파일 경로로 해석하므로 먼저 형식 확인
+    if not content.startswith(OLE_MAGIC):
+        raise ValueError("HWP 5.0(OLE2) 형식의 파일이 아닙니다.")
+    # xmlmodel.Hwp5File을 바이트에서 바로 열기 (OleStorage가 bytes를 지원)
+    return Hwp5File(OleStorage(content))
 
-        # XML 선언 제거 (있을 경우)
-        if html_str.startswith("<?xml"):
-            xml_end = html_str.find("?>")
-            if xml_end != -1:
-                html_str = html_str[xml_end + 2 :].strip()
 
-        return html_str
+def _hwp_to_xhtml_tree(content: bytes):
+    """HWP 내용을 메모리 안에서 hwp5html과 같은 XHTML 트리(lxml)로 변환합니다.
 
+    hwp5html의 transform_hwp5_to_dir와 같은 XSLT를 쓰지만, 임시 파일과 출력
+    디렉토리(index.xhtml, styles.css, bindata) 없이 BytesIO로만 주고받습니다.
+    """
+    etree = _get_lxml_etree()
+    with closing(_open_hwp5(content)) as hwp5file:
+        xml_buffer = io.BytesIO()
+        # 이미지는 정제 단계에서 어차피 제거하므로 embedbin=False
+        hwp5file.xmlevents(embedbin=False).dump(xml_buffer)
+
+    xml_buffer.seek(0)
+    return _get_hwp_xslt()(etree.parse(xml_buffer))
+
+
+def _hwp_to_xhtml(content: bytes) -> str:
+    """lxml이 없을 때 hwp5html의 XSLT 구현(xsltproc 등)으로 XHTML 문자열을 만듭니다."""
+    with closing(_open_hwp5(content)) as hwp5file:
+        output = io.BytesIO()
+        HTMLTransform().transform_hwp5_to_xhtml(hwp5file, output)
+    return output.getvalue().decode("utf-8")
+
+
+def _remove_keeping_tail(element) -> None:
+    """요소를 하위 요소와 함께 제거하되, 뒤따르는 텍스트(tail)는 남깁니다."""
+    parent = element.getparent()
+    if element.tail:
+        previous = element.getprevious()
+        if previous is not None:
+            previous.tail = (previous.tail or "") + element.tail
+        else:
+            parent.text = (parent.text or "") + element.tail
+    parent.remove(element)
+
+
+def _sanitize_html_tree(root) -> str:
+    """XHTML 트리(lxml)를 한 번만 순회하며 정제하고 HTML 문자열로 반환합니다.
+
+    HWP_REMOVED_TAGS 요소를 제거하고, HWP_REMOVED_ATTRIBUTES 속성을 지우고
+    (class는 유지), HWP_BASE_CSS를 head에 넣습니다. 태그의 XHTML 네임스페이스는
+    HTML 직렬화(<br> 등)를 위해 떼어내지만, 문서 형식(DOCTYPE)과 xmlns 선언은
+    예전 출력(_sanitize_html_soup)과 같게 유지합니다.
+    """
+    etree = _get_lxml_etree()
+    removed_tags = set(HWP_REMOVED_TAGS)
+    to_remove = []
+    for element in root.iter():
+        if not isinstance(element.tag, str):
+            continue  # 주석, 처리 명령
+        # {http://www.w3.org/1999/xhtml}p -> p
+        tag = etree.QName(element).localname
+        element.tag = tag
+        if tag in removed_tags:
+            to_remove.append(element)
+            continue
+        for attr in HWP_REMOVED_ATTRIBUTES:
+            element.attrib.pop(attr, None)
+
+    for element in to_remove:
+        # 이미 제거된 요소의 하위 요소는 건너뜀
+        if element.getparent() is not None:
+            _remove_keeping_tail(element)
+    etree.cleanup_namespaces(root)
+    root.set("xmlns", XHTML_NAMESPACE)
+
+    # head 태그 찾기 또는 생성 후 최소한의 CSS 스타일 추가
+    head = root.find("head")
+    if head is None:
+        head = etree.Element("head")
+        root.insert(0, head)
+    style_tag = etree.SubElement(head, "style")
+    style_tag.text = HWP_BASE_CSS
+
+    return etree.tostring(
+        root, method="html", encoding="unicode", doctype=HWP_XHTML_DOCTYPE
+    )
+
+
+def _sanitize_html_soup(html_content: str) -> str:
+    """lxml이 없을 때 XHTML 문자열을 BeautifulSoup(html.parser)으로 정제합니다."""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html_content, "html.parser")
+
+    # 불필요한 태그 제거
+    for tag in soup.find_all(HWP_REMOVED_TAGS):
+        tag.decompose()
+
+    # style 및 다른 불필요한 속성들 제거 (class는 유지)
+    for tag in soup.find_all(True):
+        for attr in HWP_REMOVED_ATTRIBUTES:
+            if tag.has_attr(attr):
+                del tag[attr]
+
+    # head 태그 찾기 또는 생성 후 최소한의 CSS 스타일 추가
+    head = soup.find("head")
+    if not head:
+        head = soup.new_tag("head")
+        soup.html.insert(0, head)
+    style_tag = soup.new_tag("style")
+    style_tag.string = HWP_BASE_CSS
+    head.append(style_tag)
+
+    # HTML 문자열로 변환 (XML 선언 제거)
+    html_str = str(soup)
+    if html_str.startswith("<?xml"):
+        html_str = html_str[html_str.find("?>") + 2 :].strip()
+    return html_str
+
+
+def _convert_hwp(content: bytes) -> str:
+    """HWP 내용을 HTML로 변환하고 정제합니다.
+
+    lxml이 있으면 XSLT 결과 트리를 문자열로 만들었다가 다시 파싱하지 않고 그대로
+    정제하고, 없으면 XHTML 문자열을 BeautifulSoup으로 정제합니다.
+    """
+    try:
+        if _get_lxml_etree() is None:
+            return _sanitize_html_soup(_hwp_to_xhtml(content))
+        return _sanitize_html_tree(_hwp_to_xhtml_tree(content).getroot())
     except Exception as e:
         raise Exception(f"HWP 변환 중 오류 발생: {e}")
-    finally:
-        # 임시 파일 및 디렉토리 정리
-        if temp_hwp_path and os.path.exists(temp_hwp_path):
-            try:
-                os.unlink(temp_hwp_path)
-            except:
-                pass
-        if temp_output_dir and os.path.exists(temp_output_dir):
-            try:
-                # 디렉토리 내 모든 파일 삭제
-                import shutil
-
-                shutil.rmtree(temp_output_dir)
-            except:
-                pass
\ No newline at end of file